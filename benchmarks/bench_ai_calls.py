@@ -0,0 +1,113 @@
+"""Send assessment prompts to a local mock OpenAI-compatible server.
+
+Run with ``python benchmarks/bench_ai_calls.py [PROMPTS] [LATENCY_MS]``
+(defaults 32 and 200). The mock server answers ``/v1/chat/completions``
+after LATENCY_MS, mimicking a remote model. ``call_ai`` sends the prompts
+one after another, as callers had to; ``call_ai_async`` gathers them and
+lets ``AI_CONCURRENCY`` requests through at once.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from cli.ai_client import DEFAULT_CONCURRENCY, call_ai, call_ai_async  # noqa: E402
+
+ANSWER = json.dumps({"D101": True, "suggestions": ["Add CI"]})
+
+
+def make_handler(latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def do_POST(self):
+            with Handler.lock:
+                Handler.in_flight += 1
+                Handler.peak = max(Handler.peak, Handler.in_flight)
+            try:
+                self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(latency)
+                body = {
+                    "id": "chatcmpl-bench",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": "gpt-4o",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": ANSWER},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 1,
+                        "completion_tokens": 1,
+                        "total_tokens": 2,
+                    },
+                }
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            finally:
+                with Handler.lock:
+                    Handler.in_flight -= 1
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main() -> int:
+    prompts = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 200.0
+    handler = make_handler(latency_ms / 1000)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ["NO_PROXY"] = "127.0.0.1"
+
+    def serial():
+        for i in range(prompts):
+            call_ai("openai", "gpt-4o", f"prompt {i}", api_key="bench-key")
+
+    async def gathered():
+        await asyncio.gather(
+            *(
+                call_ai_async("openai", "gpt-4o", f"prompt {i}", api_key="bench-key")
+                for i in range(prompts)
+            )
+        )
+
+    limit = os.environ.get("AI_CONCURRENCY", DEFAULT_CONCURRENCY["openai"])
+    print(f"{prompts} prompts, latency per request: {latency_ms:.0f} ms")
+    runs = {
+        "call_ai": serial,
+        f"call_ai_async ({limit} at once)": lambda: asyncio.run(gathered()),
+    }
+    for name, fn in runs.items():
+        handler.peak = 0
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<28} {elapsed:6.2f}s, {prompts / elapsed:6.1f} prompts/s, "
+            f"peak {handler.peak} in flight"
+        )
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
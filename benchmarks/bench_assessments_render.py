@@ -0,0 +1,71 @@
+"""Render the assessments page for many synthetic assessments.
+
+Run from the repository root with
+``python benchmarks/bench_assessments_render.py [N] [--max-seconds S]``.
+Exits non-zero when rendering takes longer than ``--max-seconds``, so it
+can guard against rendering becoming super-linear again.
+"""
+
+import argparse
+import random
+import time
+
+from jinja2 import Environment, FileSystemLoader
+
+from core.badge import get_badge_url
+from web.main import _response_rows, criteria_registry
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("n", nargs="?", type=int, default=10_000)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    criteria_index = criteria_registry.current
+    criteria = criteria_index.criteria
+    rng = random.Random(42)
+    stored = [{c.id: rng.random() < 0.5 for c in criteria} for _ in range(args.n)]
+    env = Environment(loader=FileSystemLoader("src/web/templates"), autoescape=True)
+    template = env.get_template("assessments.html")
+
+    start = time.perf_counter()
+    assessments = []
+    for i, responses in enumerate(stored):
+        evaluation = criteria_index.evaluate(responses)
+        assessments.append(
+            {
+                "id": i,
+                "project_name": f"project-{i}",
+                "project_url": None,
+                "user": None,
+                "responses": _response_rows(responses, criteria_index),
+                "point": evaluation.score,
+                "level": evaluation.level,
+                "badge_url": get_badge_url(evaluation.level),
+            }
+        )
+    prepared = time.perf_counter() - start
+
+    html = template.render(
+        assessments=assessments,
+        user=None,
+        filters={"level": "", "project": "", "owner": "", "sort": "-id"},
+        is_first_page=True,
+        first_url="/assessments",
+        next_url=None,
+    )
+    total = time.perf_counter() - start
+
+    print(f"assessments: {args.n}")
+    print(f"prepare:     {prepared:.3f}s")
+    print(f"render:      {total - prepared:.3f}s")
+    print(f"total:       {total:.3f}s ({len(html) / 1e6:.1f} MB of HTML)")
+    if args.max_seconds is not None and total > args.max_seconds:
+        print(f"FAIL: exceeded budget of {args.max_seconds:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
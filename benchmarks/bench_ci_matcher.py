@@ -0,0 +1,72 @@
+"""Classify and rank the paths of a synthetic monorepo tree.
+
+Run with ``python benchmarks/bench_ci_matcher.py [PATHS]`` (default 200000).
+``substring scan`` is the matcher the fetcher used to have: it lowercases
+each path and tests every pattern with ``in``, re-lowercasing the patterns
+on every call. ``compiled regex`` is the current single-pass matcher, and
+``rank`` adds sorting the matches by how informative they are.
+"""
+
+import itertools
+import random
+import statistics
+import sys
+import time
+
+from cli.repo_fetcher import _CI_RELEVANT_PATHS, _is_ci_relevant, _rank_ci_files
+
+PATTERNS = list(itertools.chain.from_iterable(_CI_RELEVANT_PATHS))
+NAMES = ["main.go", "handler.py", "index.ts", "README.md", "test_api.py", "util.rs"]
+CI_NAMES = ["Dockerfile", "Makefile", "tox.ini", "docker-compose.yml", "SECURITY.md"]
+
+
+def make_tree(n: int) -> list[str]:
+    rng = random.Random(0)
+    paths = [f".github/workflows/job-{i}.yml" for i in range(5)]
+    while len(paths) < n:
+        service = f"services/svc-{rng.randrange(2000)}"
+        if rng.random() < 0.01:
+            paths.append(f"{service}/{rng.choice(CI_NAMES)}")
+        else:
+            depth = "/".join(
+                f"pkg{rng.randrange(20)}" for _ in range(rng.randrange(1, 5))
+            )
+            paths.append(f"{service}/src/{depth}/{rng.choice(NAMES)}")
+    rng.shuffle(paths)
+    return paths
+
+
+def substring_scan(path: str) -> bool:
+    lp = path.lower()
+    return any(p.lower() in lp for p in PATTERNS)
+
+
+def timed(fn, runs: int = 5) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    tree = make_tree(n)
+    relevant = sum(map(_is_ci_relevant, tree))
+    assert relevant == sum(map(substring_scan, tree))
+    print(f"{n} paths, {relevant} CI-relevant")
+
+    results = {
+        "substring scan": timed(lambda: [p for p in tree if substring_scan(p)]),
+        "compiled regex": timed(lambda: [p for p in tree if _is_ci_relevant(p)]),
+        "rank": timed(lambda: _rank_ci_files(tree)),
+    }
+    for name, seconds in results.items():
+        print(f"{name:<15} {seconds * 1000:8.1f} ms")
+    print(f"top 8 after ranking: {_rank_ci_files(tree)[:8]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Compare concurrent write throughput of a default and a tuned SQLite engine.
+
+Run with ``python benchmarks/bench_db_concurrency.py [THREADS] [WRITES]``.
+Each writer thread saves assessments one commit at a time while reader
+threads page through the table, mimicking concurrent web submissions.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from core.model import Assessment, Base, create_db_engine
+
+
+def run(engine, threads: int, writes: int) -> tuple[float, int, int]:
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    errors = 0
+    reads = 0
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def writer(n: int) -> None:
+        nonlocal errors
+        for i in range(writes):
+            db = Session()
+            try:
+                assessment = Assessment(project_name=f"bench-{n}-{i}")
+                assessment.set_responses({"D101": True, "D102": i % 2 == 0})
+                db.add(assessment)
+                db.commit()
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    errors += 1
+            finally:
+                db.close()
+
+    def reader() -> None:
+        nonlocal reads, errors
+        while not stop.is_set():
+            db = Session()
+            try:
+                db.query(Assessment).order_by(Assessment.id.desc()).limit(50).all()
+                with lock:
+                    reads += 1
+            except OperationalError:
+                with lock:
+                    errors += 1
+            finally:
+                db.close()
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    writers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    for t in readers:
+        t.start()
+    start = time.perf_counter()
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for t in readers:
+        t.join()
+    engine.dispose()
+    return elapsed, errors, reads
+
+
+def main(threads: int = 8, writes: int = 200) -> None:
+    total = threads * writes
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = {
+            # What model.py used before the engine became configurable
+            "default": create_engine,
+            "tuned": create_db_engine,
+        }
+        for name, factory in engines.items():
+            url = f"sqlite:///{os.path.join(tmp, name + '.db')}"
+            elapsed, errors, reads = run(factory(url), threads, writes)
+            print(
+                f"{name:<8} {total - errors:>6} commits in {elapsed:.2f}s "
+                f"({(total - errors) / elapsed:,.0f}/s), {reads} page reads, "
+                f"{errors} 'database is locked' errors"
+            )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,120 @@
+"""Fetch a repository context from a local mock GitHub API with added latency.
+
+Run with ``python benchmarks/bench_repo_fetch.py [LATENCY_MS]``. The mock
+server answers the metadata, tree, README and contents endpoints after
+LATENCY_MS, mimicking a remote API. ``concurrency=1`` issues the requests
+one at a time, which is how the fetcher used to work. ``snapshot`` reads
+the same files from one ``/tarball`` download, and ``graphql`` (used when
+a token is set) from one ``/graphql`` query after the tree.
+"""
+
+import base64
+import io
+import json
+import os
+import sys
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from cli.repo_fetcher import DEFAULT_FETCH_CONCURRENCY, fetch_repo_context
+
+TREE = [f".github/workflows/job-{i}.yml" for i in range(10)] + [
+    f"src/module_{i}.py" for i in range(200)
+]
+CI_TEXT = "on: [push]\njobs: {}\n" * 20
+
+
+def make_tarball() -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for path in TREE:
+            data = (CI_TEXT if path.endswith(".yml") else "pass\n" * 200).encode()
+            info = tarfile.TarInfo(f"acme-app-0123abc/{path}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def make_handler(latency: float):
+    tarball = make_tarball()
+
+    class Handler(BaseHTTPRequestHandler):
+        requests = 0
+
+        def do_GET(self):
+            Handler.requests += 1
+            time.sleep(latency)
+            path = self.path.split("?")[0].removeprefix("/repos/acme/app")
+            if path == "/tarball":
+                self.send_response(200)
+                self.send_header("Content-Type", "application/gzip")
+                self.send_header("Content-Length", str(len(tarball)))
+                self.end_headers()
+                self.wfile.write(tarball)
+                return
+            if path == "":
+                body = {"description": "Benchmark repo", "language": "Python"}
+            elif path == "/git/trees/HEAD":
+                body = {"tree": [{"path": p, "type": "blob"} for p in TREE]}
+            else:
+                body = {"content": base64.b64encode(CI_TEXT.encode()).decode()}
+            self.send_json(body)
+
+        def do_POST(self):
+            Handler.requests += 1
+            time.sleep(latency)
+            length = int(self.headers["Content-Length"])
+            variables = json.loads(self.rfile.read(length))["variables"]
+            repository = {"description": "Benchmark repo", "primaryLanguage": None}
+            for name in variables:
+                if name.startswith("e"):
+                    repository[f"f{name[1:]}"] = {"text": CI_TEXT}
+            self.send_json({"data": {"repository": repository}})
+
+        def send_json(self, body):
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main() -> int:
+    latency_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    handler = make_handler(latency_ms / 1000)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["NO_PROXY"] = "127.0.0.1"
+
+    print(f"latency per request: {latency_ms:.0f} ms")
+    runs: dict[str, dict[str, Any]] = {
+        "concurrency  1": {"concurrency": 1},
+        f"concurrency {DEFAULT_FETCH_CONCURRENCY:>2}": {},
+        "snapshot": {"snapshot": True},
+        "graphql": {"token": "bench-token"},
+    }
+    for name, kwargs in runs.items():
+        handler.requests = 0
+        start = time.perf_counter()
+        ctx = fetch_repo_context("github", "acme", "app", **kwargs)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<15} {elapsed:.3f}s, {handler.requests} requests, "
+            f"{len(ctx['files'])} files, {len(ctx['ci_files'])} CI files"
+        )
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
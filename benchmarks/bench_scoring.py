@@ -0,0 +1,45 @@
+"""Compare per-assessment scoring with the vectorized batch scorer.
+
+Run with ``python benchmarks/bench_scoring.py [N]``.
+"""
+
+import random
+import sys
+import time
+
+from config.loader import load_criteria_config
+from core.model import UserResponse
+from core.scorer import (
+    calculate_category_scores,
+    calculate_score,
+    compile_weights,
+    responses_to_matrix,
+    score_batch,
+    score_to_level,
+)
+
+
+def main(n: int = 100_000) -> None:
+    _, criteria = load_criteria_config()
+    rng = random.Random(42)
+    rows = [{c.id: rng.random() < 0.5 for c in criteria} for _ in range(n)]
+
+    start = time.perf_counter()
+    for row in rows:
+        responses = [UserResponse(id=k, answer=v) for k, v in row.items()]
+        score_to_level(calculate_score(criteria, responses))
+        calculate_category_scores(criteria, responses)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    weights = compile_weights(criteria)
+    score_batch(weights, responses_to_matrix(weights, rows))
+    batch = time.perf_counter() - start
+
+    print(f"assessments: {n}")
+    print(f"per-row:     {single:.3f}s")
+    print(f"batch:       {batch:.3f}s ({single / batch:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,75 @@
+"""Measure process start-up time of the CLI and the web app.
+
+Run from the repository root with ``python benchmarks/bench_startup.py [RUNS]``.
+Each command is started RUNS times in a fresh interpreter, once with an
+empty criteria cache (as on the first run after an install or a change to
+``criteria.yaml``) and once with a warm one. The criteria load on its own
+is timed in-process as well.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from config import loader
+
+COMMANDS = {
+    "dm --version": [sys.executable, "-m", "cli.main", "--version"],
+    "import web.main": [sys.executable, "-c", "import web.main"],
+}
+
+
+def time_command(argv: list[str], env: dict, fresh_cache: bool, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        if fresh_cache:
+            env = {**env, "DEVOPS_MATURITY_CACHE_DIR": tempfile.mkdtemp()}
+        start = time.perf_counter()
+        subprocess.run(argv, env=env, check=True, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def time_criteria_load(fresh_cache: bool, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        if fresh_cache:
+            os.environ["DEVOPS_MATURITY_CACHE_DIR"] = tempfile.mkdtemp()
+        start = time.perf_counter()
+        loader.load_criteria_config()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    src = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+    env = {
+        **os.environ,
+        "PYTHONPATH": src,
+        "DEVOPS_MATURITY_CACHE_DIR": tempfile.mkdtemp(),
+        # Keep the web app's database out of the working directory
+        "DATABASE_URL": "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"),
+        # Don't let litellm's model price download add network noise
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+    }
+
+    print(f"median of {runs} runs      no cache    warm cache")
+    for name, argv in COMMANDS.items():
+        cold = time_command(argv, env, True, runs)
+        warm = time_command(argv, env, False, runs)
+        print(f"{name:<24} {cold * 1000:8.1f} ms {warm * 1000:9.1f} ms")
+
+    cold = time_criteria_load(True, runs * 10)
+    os.environ["DEVOPS_MATURITY_CACHE_DIR"] = tempfile.mkdtemp()
+    loader.load_criteria_config()
+    warm = time_criteria_load(False, runs * 10)
+    print(f"{'load_criteria_config()':<24} {cold * 1000:8.1f} ms {warm * 1000:9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
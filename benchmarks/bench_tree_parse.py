@@ -0,0 +1,76 @@
+"""Compare peak memory of parsing a large GitHub tree response.
+
+Run with ``python benchmarks/bench_tree_parse.py [ENTRIES]`` (default
+300000). ``json.loads`` decodes the whole body at once, as ``r.json()``
+did; ``streaming`` feeds the body in 64 KiB chunks through the fetcher's
+incremental parser. Both keep the bounded file list and CI candidates.
+The response body itself is not counted.
+"""
+
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+from cli.repo_fetcher import _MAX_FILE_LIST, _collect_tree, _stream_json_array
+
+CHUNK_SIZE = 64 * 1024
+
+
+def make_payload(entries: int) -> bytes:
+    tree = [
+        {
+            "path": f"services/svc-{i % 500}/src/pkg/module_{i}.py",
+            "mode": "100644",
+            "type": "blob",
+            "sha": f"{i:040x}",
+            "size": 1000 + i % 5000,
+            "url": f"https://api.github.com/repos/acme/mono/git/blobs/{i:040x}",
+        }
+        for i in range(entries)
+    ]
+    tree.append({"path": "Dockerfile", "type": "blob", "size": 100})
+    return json.dumps({"sha": "f" * 40, "tree": tree, "truncated": False}).encode()
+
+
+def parse_whole(payload: bytes) -> list[str]:
+    items = json.loads(payload)["tree"]
+    return [i["path"] for i in items if i.get("type") == "blob"][:_MAX_FILE_LIST]
+
+
+def parse_streaming(payload: bytes) -> list[str]:
+    async def chunks():
+        for i in range(0, len(payload), CHUNK_SIZE):
+            yield payload[i : i + CHUNK_SIZE]
+
+    async def pages():
+        async for items in _stream_json_array(chunks(), "tree"):
+            yield [i["path"] for i in items if i.get("type") == "blob"]
+
+    files, _ = asyncio.run(_collect_tree(pages()))
+    return files
+
+
+def measure(fn, payload: bytes) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(payload)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> int:
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    payload = make_payload(entries)
+    print(f"{entries} entries, {len(payload) / 1e6:.1f} MB of JSON")
+    for name, fn in (("json.loads", parse_whole), ("streaming", parse_streaming)):
+        elapsed, peak = measure(fn, payload)
+        print(f"{name:<11} {elapsed:6.2f}s, peak {peak / 1e6:7.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,15 @@ def tests(session):
     )
 
 
+@nox.session(default=False)
+def bench(session):
+    """Run the performance benchmarks; only with ``nox -s bench``."""
+    session.install("-e", ".[test]")
+    for script in sorted(os.listdir("benchmarks")):
+        if script.startswith("bench_") and script.endswith(".py"):
+            session.run("python", os.path.join("benchmarks", script))
+
+
 @nox.session
 def lint(session):
     """Run the linters."""
@@ -0,0 +1,100 @@
+"""Persistent cache of AI responses for auto-assessment.
+
+A response is stored under a hash of everything that determines it: the
+resolved model, the temperature and the prompt. Re-assessing a repository
+that has not changed builds a byte-identical prompt, so the stored answer
+is reused instead of paying for another completion.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from cli.http_cache import CacheStats, evict_lru
+from config.cache import cache_dir
+
+DEFAULT_TTL_HOURS = 168
+DEFAULT_MAX_MB = 20
+
+
+@dataclass
+class AiResponseCache:
+    """On-disk AI responses, expiring after *ttl* seconds.
+
+    Each entry is one file: a JSON header line followed by the raw
+    response text. Reads bump the file's mtime, and writes evict the least
+    recently used files once the directory exceeds *max_bytes*. With
+    *refresh* set, lookups miss but new responses are still stored.
+    """
+
+    directory: Path
+    ttl: float = DEFAULT_TTL_HOURS * 3600
+    max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024
+    refresh: bool = False
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    @classmethod
+    def default(cls, refresh: bool = False) -> "AiResponseCache":
+        """Cache in ``<cache dir>/ai``, see ``AI_CACHE_TTL_HOURS`` and ``AI_CACHE_MAX_MB``."""
+        ttl_hours = float(os.environ.get("AI_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS))
+        max_mb = float(os.environ.get("AI_CACHE_MAX_MB", DEFAULT_MAX_MB))
+        return cls(
+            cache_dir() / "ai",
+            ttl=ttl_hours * 3600,
+            max_bytes=int(max_mb * 1024 * 1024),
+            refresh=refresh,
+        )
+
+    @staticmethod
+    def key(model: str, temperature: float, prompt: str) -> str:
+        payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response for *key* unless it is missing or expired."""
+        path = self._path(key)
+        raw = None
+        if not self.refresh:
+            try:
+                with open(path, "rb") as f:
+                    header = json.loads(f.readline())
+                    body = f.read()
+                if time.time() - header["created"] < self.ttl:
+                    raw = body.decode()
+                    os.utime(path)
+                else:
+                    path.unlink(missing_ok=True)
+            except (OSError, ValueError, KeyError):
+                pass
+        if raw is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return raw
+
+    def put(self, key: str, raw: str, model: str) -> None:
+        """Store *raw* under *key*; failures to write are ignored."""
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        header = {"created": time.time(), "model": model}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                f.write(raw.encode())
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        evict_lru(self.directory, self.max_bytes)
+
+    def discard(self, key: str) -> None:
+        """Forget the response for *key*, e.g. because it could not be parsed."""
+        self._path(key).unlink(missing_ok=True)
@@ -4,13 +4,17 @@ Uses ``litellm`` to support OpenAI, Anthropic, Google Gemini, Ollama, and
 many other providers through a single unified interface.
 """
 
+import asyncio
 import json
 import os
 import re
-from typing import Optional
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Optional
 
 import litellm
 
+from cli.ai_cache import AiResponseCache
 from core.model import Criteria, UserResponse
 
 # litellm model names per provider (used when no --model is given)
@@ -27,6 +31,38 @@ _PROVIDER_MODEL_PREFIX: dict[str, str] = {
     "ollama": "ollama/",
 }
 
+# Low temperature keeps assessments of the same evidence consistent
+TEMPERATURE = 0.1
+
+# Requests in flight per provider in one event loop (``AI_CONCURRENCY``
+# overrides); a local Ollama server answers one prompt at a time
+DEFAULT_CONCURRENCY: dict[str, int] = {
+    "openai": 8,
+    "anthropic": 4,
+    "gemini": 4,
+    "ollama": 1,
+}
+DEFAULT_TIMEOUT = 120.0
+
+# Per-provider semaphores of each event loop; a semaphore is bound to the
+# loop it is first used in, and every blocking call_ai runs a new loop
+_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Prompt budget (``AI_PROMPT_TOKENS`` overrides) and the share of the evidence
+# budget each section is guaranteed, most telling evidence first. Budget a
+# section does not need goes to the others in this order.
+DEFAULT_PROMPT_TOKENS = 4000
+_SECTION_SHARES = {"ci_files": 0.5, "files": 0.3, "readme": 0.2}
+# CI files cut shorter than this are left out instead of sent as fragments
+_MIN_CI_FILE_TOKENS = 40
+
+# Words, up to three digits, punctuation and indentation each count as one
+# token: within about 10% of BPE tokenizers on READMEs, YAML and file
+# paths, erring high
+_TOKEN_RE = re.compile(r"[^\W\d_]+|\d{1,3}|[^\w\s]|\n +")
+
+Tokenizer = Callable[[str], int]
+
 _JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]+?)\s*```")
 _JSON_OBJ_RE = re.compile(r"\{[\s\S]+\}")
 
@@ -37,20 +73,53 @@ litellm.suppress_debug_info = True
 # ── Prompt builder ─────────────────────────────────────────────────────────────
 
 
-def build_assessment_prompt(criteria: list[Criteria], repo_context: dict) -> str:
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in *text* without a model tokenizer."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def tokenizer_for(provider: str, model: str) -> Tokenizer:
+    """Return the token counter used to budget prompts for *model*.
+
+    :func:`estimate_tokens` unless ``AI_TOKENIZER=model``, which counts
+    exactly with litellm's tokenizer for the model at some cost in speed.
     """
-    Build the LLM prompt that asks the model to assess a repository against
-    the DevOps Maturity criteria.
+    if os.environ.get("AI_TOKENIZER", "estimate") != "model":
+        return estimate_tokens
+    litellm_model = _resolve_model(provider, model)
+    return lambda text: litellm.token_counter(model=litellm_model, text=text)
 
-    Returns a string ready to send as the user message.
+
+@dataclass(frozen=True)
+class AssessmentPrompt:
+    """A prompt built to a token budget.
+
+    ``tokens`` counts the whole prompt and ``section_tokens`` the evidence
+    kept of the CI files, file tree and README.
     """
-    file_list = "\n".join(f"  - {f}" for f in repo_context.get("files", [])[:100])
-    readme_excerpt = repo_context.get("readme", "")[:2000]
 
-    ci_sections = ""
-    for cf in repo_context.get("ci_files", []):
-        ci_sections += f"\n### {cf['path']}\n```\n{cf['content'][:1500]}\n```\n"
+    text: str
+    tokens: int
+    budget: int
+    section_tokens: dict[str, int]
+
 
+def _file_list(files: list[str]) -> str:
+    return "\n".join(f"  - {f}" for f in files)
+
+
+def _ci_section(path: str, content: str) -> str:
+    return f"\n### {path}\n```\n{content}\n```\n"
+
+
+def _render_prompt(
+    criteria: list[Criteria],
+    repo_context: dict,
+    file_heading: str,
+    file_list: str,
+    readme_excerpt: str,
+    ci_sections: str,
+) -> str:
     criteria_lines = "\n".join(
         f"- {c.id}: {c.criteria} — {c.description}" for c in criteria
     )
@@ -65,7 +134,7 @@ def build_assessment_prompt(criteria: list[Criteria], repo_context: dict) -> str
 - Language: {repo_context.get("language", "unknown")}
 - Description: {repo_context.get("description", "N/A")}
 
-## File Tree (up to 100 files)
+## {file_heading}
 {file_list if file_list else "  (no files detected)"}
 
 ## README (excerpt)
@@ -96,6 +165,131 @@ Respond ONLY with valid JSON. Do not include any prose, markdown, or explanation
 """
 
 
+def build_assessment_prompt(criteria: list[Criteria], repo_context: dict) -> str:
+    """
+    Build the LLM prompt that asks the model to assess a repository against
+    the DevOps Maturity criteria, cutting evidence at fixed lengths.
+
+    Returns a string ready to send as the user message.
+    See :func:`build_budgeted_prompt` to size the prompt in tokens instead.
+    """
+    return _render_prompt(
+        criteria,
+        repo_context,
+        "File Tree (up to 100 files)",
+        _file_list(repo_context.get("files", [])[:100]),
+        repo_context.get("readme", "")[:2000],
+        "".join(
+            _ci_section(cf["path"], cf["content"][:1500])
+            for cf in repo_context.get("ci_files", [])
+        ),
+    )
+
+
+def _longest_fit(n: int, tokens_of: Callable[[int], int], budget: int) -> int:
+    """Return the largest ``k <= n`` with ``tokens_of(k) <= budget``.
+
+    *tokens_of* must not decrease as *k* grows.
+    """
+    lo, hi = 0, n
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if tokens_of(mid) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _allocate(needs: dict[str, int], budget: int) -> dict[str, int]:
+    """Share *budget* among sections needing ``needs[section]`` tokens."""
+    alloc = {
+        s: min(needs[s], int(budget * share)) for s, share in _SECTION_SHARES.items()
+    }
+    left = budget - sum(alloc.values())
+    for section in _SECTION_SHARES:
+        extra = min(needs[section] - alloc[section], left)
+        alloc[section] += extra
+        left -= extra
+    return alloc
+
+
+def build_budgeted_prompt(
+    criteria: list[Criteria],
+    repo_context: dict,
+    max_tokens: Optional[int] = None,
+    tokenizer: Optional[Tokenizer] = None,
+) -> AssessmentPrompt:
+    """
+    Build the assessment prompt to fit *max_tokens* (default:
+    ``AI_PROMPT_TOKENS`` or 4000), counted with *tokenizer* (default:
+    :func:`estimate_tokens`).
+
+    The instructions and criteria are always sent in full. The remaining
+    budget is shared out by evidence priority: half is reserved for the
+    CI/CD files, taken in the order the fetcher ranked them, 30% for the
+    file tree and 20% for the README, and whatever a section does not need
+    goes to the others in that order. Sections are then cut to fit.
+    """
+    count = tokenizer or estimate_tokens
+    if max_tokens is None:
+        max_tokens = int(os.environ.get("AI_PROMPT_TOKENS", DEFAULT_PROMPT_TOKENS))
+    files = repo_context.get("files", [])
+    readme = repo_context.get("readme", "")
+    ci_files = repo_context.get("ci_files", [])
+
+    def heading(shown: int) -> str:
+        return f"File Tree ({shown} of {len(files)} files)"
+
+    fixed = count(
+        _render_prompt(criteria, repo_context, heading(len(files)), "", "", "")
+    )
+    ci_blocks = [_ci_section(cf["path"], cf["content"]) for cf in ci_files]
+    ci_tokens = [count(block) for block in ci_blocks]
+    needs = {
+        "ci_files": sum(ci_tokens),
+        "files": count(_file_list(files)),
+        "readme": count(readme),
+    }
+    alloc = _allocate(needs, max(0, max_tokens - fixed))
+
+    kept_blocks: list[str] = []
+    left = alloc["ci_files"]
+    for cf, block, tokens in zip(ci_files, ci_blocks, ci_tokens):
+        if tokens > left:
+            content = cf["content"]
+            room = left - count(_ci_section(cf["path"], ""))
+            if room >= _MIN_CI_FILE_TOKENS:
+                keep = _longest_fit(len(content), lambda k: count(content[:k]), room)
+                kept_blocks.append(_ci_section(cf["path"], content[:keep]))
+            break
+        kept_blocks.append(block)
+        left -= tokens
+    ci_sections = "".join(kept_blocks)
+
+    shown = _longest_fit(
+        len(files), lambda k: count(_file_list(files[:k])), alloc["files"]
+    )
+    file_list = _file_list(files[:shown])
+    readme_excerpt = readme[
+        : _longest_fit(len(readme), lambda k: count(readme[:k]), alloc["readme"])
+    ]
+
+    text = _render_prompt(
+        criteria, repo_context, heading(shown), file_list, readme_excerpt, ci_sections
+    )
+    return AssessmentPrompt(
+        text=text,
+        tokens=count(text),
+        budget=max_tokens,
+        section_tokens={
+            "ci_files": count(ci_sections),
+            "files": count(file_list),
+            "readme": count(readme_excerpt),
+        },
+    )
+
+
 def _resolve_model(provider: str, model: str) -> str:
     """
     Ensure the model name uses the litellm prefix required for the provider.
@@ -110,15 +304,39 @@ def _resolve_model(provider: str, model: str) -> str:
     return model
 
 
+def response_cache_key(provider: str, model: str, prompt: str) -> str:
+    """Return the :class:`AiResponseCache` key of a :func:`call_ai` request."""
+    return AiResponseCache.key(_resolve_model(provider, model), TEMPERATURE, prompt)
+
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Return the semaphore capping requests to *provider* in the running loop."""
+    per_loop = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if provider not in per_loop:
+        limit = int(
+            os.environ.get("AI_CONCURRENCY", DEFAULT_CONCURRENCY.get(provider, 4))
+        )
+        per_loop[provider] = asyncio.Semaphore(max(1, limit))
+    return per_loop[provider]
+
+
+def _request_timeout(timeout: Optional[float]) -> float:
+    if timeout is None:
+        timeout = float(os.environ.get("AI_REQUEST_TIMEOUT", DEFAULT_TIMEOUT))
+    return timeout
+
+
 # ── Public facade ──────────────────────────────────────────────────────────────
 
 
-def call_ai(
+async def call_ai_async(
     provider: str,
     model: str,
     prompt: str,
     api_key: Optional[str] = None,
     ollama_url: str = "http://localhost:11434",
+    cache: Optional[AiResponseCache] = None,
+    timeout: Optional[float] = None,
 ) -> str:
     """
     Call the specified AI *provider* via litellm and return the response text.
@@ -135,9 +353,19 @@ def call_ai(
         prompt:     The user prompt to send.
         api_key:    API key (not required for Ollama).
         ollama_url: Base URL for the Ollama server (default: localhost:11434).
+        cache:      Optional :class:`AiResponseCache`; a stored response for
+                    the same model, temperature and prompt is returned
+                    without calling the provider.
+        timeout:    Seconds to wait for the answer, not counting the wait
+                    for a free slot (default: ``AI_REQUEST_TIMEOUT`` or 120).
+
+    At most ``AI_CONCURRENCY`` requests per provider (default: see
+    :data:`DEFAULT_CONCURRENCY`) are in flight in one event loop; the others
+    wait. Cancelling the calling task abandons the request and frees its slot.
 
     Raises:
         ValueError: For unsupported providers or missing API keys.
+        TimeoutError: If the provider does not answer within *timeout*.
         litellm.exceptions.APIError: If the provider returns an error response.
     """
     valid_providers = {"openai", "anthropic", "gemini", "ollama"}
@@ -153,11 +381,16 @@ def call_ai(
         )
 
     litellm_model = _resolve_model(provider, model)
+    cache_key = response_cache_key(provider, model, prompt)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
 
     kwargs: dict = {
         "model": litellm_model,
         "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.1,
+        "temperature": TEMPERATURE,
     }
 
     if api_key:
@@ -168,11 +401,35 @@ def call_ai(
     elif provider == "openai":
         kwargs["response_format"] = {"type": "json_object"}
 
-    # Set a generous timeout so large prompts complete
-    os.environ.setdefault("LITELLM_REQUEST_TIMEOUT", "120")
+    timeout = _request_timeout(timeout)
+    kwargs["timeout"] = timeout
+
+    async with _provider_semaphore(provider):
+        try:
+            response = await asyncio.wait_for(litellm.acompletion(**kwargs), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"{provider} did not answer within {timeout:g} seconds."
+            ) from None
+    raw = response.choices[0].message.content  # type: ignore[union-attr]
+    if cache is not None and raw:
+        cache.put(cache_key, raw, litellm_model)
+    return raw
+
 
-    response = litellm.completion(**kwargs)
-    return response.choices[0].message.content  # type: ignore[union-attr]
+def call_ai(
+    provider: str,
+    model: str,
+    prompt: str,
+    api_key: Optional[str] = None,
+    ollama_url: str = "http://localhost:11434",
+    cache: Optional[AiResponseCache] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    """Blocking version of :func:`call_ai_async`."""
+    return asyncio.run(
+        call_ai_async(provider, model, prompt, api_key, ollama_url, cache, timeout)
+    )
 
 
 def parse_ai_response(
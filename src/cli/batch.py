@@ -0,0 +1,196 @@
+"""Pipelined AI auto-assessment of many repositories (``dm assess-batch``).
+
+Every repository goes through fetch → prompt → AI call → parse → save. The
+fetch and AI stages have separate concurrency limits, so some repositories
+are fetched while others wait for the model. Each result is appended to an
+NDJSON file as soon as it is ready, and only then saved; running the batch
+again with the same file skips the repositories that file already records
+as assessed.
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncContextManager, Awaitable, Callable, Iterable, Optional, TextIO
+
+_WEB_URLS = {
+    "github": "https://github.com",
+    "gitlab": "https://gitlab.com",
+    "bitbucket": "https://bitbucket.org",
+}
+
+
+@dataclass(frozen=True)
+class BatchTarget:
+    """One repository of a batch, optionally with the URL it was given as."""
+
+    provider: str
+    owner: str
+    repo: str
+    url: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Identifies the repository in the results file."""
+        return f"{self.provider}:{self.owner}/{self.repo}"
+
+    @property
+    def project_url(self) -> str:
+        return self.url or f"{_WEB_URLS[self.provider]}/{self.owner}/{self.repo}"
+
+
+@dataclass
+class BatchSummary:
+    assessed: int = 0
+    failed: int = 0
+
+
+def parse_target(line: str, provider: Optional[str] = None) -> BatchTarget:
+    """Parse a repository URL, or an ``owner/repo`` name of *provider*.
+
+    Raises:
+        ValueError: If *line* names no repository.
+    """
+    from cli.repo_fetcher import parse_provider_and_repo
+
+    if "://" in line or line.startswith("git@"):
+        detected, owner, repo = parse_provider_and_repo(line)
+        return BatchTarget(detected, owner, repo, line)
+    if not provider:
+        raise ValueError(
+            f"{line!r} is not a repository URL. "
+            "Use --provider to list repositories as owner/repo."
+        )
+    owner, _, repo = line.rpartition("/")
+    if not owner or not repo:
+        raise ValueError(f"Expected a repository URL or owner/repo, got {line!r}.")
+    return BatchTarget(provider, owner, repo.removesuffix(".git"))
+
+
+def read_targets(
+    lines: Iterable[str], provider: Optional[str] = None
+) -> list[BatchTarget]:
+    """Parse one repository per line, skipping blanks, comments and duplicates."""
+    targets: dict[str, BatchTarget] = {}
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            target = parse_target(line, provider)
+            targets.setdefault(target.key, target)
+    return list(targets.values())
+
+
+def completed_keys(path: Path) -> set[str]:
+    """Return the keys of the repositories *path* records as assessed.
+
+    Records of failed repositories, and a last line cut short by an
+    interruption, do not count, so those repositories are assessed again.
+    A repository whose result was written but could not be saved is
+    followed by an error record, which cancels the earlier one.
+    """
+    done: set[str] = set()
+    try:
+        f = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return done
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            repo = record.get("repo") if isinstance(record, dict) else None
+            if not isinstance(repo, str):
+                continue
+            if "error" in record:
+                done.discard(repo)
+            else:
+                done.add(repo)
+    return done
+
+
+def open_results(path: Path) -> TextIO:
+    """Open *path* for appending, ending a line cut short by an interruption."""
+    try:
+        with open(path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    except OSError:
+        pass  # missing or empty
+    return open(path, "a", encoding="utf-8")
+
+
+async def run_batch(
+    targets: Iterable[BatchTarget],
+    fetch: Callable[[BatchTarget], Awaitable[dict]],
+    assess: Callable[[BatchTarget, dict, AsyncContextManager], Awaitable[dict]],
+    out: TextIO,
+    fetch_concurrency: int,
+    ai_concurrency: int,
+    on_record: Optional[Callable[[dict], None]] = None,
+    save: Optional[Callable[[BatchTarget], Awaitable[None]]] = None,
+) -> BatchSummary:
+    """Fetch and assess *targets*, writing one JSON record per line to *out*.
+
+    *fetch* returns the repository context and *assess* turns it into the
+    result record. At most *fetch_concurrency* fetches run at once, and
+    *assess* is handed an AI slot to hold while it waits for the model, of
+    which there are *ai_concurrency*; repositories settled without the model
+    never wait for one. A repository whose fetch or assessment raises is
+    recorded with an ``error`` instead. Records are written in the order
+    repositories finish and flushed one by one, so an interrupted batch
+    loses none.
+
+    *save* is awaited for each assessed repository once its record is on
+    disk, so a batch interrupted in between never saves a repository twice
+    when resumed. If *save* raises, an error record follows the result.
+    """
+    fetch_slots = asyncio.Semaphore(max(1, fetch_concurrency))
+    ai_slots = asyncio.Semaphore(max(1, ai_concurrency))
+    # Caps the fetched contexts waiting for an AI slot
+    in_flight = asyncio.Semaphore(max(1, fetch_concurrency) + max(1, ai_concurrency))
+    summary = BatchSummary()
+
+    def failure(target: BatchTarget, exc: Exception) -> dict:
+        return {
+            "repo": target.key,
+            "project_url": target.project_url,
+            "error": str(exc) or type(exc).__name__,
+        }
+
+    def write(record: dict) -> None:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+
+    async def run(target: BatchTarget) -> None:
+        try:
+            async with fetch_slots:
+                context = await fetch(target)
+            record = {"repo": target.key, **await assess(target, context, ai_slots)}
+        except Exception as exc:
+            record = failure(target, exc)
+        finally:
+            in_flight.release()
+        write(record)
+        if save is not None and "error" not in record:
+            try:
+                await save(target)
+            except Exception as exc:
+                record = failure(target, exc)
+                write(record)
+        if "error" in record:
+            summary.failed += 1
+        else:
+            summary.assessed += 1
+        if on_record is not None:
+            on_record(record)
+
+    tasks = []
+    for target in targets:
+        await in_flight.acquire()
+        tasks.append(asyncio.ensure_future(run(target)))
+    await asyncio.gather(*tasks)
+    return summary
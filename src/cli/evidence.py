@@ -0,0 +1,393 @@
+"""Rule-based pre-assessment of repository evidence.
+
+Settles the criteria that the file list and CI/CD files collected by
+:mod:`cli.repo_fetcher` prove to be met, so only the remaining criteria are
+sent to the AI model. Rules only ever mark a criterion as met: the fetcher
+sees a bounded part of the repository, so missing evidence proves nothing
+and is left for the model to judge. Tools count only when a pipeline
+definition runs them as a command or action; prose, comments, step names
+and install or echo lines are never matched.
+
+The rules follow the criterion IDs of the bundled ``criteria.yaml``; set
+``AI_PREPASS=0`` when assessing against criteria that reuse those IDs for
+something else.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional
+
+import yaml
+
+from core.model import Criteria, UserResponse
+
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Files whose presence settles a criterion; matched against lowercased paths
+_PATH_EVIDENCE = {
+    # CI/CD as Code
+    "D402": r"^\.github/workflows/[^/]+\.ya?ml$|(?:^|/)\.gitlab-ci\.yml$"
+    r"|(?:^|/)jenkinsfile$|^bitbucket-pipelines\.yml$|^azure-pipelines\.ya?ml$"
+    r"|^\.circleci/config\.ya?ml$|^\.travis\.yml$",
+    # Dependency Pinning
+    "D404": r"(?:^|/)(?:poetry\.lock|pipfile\.lock|uv\.lock|pdm\.lock"
+    r"|package-lock\.json|npm-shrinkwrap\.json|yarn\.lock|pnpm-lock\.yaml"
+    r"|bun\.lockb?|cargo\.lock|go\.sum|gemfile\.lock|composer\.lock"
+    r"|packages\.lock\.json|gradle\.lockfile|mix\.lock|pubspec\.lock)$",
+    # Vulnerability Scanning
+    "D301": r"^\.github/dependabot\.ya?ml$|(?:^|/)\.snyk$",
+    # Documented Build Process
+    "D401": r"^(?:building|install)(?:\.md|\.rst|\.txt)?$",
+}
+
+# Tools whose run by a pipeline settles a criterion. Matched against each
+# lowercased shell statement from its command word on, so installing,
+# echoing or naming a tool proves nothing.
+_COMMAND_EVIDENCE = {
+    # Unit Testing
+    "D201": r"pytest\b|unittest\b|go test\b|(?:npm|yarn|pnpm|bun)(?: run)? test\b"
+    r"|mvnw? .*?\b(?:test|verify)\b|gradlew? .*?\b(?:test|check)\b"
+    r"|cargo (?:test|nextest)\b|tox\b|nox\b|jest\b|vitest\b|make test\b"
+    r"|dotnet test\b|phpunit\b|rspec\b|ctest\b|coverage run .*?-m (?:pytest|unittest)\b",
+    # Functional Testing
+    "D202": r"cypress (?:run|ci)\b|playwright test\b|behave\b|robot\b"
+    r"|selenium-side-runner\b",
+    # Performance Testing
+    "D203": r"k6 run\b|locust\b|jmeter\b|gatling(?:\.sh)?\b|artillery run\b"
+    r"|cargo bench\b|go test .*?-bench\b|pytest\b.*?--benchmark-only\b|hyperfine\b",
+    # Code Coverage
+    "D204": r"pytest\b.*?--cov\b|coverage run\b|(?:jest|vitest)\b.*?--coverage\b"
+    r"|nyc\b|c8\b|codecov\b|coveralls\b|go test .*?-cover(?:profile)?\b"
+    r"|cargo (?:tarpaulin|llvm-cov)\b|(?:mvnw?|gradlew?) .*?\bjacoco",
+    # Accessibility Testing
+    "D205": r"pa11y(?:-ci)?\b|lhci\b|lighthouse\b|axe\b",
+    # Vulnerability Scanning
+    "D301": r"trivy\b|snyk (?:test|monitor)\b|grype\b|pip-audit\b"
+    r"|(?:npm|yarn|pnpm) audit\b|osv-scanner\b|safety (?:check|scan)\b"
+    r"|dependency-check(?:\.sh)?\b|gosec\b|govulncheck\b|cargo audit\b"
+    r"|bundle(?:r)?-audit\b",
+    # License Scanning
+    "D302": r"fossa\b|license-checker\b|licensee\b|scancode\b|pip-licenses\b"
+    r"|license_finder\b|cargo deny\b|reuse lint\b",
+    # Artifact Signing
+    "D403": r"cosign (?:sign|attest)|gpg .*?--(?:detach-)?sign\b|notation sign\b",
+    # SBOM Generation
+    "D405": r"syft\b|cyclonedx[-\w]*\b|cdxgen\b|spdx-sbom-generator\b",
+    # Static Code Analysis
+    "D501": r"semgrep\b|bandit\b|gosec\b|spotbugs\b|pmd\b|sonar-scanner\b"
+    r"|codeql\b|cov-build\b",
+    # Dynamic Code Analysis
+    "D502": r"zap-(?:baseline|full-scan|api-scan)(?:\.py)?\b|afl-fuzz\b"
+    r"|cargo fuzz\b|go test .*?-fuzz\b",
+    # Code Linting
+    "D503": r"ruff\b|flake8\b|eslint\b|pylint\b|golangci-lint\b|rubocop\b"
+    r"|cargo clippy\b|checkstyle\b|ktlint\b|shellcheck\b|hadolint\b|stylelint\b"
+    r"|markdownlint[-\w]*\b|yamllint\b|black --check\b|prettier --check\b"
+    r"|(?:npm|yarn|pnpm)(?: run)? lint\b|make lint\b|pre-commit run\b",
+    # Notifications & Alerts
+    "D601": r"curl\b.*?(?:hooks\.slack\.com|discord\.com/api/webhooks"
+    r"|webhook\.office\.com|events\.pagerduty\.com)",
+    # Attached Reports
+    "D602": r"pytest\b.*?--junit-?xml\b|gotestsum\b.*?--junitfile\b"
+    r"|jest\b.*?jest-junit\b",
+}
+
+# Actions, tasks and named steps whose use settles a criterion; matched
+# against the lowercased ``uses:``/``task:`` value or step name
+_ACTION_EVIDENCE = {
+    # Functional Testing
+    "D202": r"cypress-io/github-action",
+    # Performance Testing
+    "D203": r"github-action-benchmark|k6-action",
+    # Code Coverage
+    "D204": r"codecov|coveralls|jacoco",
+    # Accessibility Testing
+    "D205": r"lighthouse-ci|pa11y|axe-",
+    # Vulnerability Scanning
+    "D301": r"codeql|trivy|snyk|anchore/scan-action|dependency-review-action"
+    r"|osv-scanner|govulncheck|dependency-check",
+    # License Scanning
+    "D302": r"fossa|license-checker|licensee|scancode|license_finder",
+    # Artifact Signing
+    "D403": r"cosign|sigstore|attest-build-provenance|slsa-github-generator"
+    r"|slsa-framework",
+    # SBOM Generation
+    "D405": r"sbom-action|cyclonedx|syft",
+    # Static Code Analysis
+    "D501": r"codeql|sonar|semgrep|bandit|gosec|spotbugs|\bpmd\b|coverity",
+    # Dynamic Code Analysis
+    "D502": r"zaproxy|cifuzz|oss-fuzz",
+    # Code Linting
+    "D503": r"super-linter|ruff|flake8|eslint|pylint|golangci-lint|rubocop"
+    r"|clippy|hadolint|shellcheck|markdownlint|yamllint|pre-commit/action",
+    # Notifications & Alerts
+    "D601": r"slack-github-action|action-slack|^slacksend$|msteams|discord"
+    r"|pagerduty|opsgenie",
+    # Attached Reports
+    "D602": r"upload-sarif|junit|store_test_results|publishtestresults"
+    r"|test-reporter",
+}
+
+_PATH_PATTERNS = {cid: re.compile(p) for cid, p in _PATH_EVIDENCE.items()}
+_COMMAND_PATTERNS = {cid: re.compile(p) for cid, p in _COMMAND_EVIDENCE.items()}
+_ACTION_PATTERNS = {cid: re.compile(p) for cid, p in _ACTION_EVIDENCE.items()}
+# Keys of GitHub, GitLab, Bitbucket, Azure, CircleCI and Travis steps
+_SCRIPT_KEYS = frozenset(
+    {
+        "run",
+        "script",
+        "before_script",
+        "after_script",
+        "command",
+        "bash",
+        "pwsh",
+        "powershell",
+        "install",
+        "before_install",
+        "after_success",
+    }
+)
+_ACTION_KEYS = frozenset({"uses", "task"})
+_SHELL_COMMENT = re.compile(r"(?:^|\s)#.*$", re.MULTILINE)
+_SHELL_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"|\'[^\']*\'')
+_SHELL_SEPARATOR = re.compile(r"&&|\|\||[;|\n]")
+# What may precede the command word of a statement: variable assignments,
+# wrappers that run the next word, and the directory of the command
+_COMMAND_PREFIX = re.compile(
+    r"(?:\w+=\S*|sudo(?: -\S+)*|env|time|exec|if|then|else|elif|do|!"
+    r"|python[\d.]* -m|py -m|npx(?: -\S+)*|uvx|pipx run|bundle exec"
+    r"|(?:uv|poetry|pipenv|pdm|hatch|rye) run)\s+|\S*/(?=\S)"
+)
+_GROOVY_COMMENT = re.compile(r"/\*.*?\*/|^\s*//[^\n]*", re.DOTALL | re.MULTILINE)
+# Jenkinsfile shell steps, and the step each statement starts with
+_JENKINS_SHELL = re.compile(
+    r"""\b(?:sh|bat|pwsh|powershell)\b\s*\(?\s*(?:script\s*:\s*)?"""
+    r"""('''|\"\"\"|'|")(.*?)\1""",
+    re.DOTALL,
+)
+_JENKINS_STEP = re.compile(r"^\s*([a-z]\w*)\b", re.IGNORECASE | re.MULTILINE)
+# README headings that introduce build instructions
+_BUILD_HEADING = re.compile(
+    r"^#+ [^\n]*\b(?:build|building|development|from source)\b",
+    re.MULTILINE,
+)
+# GitHub-hosted runner labels; every job gets a fresh virtual machine
+_HOSTED_RUNNER = re.compile(r"^(?:ubuntu|windows|macos)-")
+
+
+def _load_yaml(text: str) -> Any:
+    """Parse *text*, dropping a last line cut short by the fetcher's size cap."""
+    for candidate in (text, text.rpartition("\n")[0]):
+        try:
+            return yaml.load(candidate, Loader=_YamlLoader)
+        except yaml.YAMLError:
+            continue
+    return None
+
+
+def _branch_filter_matches_all(config: Any) -> bool:
+    """True if a GitHub ``push`` trigger fires for pushes to any branch."""
+    if not config:
+        return True
+    if not isinstance(config, dict):
+        return False
+    if "branches" in config:
+        return any("*" in str(b) for b in config["branches"] or [])
+    return "tags" not in config and "paths" not in config
+
+
+def _github_evidence(path: str, doc: dict) -> dict[str, str]:
+    # PyYAML reads the bare key ``on`` as True
+    triggers = doc.get("on", doc.get(True))
+    if isinstance(triggers, str):
+        triggers = {triggers: None}
+    elif isinstance(triggers, list):
+        triggers = dict.fromkeys(triggers)
+    elif not isinstance(triggers, dict):
+        triggers = {}
+
+    found = {}
+    if "push" in triggers and _branch_filter_matches_all(triggers["push"]):
+        found["D101"] = f"{path} runs on pushes to every branch"
+    if "pull_request" in triggers or "pull_request_target" in triggers:
+        found["D102"] = f"{path} runs on pull requests"
+    jobs = doc.get("jobs")
+    for job in jobs.values() if isinstance(jobs, dict) else []:
+        if not isinstance(job, dict):
+            continue
+        runs_on = job.get("runs-on")
+        label = runs_on[0] if isinstance(runs_on, list) and runs_on else runs_on
+        if job.get("container") or _HOSTED_RUNNER.match(str(label or "")):
+            found["D103"] = f"{path} runs jobs on fresh hosted runners or containers"
+            break
+    return found
+
+
+def _gitlab_evidence(path: str, doc: dict) -> dict[str, str]:
+    jobs = [job for job in doc.values() if isinstance(job, dict) and "script" in job]
+    found = {}
+    if "workflow" not in doc and any(
+        not ({"only", "except", "rules"} & job.keys()) for job in jobs
+    ):
+        found["D101"] = f"{path} runs on pushes to every branch"
+    if "image" in doc or any("image" in job for job in jobs):
+        found["D103"] = f"{path} runs jobs in container images"
+    if any(
+        isinstance(job.get("artifacts"), dict) and job["artifacts"].get("reports")
+        for job in jobs
+    ):
+        found["D602"] = f"{path} attaches job reports"
+    return found
+
+
+def _bitbucket_evidence(path: str, doc: dict) -> dict[str, str]:
+    pipelines = doc.get("pipelines")
+    if not isinstance(pipelines, dict):
+        return {}
+    found = {"D103": f"{path} runs every step in a fresh container"}
+    branches = pipelines.get("branches")
+    if "default" in pipelines or (
+        isinstance(branches, dict) and {"*", "**"} & branches.keys()
+    ):
+        found["D101"] = f"{path} runs on pushes to every branch"
+    if "pull-requests" in pipelines:
+        found["D102"] = f"{path} runs on pull requests"
+    return found
+
+
+def _strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+@dataclass(frozen=True)
+class _Pipeline:
+    """What a pipeline definition proves and runs."""
+
+    evidence: dict[str, str] = field(default_factory=dict)
+    scripts: list[str] = field(default_factory=list)
+    actions: list[str] = field(default_factory=list)
+
+
+def _read_yaml_steps(node: Any, pipeline: _Pipeline) -> None:
+    """Collect the shell scripts and actions of a parsed pipeline definition."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in _SCRIPT_KEYS and not isinstance(value, dict):
+                pipeline.scripts.extend(_strings(value))
+            elif key in _ACTION_KEYS:
+                pipeline.actions.extend(_strings(value))
+            else:
+                _read_yaml_steps(value, pipeline)
+    elif isinstance(node, list):
+        for item in node:
+            # CircleCI steps are named by their only key
+            if isinstance(item, dict) and len(item) == 1:
+                pipeline.actions.append(str(next(iter(item))))
+            _read_yaml_steps(item, pipeline)
+
+
+def _read_jenkinsfile(content: str) -> _Pipeline:
+    content = _GROOVY_COMMENT.sub("", content)
+    return _Pipeline(
+        scripts=[m.group(2) for m in _JENKINS_SHELL.finditer(content)],
+        actions=[m.group(1) for m in _JENKINS_STEP.finditer(content)],
+    )
+
+
+def _read_pipeline(path: str, content: str) -> _Pipeline:
+    """Read a pipeline definition; other files yield an empty pipeline."""
+    if not _PATH_PATTERNS["D402"].search(path.lower()):
+        return _Pipeline()
+    if path.lower().endswith("jenkinsfile"):
+        return _read_jenkinsfile(content)
+    doc = _load_yaml(content)
+    if not isinstance(doc, dict):
+        return _Pipeline()
+    if path.startswith(".github/workflows/"):
+        pipeline = _Pipeline(_github_evidence(path, doc))
+    elif path.endswith(".gitlab-ci.yml"):
+        pipeline = _Pipeline(_gitlab_evidence(path, doc))
+    elif path == "bitbucket-pipelines.yml":
+        pipeline = _Pipeline(_bitbucket_evidence(path, doc))
+    else:
+        pipeline = _Pipeline()
+    _read_yaml_steps(doc, pipeline)
+    return pipeline
+
+
+def _statements(script: str) -> Iterator[str]:
+    """Yield each statement of a shell *script* from its command word on.
+
+    Comments and quoted strings are dropped first, so neither can start a
+    statement of its own.
+    """
+    script = _SHELL_COMMENT.sub("", script.lower().replace("\\\n", " "))
+    for statement in _SHELL_SEPARATOR.split(_SHELL_QUOTED.sub('""', script)):
+        statement = statement.strip()
+        while m := _COMMAND_PREFIX.match(statement):
+            statement = statement[m.end() :]
+        if statement:
+            yield statement
+
+
+def settle_criteria(criteria: Iterable[Criteria], repo_context: dict) -> dict[str, str]:
+    """Return ``{criterion id: evidence}`` for the criteria proven to be met.
+
+    The evidence is a short human-readable note, e.g. the file that
+    settled the criterion.
+    """
+    wanted = {c.id for c in criteria}
+    found: dict[str, str] = {}
+
+    def record(cid: str, evidence: str) -> None:
+        if cid in wanted:
+            found.setdefault(cid, evidence)
+
+    for ci_file in repo_context.get("ci_files", []):
+        path = ci_file["path"]
+        pipeline = _read_pipeline(path, ci_file["content"])
+        for cid, evidence in pipeline.evidence.items():
+            record(cid, evidence)
+        for statement in (
+            s for script in pipeline.scripts for s in _statements(script)
+        ):
+            for cid, pattern in _COMMAND_PATTERNS.items():
+                m = pattern.match(statement)
+                if m and cid not in found:
+                    record(cid, f"{path} uses {m.group()}")
+        for action in pipeline.actions:
+            for cid, pattern in _ACTION_PATTERNS.items():
+                if cid not in found and pattern.search(action.lower()):
+                    record(cid, f"{path} uses {action}")
+
+    paths = [*repo_context.get("files", [])]
+    paths += [f["path"] for f in repo_context.get("ci_files", [])]
+    for path in paths:
+        lowered = path.lower()
+        for cid, pattern in _PATH_PATTERNS.items():
+            if cid not in found and pattern.search(lowered):
+                record(cid, f"{path} is present")
+
+    readme: Optional[str] = repo_context.get("readme")
+    if readme:
+        m = _BUILD_HEADING.search(readme.lower())
+        if m:
+            record("D401", f"README section {m.group().lstrip('# ')!r}")
+    return found
+
+
+def merge_responses(
+    criteria: Iterable[Criteria],
+    settled: dict[str, str],
+    ai_responses: Iterable[UserResponse],
+) -> list[UserResponse]:
+    """Combine settled criteria and AI answers into one response per criterion."""
+    answers = {r.id: r.answer for r in ai_responses}
+    return [
+        UserResponse(id=c.id, answer=c.id in settled or answers.get(c.id, False))
+        for c in criteria
+    ]
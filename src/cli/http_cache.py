@@ -0,0 +1,214 @@
+"""Persistent HTTP response cache for the git provider APIs.
+
+Responses that carry an ``ETag`` or ``Last-Modified`` header are stored in
+the user cache directory. They are revalidated on the next request with
+``If-None-Match`` / ``If-Modified-Since``, and a ``304 Not Modified`` is
+answered from disk. GitHub does not count 304s against the rate limit.
+Large bodies can be streamed through the cache with :meth:`HttpCache.stream`.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from config.cache import cache_dir
+
+DEFAULT_MAX_MB = 100
+
+# Headers describing the stored (already decoded) body that must not be replayed
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+# Request headers that select what a response may contain
+_AUTH_HEADERS = ("authorization", "private-token")
+_CHUNK_SIZE = 64 * 1024
+
+
+def evict_lru(directory: Path, max_bytes: int) -> None:
+    """Delete the files in *directory* with the oldest mtime until it fits *max_bytes*."""
+    try:
+        entries = [(p, p.stat()) for p in directory.iterdir() if p.is_file()]
+    except OSError:
+        return
+    total = sum(st.st_size for _, st in entries)
+    for path, st in sorted(entries, key=lambda e: e[1].st_mtime_ns):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= st.st_size
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+
+@dataclass
+class _Entry:
+    headers: dict
+    body: bytes
+
+    def validators(self) -> dict:
+        validators = {}
+        if "etag" in self.headers:
+            validators["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            validators["If-Modified-Since"] = self.headers["last-modified"]
+        return validators
+
+
+@dataclass
+class HttpCache:
+    """On-disk cache of GET responses, evicted least recently used first.
+
+    Each entry is one file: a JSON header line followed by the body. Reads
+    bump the file's mtime, and writes evict the oldest files once the
+    directory exceeds *max_bytes*.
+    """
+
+    directory: Path
+    max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    @classmethod
+    def default(cls) -> "HttpCache":
+        """Cache in ``<cache dir>/http``, capped at ``HTTP_CACHE_MAX_MB``."""
+        max_mb = float(os.environ.get("HTTP_CACHE_MAX_MB", DEFAULT_MAX_MB))
+        return cls(cache_dir() / "http", int(max_mb * 1024 * 1024))
+
+    def _path(self, url: str, request_headers: httpx.Headers) -> Path:
+        # Responses for different credentials may differ (private repos)
+        auth = [request_headers.get(h, "") for h in _AUTH_HEADERS]
+        key = hashlib.sha256(json.dumps([url, *auth]).encode()).hexdigest()
+        return self.directory / key
+
+    def _load_headers(self, path: Path) -> Optional[dict]:
+        try:
+            with open(path, "rb") as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    def _load(self, path: Path) -> Optional[_Entry]:
+        try:
+            with open(path, "rb") as f:
+                headers = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return _Entry(headers, body)
+
+    def _tmp_path(self, path: Path) -> Path:
+        return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    def _header_line(self, response: httpx.Response) -> bytes:
+        headers = {
+            k: v for k, v in response.headers.items() if k not in _DROPPED_HEADERS
+        }
+        return json.dumps(headers).encode() + b"\n"
+
+    def _store(self, path: Path, response: httpx.Response) -> None:
+        tmp = self._tmp_path(path)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(self._header_line(response))
+                f.write(response.content)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits *max_bytes*."""
+        evict_lru(self.directory, self.max_bytes)
+
+    async def get(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
+        """``client.get(url)``, revalidating and refreshing the cached copy."""
+        path = self._path(url, client.headers)
+        entry = self._load(path)
+        response = await client.get(url, headers=entry.validators() if entry else None)
+        if response.status_code == 304 and entry is not None:
+            self.stats.hits += 1
+            return httpx.Response(
+                200, headers=entry.headers, content=entry.body, request=response.request
+            )
+        self.stats.misses += 1
+        if response.status_code == 200 and (
+            "etag" in response.headers or "last-modified" in response.headers
+        ):
+            self._store(path, response)
+        return response
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self, client: httpx.AsyncClient, url: str
+    ) -> AsyncIterator[Optional[AsyncIterator[bytes]]]:
+        """Streaming :meth:`get`: yield the body chunks, or None on failure.
+
+        A fresh body is written to the cache while it is read and kept only
+        if it was read to the end; a 304 replays the cached body from disk.
+        Either way the body is never held in memory as a whole.
+        """
+        path = self._path(url, client.headers)
+        headers = self._load_headers(path)
+        validators = _Entry(headers, b"").validators() if headers else None
+        async with client.stream("GET", url, headers=validators) as response:
+            if response.status_code == 304 and headers is not None:
+                self.stats.hits += 1
+                yield self._replay(path)
+                return
+            self.stats.misses += 1
+            if not response.is_success:
+                yield None
+            elif response.status_code == 200 and (
+                "etag" in response.headers or "last-modified" in response.headers
+            ):
+                yield self._tee(path, response)
+            else:
+                yield response.aiter_bytes()
+
+    async def _replay(self, path: Path) -> AsyncIterator[bytes]:
+        with open(path, "rb") as f:
+            f.readline()
+            os.utime(path)
+            while chunk := f.read(_CHUNK_SIZE):
+                yield chunk
+
+    async def _tee(self, path: Path, response: httpx.Response) -> AsyncIterator[bytes]:
+        tmp = self._tmp_path(path)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            f = open(tmp, "wb")
+        except OSError:
+            async for chunk in response.aiter_bytes():
+                yield chunk
+            return
+        complete = False
+        try:
+            with f:
+                f.write(self._header_line(response))
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+                    yield chunk
+            os.replace(tmp, path)
+            complete = True
+        finally:
+            if not complete:
+                tmp.unlink(missing_ok=True)
+        self.evict()
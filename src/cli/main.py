@@ -1,37 +1,46 @@
+import functools
 import json
 import os
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncContextManager, Optional
 
 import typer
-import yaml
-from core.model import UserResponse, Assessment, SessionLocal, init_db
-from core.scorer import calculate_score, score_to_level, calculate_category_scores
-from core.badge import get_badge_url
 from core import __version__
-from config.loader import load_criteria_config
-from cli.ai_client import (
-    DEFAULT_MODELS,
-    build_assessment_prompt,
-    call_ai,
-    parse_ai_response,
-)
-from cli.repo_fetcher import (
-    detect_remote_url,
-    fetch_repo_context,
-    parse_provider_and_repo,
-)
 
-# Load criteria and categories from config
-categories, criteria = load_criteria_config()
+# Everything heavier than typer (the criteria, SQLAlchemy, litellm, httpx) is
+# imported inside the commands that need it, so ``--version`` and ``--help``
+# stay fast. tests/test_startup.py enforces this.
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
 
-# Initialize database
-init_db()
+    from core.index import CriteriaIndex
 
 app = typer.Typer(
     help="Run DevOps maturity assessment interactively.", add_completion=False
 )
 
 
+def _criteria_index() -> "CriteriaIndex":
+    from config.loader import get_criteria_index
+
+    return get_criteria_index()
+
+
+@functools.cache
+def _init_db() -> None:
+    from core.model import init_db
+
+    init_db()
+
+
+def _db_session() -> "Session":
+    """Open a database session, creating or upgrading the schema on first use."""
+    from core.model import SessionLocal
+
+    _init_db()
+    return SessionLocal()
+
+
 def version_callback(value: bool):
     if value:
         typer.echo(f"Version: {__version__}")
@@ -40,33 +49,31 @@ def version_callback(value: bool):
 
 def _build_result(responses, project_name=None, project_url=None, source="manual"):
     """Build a result dict shared by text and JSON output paths."""
-    score = calculate_score(criteria, responses)
-    level = score_to_level(score)
-    badge_url = get_badge_url(level)
+    from core.badge import get_badge_url
+
+    evaluation = _criteria_index().evaluate(responses)
+    badge_url = get_badge_url(evaluation.level)
     badge_markdown = (
         f"[![DevOps Maturity Badge]({badge_url})](https://devops-maturity.github.io/)"
     )
 
-    category_scores = calculate_category_scores(criteria, responses)
-    response_map = {r.id: r.answer for r in responses}
     failed = [
         {"id": c.id, "criteria": c.criteria, "description": c.description}
-        for c in criteria
-        if not response_map.get(c.id)
-    ]
-    passed = [
-        {"id": c.id, "criteria": c.criteria} for c in criteria if response_map.get(c.id)
+        for c in evaluation.failed
     ]
+    passed = [{"id": c.id, "criteria": c.criteria} for c in evaluation.passed]
 
     return {
         "project_name": project_name or "default",
         "project_url": project_url,
         "assessment_source": source,
-        "score": round(score, 1),
-        "level": level,
+        "score": round(evaluation.score, 1),
+        "level": evaluation.level,
         "badge_url": badge_url,
         "badge_markdown": badge_markdown,
-        "category_scores": {cat: round(s, 1) for cat, s in category_scores.items()},
+        "category_scores": {
+            cat: round(s, 1) for cat, s in evaluation.category_scores.items()
+        },
         "passed": passed,
         "failed": failed,
     }
@@ -74,13 +81,16 @@ def _build_result(responses, project_name=None, project_url=None, source="manual
 
 def _save_to_db(responses, project_name=None, project_url=None):
     """Persist assessment to the database."""
-    db = SessionLocal()
+    from core.model import Assessment
+
+    db = _db_session()
     responses_dict = {r.id: r.answer for r in responses}
     assessment = Assessment(
         project_name=project_name or "default",
         project_url=project_url or None,
-        responses=responses_dict,
     )
+    assessment.set_responses(responses_dict)
+    assessment.apply_evaluation(_criteria_index().evaluate(responses_dict))
     db.add(assessment)
     db.commit()
     db.close()
@@ -100,13 +110,6 @@ def save_responses(
     typer.secho("Assessment saved to database.", fg=typer.colors.GREEN, bold=True)
 
 
-def _category_for_id(criteria_id: str) -> str:
-    for c in criteria:
-        if c.id == criteria_id:
-            return c.category
-    return "Unknown"
-
-
 def _print_text_result(result):
     """Pretty-print the assessment result to the terminal."""
     typer.secho(
@@ -129,9 +132,10 @@ def _print_text_result(result):
     # Improvement recommendations
     if result["failed"]:
         typer.secho("\nImprovement Recommendations:", fg=typer.colors.YELLOW, bold=True)
+        criteria_index = _criteria_index()
         current_cat = None
         for c in result["failed"]:
-            cat = _category_for_id(c["id"])
+            cat = criteria_index.category_of(c["id"])
             if cat != current_cat:
                 current_cat = cat
                 typer.secho(f"\n  {cat}:", fg=typer.colors.CYAN, bold=True)
@@ -212,6 +216,35 @@ def assess(
         "--ollama-url",
         help="Base URL for a local Ollama server.",
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Fetch every repository file again instead of revalidating cached copies.",
+    ),
+    snapshot: bool = typer.Option(
+        False,
+        "--snapshot",
+        help=(
+            "Download the repository as one archive instead of one API request "
+            "per file. Lists every file, also on Bitbucket."
+        ),
+    ),
+    no_ai_cache: bool = typer.Option(
+        False,
+        "--no-ai-cache",
+        help="Always ask the AI provider and do not store its response.",
+    ),
+    refresh_ai_cache: bool = typer.Option(
+        False,
+        "--refresh-ai-cache",
+        help="Ask the AI provider again and replace the cached response.",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Print extra details such as HTTP cache hit rates.",
+    ),
 ):
     """Run an interactive DevOps maturity assessment.
 
@@ -247,6 +280,11 @@ def assess(
             ai_api_key=ai_api_key,
             ollama_url=ollama_url,
             output_format=output_format,
+            use_cache=not no_cache,
+            verbose=verbose,
+            snapshot=snapshot,
+            use_ai_cache=not no_ai_cache,
+            refresh_ai_cache=refresh_ai_cache,
         )
         return
 
@@ -260,6 +298,8 @@ def assess(
         )
         raise typer.Exit(1)
 
+    from core.model import UserResponse
+
     responses = []
     typer.echo("DevOps Maturity Assessment\n")
 
@@ -267,24 +307,17 @@ def assess(
     if project_name is None:
         project_name = typer.prompt("Project name", default="default")
 
-    for c in criteria:
+    for c in _criteria_index().criteria:
         answer = typer.confirm(f"{c.id} {c.criteria} (yes/no)", default=False)
         responses.append(UserResponse(id=c.id, answer=answer))
     save_responses(responses, project_name, project_url, output_format)
 
 
-def _run_auto_assess(
-    project_name: Optional[str],
-    project_url: Optional[str],
-    provider: Optional[str],
-    ai: Optional[str],
-    model: Optional[str],
-    repo_token: Optional[str],
-    ai_api_key: Optional[str],
-    ollama_url: str,
-    output_format: str = "text",
-) -> None:
-    """Orchestrate an AI-powered automated assessment."""
+def _resolve_ai(
+    ai: Optional[str], model: Optional[str], ai_api_key: Optional[str]
+) -> tuple[str, str, Optional[str]]:
+    """Validate the AI provider and return it with the model and API key to use."""
+    from cli import ai_client
 
     # ── Validate required args ────────────────────────────────────────────────
     if not ai:
@@ -306,7 +339,7 @@ def _run_auto_assess(
         )
         raise typer.Exit(1)
 
-    resolved_model = model or DEFAULT_MODELS[ai]
+    resolved_model = model or ai_client.DEFAULT_MODELS[ai]
 
     # ── Resolve API key for AI provider ──────────────────────────────────────
     resolved_ai_key = ai_api_key
@@ -325,9 +358,55 @@ def _run_auto_assess(
                 bold=True,
             )
             raise typer.Exit(1)
+    return ai, resolved_model, resolved_ai_key
+
+
+def _resolve_repo_token(provider: str, repo_token: Optional[str]) -> Optional[str]:
+    """Return *repo_token*, or the token of *provider* from the environment."""
+    if repo_token:
+        return repo_token
+    token_env_map = {
+        "github": "GITHUB_TOKEN",
+        "gitlab": "GITLAB_TOKEN",
+        "bitbucket": "BITBUCKET_TOKEN",
+    }
+    return os.environ.get(token_env_map.get(provider, ""))
+
+
+def _settle_criteria(criteria, repo_context: dict) -> dict[str, str]:
+    """Criteria the evidence pre-pass proves to be met, unless ``AI_PREPASS=0``."""
+    from cli import evidence
+
+    if os.environ.get("AI_PREPASS", "1") == "0":
+        return {}
+    return evidence.settle_criteria(criteria, repo_context)
+
+
+def _run_auto_assess(
+    project_name: Optional[str],
+    project_url: Optional[str],
+    provider: Optional[str],
+    ai: Optional[str],
+    model: Optional[str],
+    repo_token: Optional[str],
+    ai_api_key: Optional[str],
+    ollama_url: str,
+    output_format: str = "text",
+    use_cache: bool = True,
+    verbose: bool = False,
+    snapshot: bool = False,
+    use_ai_cache: bool = True,
+    refresh_ai_cache: bool = False,
+) -> None:
+    """Orchestrate an AI-powered automated assessment."""
+    from cli import ai_client, evidence, repo_fetcher
+    from cli.ai_cache import AiResponseCache
+    from cli.http_cache import HttpCache
+
+    ai, resolved_model, resolved_ai_key = _resolve_ai(ai, model, ai_api_key)
 
     # ── Detect git provider / repository ─────────────────────────────────────
-    remote_url = detect_remote_url()
+    remote_url = repo_fetcher.detect_remote_url()
 
     resolved_provider: Optional[str] = provider
     owner: Optional[str] = None
@@ -335,7 +414,9 @@ def _run_auto_assess(
 
     if remote_url:
         try:
-            detected_provider, owner, repo_name = parse_provider_and_repo(remote_url)
+            detected_provider, owner, repo_name = repo_fetcher.parse_provider_and_repo(
+                remote_url
+            )
             if not resolved_provider:
                 resolved_provider = detected_provider
         except ValueError:
@@ -369,15 +450,7 @@ def _run_auto_assess(
         )
         raise typer.Exit(1)
 
-    # ── Resolve repo token ────────────────────────────────────────────────────
-    resolved_repo_token = repo_token
-    if not resolved_repo_token:
-        token_env_map = {
-            "github": "GITHUB_TOKEN",
-            "gitlab": "GITLAB_TOKEN",
-            "bitbucket": "BITBUCKET_TOKEN",
-        }
-        resolved_repo_token = os.environ.get(token_env_map.get(resolved_provider, ""))
+    resolved_repo_token = _resolve_repo_token(resolved_provider, repo_token)
 
     # ── Fetch repository context ──────────────────────────────────────────────
     typer.secho(
@@ -385,9 +458,15 @@ def _run_auto_assess(
         f"{owner}/{repo_name} …",
         fg=typer.colors.CYAN,
     )
+    http_cache = HttpCache.default() if use_cache else None
     try:
-        repo_context = fetch_repo_context(
-            resolved_provider, owner, repo_name, resolved_repo_token
+        repo_context = repo_fetcher.fetch_repo_context(
+            resolved_provider,
+            owner,
+            repo_name,
+            resolved_repo_token,
+            cache=http_cache,
+            snapshot=snapshot,
         )
     except Exception as exc:
         typer.secho(
@@ -402,44 +481,108 @@ def _run_auto_assess(
         f"{len(repo_context.get('ci_files', []))} CI/CD config file(s) fetched.",
         fg=typer.colors.GREEN,
     )
+    if verbose and http_cache is not None:
+        stats = http_cache.stats
+        typer.secho(
+            f"  HTTP cache: {stats.hits}/{stats.requests} responses unchanged "
+            f"({stats.hit_rate:.0%} hit rate), {stats.misses} fetched.",
+            fg=typer.colors.BRIGHT_BLACK,
+        )
 
     # Use the project_url from the remote when not provided
     final_project_url = project_url or remote_url
     final_project_name = project_name or repo_name
 
-    # ── Ask AI to assess ──────────────────────────────────────────────────────
-    typer.secho(
-        f"\n🤖 Sending repository context to {ai} ({resolved_model}) …",
-        fg=typer.colors.CYAN,
-    )
-    prompt = build_assessment_prompt(criteria, repo_context)
-    try:
-        raw_response = call_ai(
-            provider=ai,
-            model=resolved_model,
-            prompt=prompt,
-            api_key=resolved_ai_key,
-            ollama_url=ollama_url,
+    # ── Settle criteria from evidence ─────────────────────────────────────────
+    criteria = _criteria_index().criteria
+    settled = _settle_criteria(criteria, repo_context)
+    open_criteria = [c for c in criteria if c.id not in settled]
+    if settled:
+        typer.secho(
+            f"  ✔ {len(settled)} of {len(criteria)} criteria met according to "
+            "repository evidence.",
+            fg=typer.colors.GREEN,
         )
-    except Exception as exc:
+        if verbose:
+            for cid, note in settled.items():
+                typer.secho(f"    {cid}: {note}", fg=typer.colors.BRIGHT_BLACK)
+
+    # ── Ask AI to assess the rest ─────────────────────────────────────────────
+    ai_responses: list = []
+    suggestions: list[str] = []
+    ai_cache_hit = False
+    prompt_tokens = 0
+    if not open_criteria:
         typer.secho(
-            f"Error calling AI provider: {exc}",
-            fg=typer.colors.RED,
-            bold=True,
+            "  ✔ Every criterion settled by evidence; no AI request needed.",
+            fg=typer.colors.GREEN,
+        )
+    else:
+        prompt = ai_client.build_budgeted_prompt(
+            open_criteria,
+            repo_context,
+            tokenizer=ai_client.tokenizer_for(ai, resolved_model),
         )
-        raise typer.Exit(1)
-
-    try:
-        responses, suggestions = parse_ai_response(raw_response, criteria)
-    except Exception as exc:
         typer.secho(
-            f"Error parsing AI response: {exc}",
-            fg=typer.colors.RED,
-            bold=True,
+            f"\n🤖 Sending repository context ({prompt.tokens} tokens) "
+            f"to {ai} ({resolved_model}) …",
+            fg=typer.colors.CYAN,
         )
-        raise typer.Exit(1)
+        if verbose:
+            sections = prompt.section_tokens
+            typer.secho(
+                f"  Prompt budget: {prompt.tokens} of {prompt.budget} tokens; "
+                f"CI files {sections['ci_files']}, file tree {sections['files']}, "
+                f"README {sections['readme']}.",
+                fg=typer.colors.BRIGHT_BLACK,
+            )
+        ai_cache = (
+            AiResponseCache.default(refresh=refresh_ai_cache) if use_ai_cache else None
+        )
+        try:
+            raw_response = ai_client.call_ai(
+                provider=ai,
+                model=resolved_model,
+                prompt=prompt.text,
+                api_key=resolved_ai_key,
+                ollama_url=ollama_url,
+                cache=ai_cache,
+            )
+        except Exception as exc:
+            typer.secho(
+                f"Error calling AI provider: {exc}",
+                fg=typer.colors.RED,
+                bold=True,
+            )
+            raise typer.Exit(1)
 
-    typer.secho("  ✔ AI assessment complete.", fg=typer.colors.GREEN)
+        ai_cache_hit = ai_cache is not None and ai_cache.stats.hits > 0
+        try:
+            ai_responses, suggestions = ai_client.parse_ai_response(
+                raw_response, open_criteria
+            )
+        except Exception as exc:
+            if ai_cache is not None:
+                # Don't replay an unusable answer on the next run
+                ai_cache.discard(
+                    ai_client.response_cache_key(ai, resolved_model, prompt.text)
+                )
+            typer.secho(
+                f"Error parsing AI response: {exc}",
+                fg=typer.colors.RED,
+                bold=True,
+            )
+            raise typer.Exit(1)
+
+        if ai_cache_hit:
+            typer.secho(
+                "  ✔ AI assessment reused from cache (--refresh-ai-cache to ask again).",
+                fg=typer.colors.GREEN,
+            )
+        else:
+            typer.secho("  ✔ AI assessment complete.", fg=typer.colors.GREEN)
+        prompt_tokens = prompt.tokens
+    responses = evidence.merge_responses(criteria, settled, ai_responses)
 
     # ── Build result ──────────────────────────────────────────────────────────
     result = _build_result(
@@ -447,6 +590,9 @@ def _run_auto_assess(
     )
     if suggestions:
         result["ai_suggestions"] = suggestions
+    result["ai_cache_hit"] = ai_cache_hit
+    result["prompt_tokens"] = prompt_tokens
+    result["settled_by_evidence"] = settled
 
     if output_format == "json":
         typer.echo(json.dumps(result, indent=2, ensure_ascii=False))
@@ -463,14 +609,383 @@ def _run_auto_assess(
     typer.secho("Assessment saved to database.", fg=typer.colors.GREEN, bold=True)
 
 
+@app.command(name="assess-batch")
+def assess_batch(
+    repos_file: Optional[Path] = typer.Argument(
+        None,
+        help=(
+            "File listing one repository per line, as a URL "
+            "or as owner/repo together with --provider."
+        ),
+    ),
+    org: Optional[str] = typer.Option(
+        None,
+        "--org",
+        help=(
+            "Assess every repository of this GitHub organisation, GitLab group "
+            "or Bitbucket workspace (requires --provider)."
+        ),
+    ),
+    provider: Optional[str] = typer.Option(
+        None,
+        "--provider",
+        help="Git repository provider of --org and of owner/repo lines.",
+    ),
+    output: Path = typer.Option(
+        Path("assessments.ndjson"),
+        "--output",
+        "-o",
+        help=(
+            "NDJSON file the results are appended to. Repositories it already "
+            "records as assessed are skipped."
+        ),
+    ),
+    ai: Optional[str] = typer.Option(
+        None,
+        "--ai",
+        help="AI provider to use: openai, anthropic, gemini, or ollama.",
+    ),
+    model: Optional[str] = typer.Option(
+        None,
+        "--model",
+        help="AI model name (e.g. gpt-4o). Uses a sensible default for each provider.",
+    ),
+    repo_token: Optional[str] = typer.Option(
+        None,
+        "--repo-token",
+        envvar="REPO_TOKEN",
+        help=(
+            "API token for the git provider (for private repos). "
+            "Can also be set via GITHUB_TOKEN, GITLAB_TOKEN, or BITBUCKET_TOKEN env vars."
+        ),
+    ),
+    ai_api_key: Optional[str] = typer.Option(
+        None,
+        "--ai-key",
+        help=(
+            "API key for the AI provider. "
+            "Can also be set via OPENAI_API_KEY, ANTHROPIC_API_KEY, or GEMINI_API_KEY env vars."
+        ),
+    ),
+    ollama_url: str = typer.Option(
+        "http://localhost:11434",
+        "--ollama-url",
+        help="Base URL for a local Ollama server.",
+    ),
+    fetch_concurrency: int = typer.Option(
+        4,
+        "--fetch-concurrency",
+        min=1,
+        help="Repositories fetched from the git provider at once.",
+    ),
+    ai_concurrency: int = typer.Option(
+        2,
+        "--ai-concurrency",
+        min=1,
+        help="AI requests in flight at once.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Fetch every repository file again instead of revalidating cached copies.",
+    ),
+    snapshot: bool = typer.Option(
+        False,
+        "--snapshot",
+        help="Download each repository as one archive instead of one API request per file.",
+    ),
+    no_ai_cache: bool = typer.Option(
+        False,
+        "--no-ai-cache",
+        help="Always ask the AI provider and do not store its responses.",
+    ),
+    refresh_ai_cache: bool = typer.Option(
+        False,
+        "--refresh-ai-cache",
+        help="Ask the AI provider again and replace the cached responses.",
+    ),
+):
+    """Run AI auto-assessments of many repositories in one process.
+
+    Repositories come from REPOS_FILE and/or --org. Results are saved to
+    the database and appended to --output as they complete; re-run the same
+    command to resume an interrupted batch.
+
+    Example:
+
+        devops-maturity assess-batch --org acme --provider github --ai openai
+    """
+    import asyncio
+    import dataclasses
+
+    from cli import ai_client, batch, evidence, repo_fetcher
+    from cli.ai_cache import AiResponseCache
+    from cli.http_cache import CacheStats, HttpCache
+
+    ai, resolved_model, resolved_ai_key = _resolve_ai(ai, model, ai_api_key)
+
+    if provider:
+        provider = provider.lower()
+        valid_providers = {"github", "gitlab", "bitbucket"}
+        if provider not in valid_providers:
+            typer.secho(
+                f"Error: Unknown provider {provider!r}. "
+                f"Choose from: {', '.join(sorted(valid_providers))}.",
+                fg=typer.colors.RED,
+                bold=True,
+            )
+            raise typer.Exit(1)
+
+    if repos_file is None and org is None:
+        typer.secho(
+            "Error: Pass a file of repositories, --org, or both.",
+            fg=typer.colors.RED,
+            bold=True,
+        )
+        raise typer.Exit(1)
+
+    # ── Collect repositories ──────────────────────────────────────────────────
+    lines: list[str] = []
+    if repos_file is not None:
+        try:
+            lines = repos_file.read_text(encoding="utf-8").splitlines()
+        except OSError as exc:
+            typer.secho(
+                f"Error reading {repos_file}: {exc}", fg=typer.colors.RED, bold=True
+            )
+            raise typer.Exit(1)
+    if org is not None:
+        if not provider:
+            typer.secho(
+                "Error: --org requires --provider (github, gitlab, or bitbucket).",
+                fg=typer.colors.RED,
+                bold=True,
+            )
+            raise typer.Exit(1)
+        typer.secho(
+            f"🔍 Listing repositories of {org} on {provider} …", fg=typer.colors.CYAN
+        )
+        try:
+            org_repos = asyncio.run(
+                repo_fetcher.list_org_repos_async(
+                    provider, org, _resolve_repo_token(provider, repo_token)
+                )
+            )
+        except Exception as exc:
+            typer.secho(
+                f"Error listing repositories of {org}: {exc}",
+                fg=typer.colors.RED,
+                bold=True,
+            )
+            raise typer.Exit(1)
+        lines += [f"{owner}/{name}" for owner, name in org_repos]
+    try:
+        targets = batch.read_targets(lines, provider)
+    except ValueError as exc:
+        typer.secho(f"Error: {exc}", fg=typer.colors.RED, bold=True)
+        raise typer.Exit(1)
+
+    done = batch.completed_keys(output)
+    pending = [t for t in targets if t.key not in done]
+    typer.secho(
+        f"{len(targets)} repositories, {len(targets) - len(pending)} already "
+        f"assessed in {output}.",
+        fg=typer.colors.CYAN,
+    )
+
+    # ── Run the pipeline ──────────────────────────────────────────────────────
+    criteria = _criteria_index().criteria
+    tokenizer = ai_client.tokenizer_for(ai, resolved_model)
+    http_cache = HttpCache.default() if not no_cache else None
+    ai_cache = (
+        AiResponseCache.default(refresh=refresh_ai_cache) if not no_ai_cache else None
+    )
+
+    async def fetch(target: "batch.BatchTarget") -> dict:
+        return await repo_fetcher.fetch_repo_context_async(
+            target.provider,
+            target.owner,
+            target.repo,
+            _resolve_repo_token(target.provider, repo_token),
+            cache=http_cache,
+            snapshot=snapshot,
+        )
+
+    # Responses of assessed repositories, until their record is written
+    unsaved: dict[str, list] = {}
+
+    async def assess(
+        target: "batch.BatchTarget", context: dict, ai_slot: AsyncContextManager
+    ) -> dict:
+        settled = _settle_criteria(criteria, context)
+        open_criteria = [c for c in criteria if c.id not in settled]
+        ai_responses: list = []
+        suggestions: list[str] = []
+        # Own stats per repository, so hits are attributed correctly
+        cache = dataclasses.replace(ai_cache, stats=CacheStats()) if ai_cache else None
+        prompt = None
+        if open_criteria:
+            prompt = ai_client.build_budgeted_prompt(
+                open_criteria, context, tokenizer=tokenizer
+            )
+            async with ai_slot:
+                raw_response = await ai_client.call_ai_async(
+                    provider=ai,
+                    model=resolved_model,
+                    prompt=prompt.text,
+                    api_key=resolved_ai_key,
+                    ollama_url=ollama_url,
+                    cache=cache,
+                )
+            try:
+                ai_responses, suggestions = ai_client.parse_ai_response(
+                    raw_response, open_criteria
+                )
+            except Exception:
+                if cache is not None:
+                    cache.discard(
+                        ai_client.response_cache_key(ai, resolved_model, prompt.text)
+                    )
+                raise
+        responses = evidence.merge_responses(criteria, settled, ai_responses)
+        result = _build_result(responses, target.repo, target.project_url, source="ai")
+        if suggestions:
+            result["ai_suggestions"] = suggestions
+        result["ai_cache_hit"] = cache is not None and cache.stats.hits > 0
+        result["prompt_tokens"] = prompt.tokens if prompt else 0
+        result["settled_by_evidence"] = settled
+        unsaved[target.key] = responses
+        return result
+
+    async def save(target: "batch.BatchTarget") -> None:
+        # Off the event loop, so a slow commit does not stall the other repositories
+        responses = unsaved.pop(target.key)
+        await asyncio.to_thread(_save_to_db, responses, target.repo, target.project_url)
+
+    def report(record: dict) -> None:
+        if "error" in record:
+            typer.secho(f"  ✘ {record['repo']}: {record['error']}", fg=typer.colors.RED)
+        else:
+            typer.secho(
+                f"  ✔ {record['repo']}: {record['score']:.1f}% ({record['level']})",
+                fg=typer.colors.GREEN,
+            )
+
+    # Create the schema before worker threads start saving concurrently
+    _init_db()
+    with batch.open_results(output) as out:
+        summary = asyncio.run(
+            batch.run_batch(
+                pending,
+                fetch,
+                assess,
+                out,
+                fetch_concurrency=fetch_concurrency,
+                ai_concurrency=ai_concurrency,
+                on_record=report,
+                save=save,
+            )
+        )
+
+    color = typer.colors.RED if summary.failed else typer.colors.GREEN
+    typer.secho(
+        f"\n{summary.assessed} assessed, {summary.failed} failed. "
+        f"Results appended to {output}.",
+        fg=color,
+        bold=True,
+    )
+    if summary.failed:
+        typer.echo("Re-run the same command to retry the failed repositories.")
+        raise typer.Exit(1)
+
+
 @app.command(name="list")
 def list_assessments():
     """List all assessments from the database."""
-    db = SessionLocal()
-    assessments = db.query(Assessment).all()
+    from sqlalchemy.orm import selectinload
+
+    from core.model import Assessment
+
+    db = _db_session()
+    assessments = db.query(Assessment).options(selectinload(Assessment.answers)).all()
     db.close()
     for a in assessments:
-        typer.echo(f"ID: {a.id} | Project: {a.project_name} | Responses: {a.responses}")
+        typer.echo(
+            f"ID: {a.id} | Project: {a.project_name} | Responses: {a.saved_responses()}"
+        )
+
+
+@app.command(name="backfill")
+def backfill_scores(
+    recompute_all: bool = typer.Option(
+        False,
+        "--all",
+        help="Rewrite every assessment, not only those missing stored results.",
+    ),
+    batch_size: int = typer.Option(
+        1000,
+        "--batch-size",
+        min=1,
+        help="Number of assessments scored per database round trip.",
+    ),
+):
+    """Store scores and normalized responses for previously saved assessments.
+
+    Fills in the score, level, category scores, response bitmask and the
+    per-criterion rows in assessment_responses for assessments saved before
+    those were persisted.
+    """
+    from sqlalchemy.orm import selectinload
+
+    from core.model import Assessment
+    from core.scorer import responses_to_matrix, score_batch
+
+    criteria_index = _criteria_index()
+    weights, layout = criteria_index.weights, criteria_index.layout
+    db = _db_session()
+    query = db.query(Assessment).options(selectinload(Assessment.answers))
+    if not recompute_all:
+        query = query.filter(
+            Assessment.score.is_(None)
+            | Assessment.criteria_version.is_(None)
+            | ~Assessment.answers.any()
+        )
+
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            rows = (
+                query.filter(Assessment.id > last_id)
+                .order_by(Assessment.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            answers = [r.saved_responses() for r in rows]
+            batch = score_batch(weights, responses_to_matrix(weights, answers))
+            for row, responses, score, level, cat_scores in zip(
+                rows, answers, batch.scores, batch.levels, batch.category_scores
+            ):
+                row.set_responses(responses)
+                row.set_mask(layout.encode_exact(responses), layout.version)
+                row.score = float(score)
+                row.level = level
+                row.category_scores = {
+                    cat: float(s) for cat, s in zip(weights.categories, cat_scores)
+                }
+            db.commit()
+            updated += len(rows)
+            last_id = rows[-1].id
+    finally:
+        db.close()
+
+    typer.secho(
+        f"Stored scores and responses for {updated} assessment(s).",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
 
 
 @app.command(name="config")
@@ -525,6 +1040,10 @@ def assess_from_file(
             )
             raise typer.Exit(1)
 
+    import yaml
+
+    from core.model import UserResponse
+
     with open(file_path, "r") as f:
         data = yaml.safe_load(f)
 
@@ -534,7 +1053,7 @@ def assess_from_file(
     final_project_url = project_url or data.get("project_url") or None
 
     responses = []
-    for c in criteria:
+    for c in _criteria_index().criteria:
         raw = data.get(c.id, False)
         # Support both boolean and structured {status: true/false, evidence: [...]}
         if isinstance(raw, dict):
@@ -1,45 +1,136 @@
 """Repository context fetching for AI-powered auto-assessment.
 
 Supports GitHub, GitLab, and Bitbucket via their respective REST APIs.
+Requests run on ``httpx.AsyncClient``: metadata, file tree and README are
+fetched concurrently, then the CI-relevant files in parallel. With a token,
+GitHub file contents come from batched GraphQL queries instead. Snapshot mode
+instead streams one archive of the repository (see :func:`read_snapshot`).
+:func:`fetch_repo_context` is the synchronous entry point.
 """
 
+import asyncio
 import base64
+import bisect
+import codecs
+import collections
+import contextlib
+import dataclasses
+import io
+import itertools
+import json
+import os
 import re
 import subprocess
-from typing import Optional
+import tarfile
+import urllib.parse
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+)
 
 import httpx
 
-# File paths that are relevant for DevOps maturity assessment
+from cli.http_cache import CacheStats, HttpCache
+
+# File paths that are relevant for DevOps maturity assessment, in tiers from
+# most to least informative: pipeline definitions, build and deployment,
+# security tooling, code-quality hooks, build scripts
 _CI_RELEVANT_PATHS = [
-    ".github/workflows",
-    ".gitlab-ci",
-    "Jenkinsfile",
-    "Dockerfile",
-    "docker-compose",
-    ".travis.yml",
-    "bitbucket-pipelines.yml",
-    ".circleci",
-    "circleci",
-    "sonar-project.properties",
-    ".pre-commit-config",
-    "Makefile",
-    "tox.ini",
-    "noxfile",
-    ".snyk",
-    "cosign",
-    "SECURITY",
-    "sbom",
-    "trivy",
-    "dependabot",
+    [
+        ".github/workflows",
+        ".gitlab-ci",
+        "Jenkinsfile",
+        "bitbucket-pipelines.yml",
+        ".circleci",
+        "circleci",
+        ".travis.yml",
+    ],
+    ["Dockerfile", "docker-compose"],
+    [
+        "SECURITY",
+        ".snyk",
+        "cosign",
+        "sbom",
+        "trivy",
+        "dependabot",
+        "sonar-project.properties",
+    ],
+    [".pre-commit-config", "tox.ini", "noxfile"],
+    ["Makefile"],
 ]
 
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Return a regex matching any of *words*, factored into a prefix trie.
+
+    Each position of the scanned text then takes one branch per distinct
+    next character instead of one per word; the longest word wins.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [
+            re.escape(c) + build(child) for c, child in sorted(node.items()) if c
+        ]
+        if not branches:
+            return ""
+        regex = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{regex})?" if "" in node else regex
+
+    return build(trie)
+
+
+# Compiled once: pattern -> tier, and one regex matching any pattern. Both are
+# lowercase and run on lowercased paths, because re.IGNORECASE turns off the
+# regex engine's literal fast paths and is several times slower.
+_CI_TIERS = {
+    pattern.lower(): tier
+    for tier, patterns in enumerate(_CI_RELEVANT_PATHS)
+    for pattern in patterns
+}
+_CI_PATTERN = re.compile(_trie_regex(_CI_TIERS))
+
 # Maximum files to fetch to keep prompt size reasonable
 _MAX_CI_FILES = 8
+# Relevant paths to collect from paginated trees; spares replace files that
+# cannot be fetched
+_MAX_CI_CANDIDATES = _MAX_CI_FILES * 2
 _MAX_README_CHARS = 3000
 _MAX_CI_FILE_CHARS = 2000
 _MAX_FILE_LIST = 150
 
+# Default API roots; override for GitHub Enterprise or self-hosted GitLab
+_DEFAULT_API_URLS = {
+    "github": "https://api.github.com",
+    "gitlab": "https://gitlab.com/api/v4",
+    "bitbucket": "https://api.bitbucket.org/2.0",
+}
+
+# Maximum number of requests in flight per repository
+DEFAULT_FETCH_CONCURRENCY = 8
+
+# Snapshot mode: archive download limit and per-file read caps (UTF-8 needs
+# up to 4 bytes per character)
+DEFAULT_ARCHIVE_MAX_MB = 200
+_MAX_README_BYTES = _MAX_README_CHARS * 4
+_MAX_CI_FILE_BYTES = _MAX_CI_FILE_CHARS * 4
+_README_NAMES = ("README.md", "README.rst", "README")
+
+# GitHub GraphQL: blob lookups and expected blob bytes allowed in one query
+_GRAPHQL_MAX_OBJECTS = 50
+_GRAPHQL_MAX_BYTES = 2 * 1024 * 1024
+
 
 def detect_remote_url() -> Optional[str]:
     """Detect the git remote origin URL from the current directory."""
@@ -80,8 +171,32 @@ def parse_provider_and_repo(remote_url: str) -> tuple[str, str, str]:
 
 def _is_ci_relevant(path: str) -> bool:
     """Return True if *path* is a CI/CD or security-related file."""
-    lp = path.lower()
-    return any(p.lower() in lp for p in _CI_RELEVANT_PATHS)
+    return _CI_PATTERN.search(path.lower()) is not None
+
+
+def _ci_keys(paths: list[str]) -> list[tuple[tuple[int, int], int]]:
+    """Return ``(key, index)`` of the CI-relevant *paths*, best key first.
+
+    The key is the best tier any pattern in the path belongs to, then the
+    directory depth, so a root ``Dockerfile`` beats a vendored one. All
+    paths are scanned in one regex pass over their NUL-joined text (git
+    paths cannot contain NUL); equal keys keep the order of *paths*.
+    """
+    text = "\0".join(paths).lower()
+    tiers: dict[int, int] = {}
+    i = last = 0
+    for m in _CI_PATTERN.finditer(text):
+        # The path index is the number of separators before the match
+        i += text.count("\0", last, m.start())
+        last = m.start()
+        tiers[i] = min(tiers.get(i, _CI_TIERS[m.group()]), _CI_TIERS[m.group()])
+    return sorted(((tier, paths[i].count("/")), i) for i, tier in tiers.items())
+
+
+def _rank_ci_files(paths: Iterable[str]) -> list[str]:
+    """Return the CI-relevant *paths*, most informative first."""
+    paths = list(paths)
+    return [paths[i] for _, i in _ci_keys(paths)]
 
 
 def _decode_base64_content(b64: str) -> str:
@@ -92,17 +207,45 @@ def _decode_base64_content(b64: str) -> str:
         return ""
 
 
-# ── GitHub ─────────────────────────────────────────────────────────────────────
+def _api_url(provider: str) -> str:
+    """Return the API root of *provider*, e.g. from ``GITHUB_API_URL``."""
+    env = os.environ.get(f"{provider.upper()}_API_URL")
+    return (env or _DEFAULT_API_URLS[provider]).rstrip("/")
 
 
-def fetch_github_context(owner: str, repo: str, token: Optional[str] = None) -> dict:
-    """Fetch repository context from the GitHub REST API."""
-    headers: dict = {"Accept": "application/vnd.github.v3+json"}
-    if token:
-        headers["Authorization"] = f"token {token}"
-    base = f"https://api.github.com/repos/{owner}/{repo}"
-    ctx: dict = {
-        "provider": "github",
+def _auth_headers(provider: str, token: Optional[str]) -> dict:
+    if provider == "github":
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if token:
+            headers["Authorization"] = f"token {token}"
+        return headers
+    if not token:
+        return {}
+    if provider == "gitlab":
+        return {"PRIVATE-TOKEN": token}
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _repo_api_base(provider: str, owner: str, repo: str) -> str:
+    if provider == "github":
+        return f"{_api_url('github')}/repos/{owner}/{repo}"
+    if provider == "gitlab":
+        project_id = urllib.parse.quote(f"{owner}/{repo}", safe="")
+        return f"{_api_url('gitlab')}/projects/{project_id}"
+    return f"{_api_url('bitbucket')}/repositories/{owner}/{repo}"
+
+
+def _fetch_concurrency(concurrency: Optional[int]) -> int:
+    if concurrency is None:
+        concurrency = int(
+            os.environ.get("REPO_FETCH_CONCURRENCY", DEFAULT_FETCH_CONCURRENCY)
+        )
+    return max(1, concurrency)
+
+
+def _empty_context(provider: str, owner: str, repo: str) -> dict:
+    return {
+        "provider": provider,
         "owner": owner,
         "repo": repo,
         "description": "",
@@ -112,39 +255,377 @@ def fetch_github_context(owner: str, repo: str, token: Optional[str] = None) ->
         "ci_files": [],
     }
 
-    with httpx.Client(headers=headers, timeout=30) as client:
-        # Repository metadata
-        r = client.get(base)
-        if r.is_success:
-            d = r.json()
-            ctx["description"] = d.get("description") or ""
-            ctx["language"] = d.get("language") or ""
 
-        # Full file tree
-        r = client.get(f"{base}/git/trees/HEAD?recursive=1")
-        if r.is_success:
-            ctx["files"] = [
-                i["path"] for i in r.json().get("tree", []) if i.get("type") == "blob"
-            ][:_MAX_FILE_LIST]
+def _async_client(headers: dict) -> httpx.AsyncClient:
+    return httpx.AsyncClient(headers=headers, timeout=30)
+
+
+Getter = Callable[[str], Awaitable[Optional[httpx.Response]]]
+
+
+class _LimitedGetter:
+    """``get(url)`` that caps requests in flight and drops failures.
+
+    With a *cache*, responses are revalidated against the stored copy.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        concurrency: int,
+        cache: Optional[HttpCache] = None,
+    ):
+        self.client = client
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __call__(self, url: str) -> Optional[httpx.Response]:
+        async with self._semaphore:
+            client, cache = self.client, self.cache
+            r = await (cache.get(client, url) if cache else client.get(url))
+        return r if r.is_success else None
+
+    @contextlib.asynccontextmanager
+    async def stream(self, url: str) -> AsyncIterator[Optional[AsyncIterator[bytes]]]:
+        """Yield the body of *url* as chunks, or None on failure.
+
+        The request holds its slot until the body has been read.
+        """
+        async with self._semaphore:
+            if self.cache:
+                async with self.cache.stream(self.client, url) as body:
+                    yield body
+                return
+            async with self.client.stream("GET", url) as r:
+                yield r.aiter_bytes() if r.is_success else None
+
+
+_JSON_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def _skip_separators(text: str, pos: int = 0) -> int:
+    """Return the index of the first non-separator character from *pos*."""
+    m = _JSON_SEPARATORS.match(text, pos)
+    return m.end() if m else pos
+
+
+async def _stream_json_array(
+    chunks: AsyncIterator[bytes], key: str
+) -> AsyncGenerator[list, None]:
+    """Yield the elements of the array at *key* of a streamed JSON object.
+
+    Elements are yielded in batches as soon as their bytes have arrived, so
+    only the current chunk and one batch are held in memory. Content after
+    the array is not read.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    array_start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+    buffer = ""
+    in_array = False
+    async for chunk in chunks:
+        buffer += utf8.decode(chunk)
+        if not in_array:
+            m = array_start.search(buffer)
+            if m is None:
+                # Keep enough to complete a key split across chunks
+                buffer = buffer[-(len(key) + 64) :]
+                continue
+            buffer = buffer[m.end() :]
+            in_array = True
+        # Fast path: decode every complete element of the chunk in one call.
+        # A prefix ending in "}" that parses as array content is exactly the
+        # next elements; otherwise decode one element at a time below.
+        start = _skip_separators(buffer)
+        end = buffer.rfind("}") + 1
+        try:
+            batch = json.loads(f"[{buffer[start:end]}]") if end > start else []
+            pos = max(start, end)
+        except json.JSONDecodeError:
+            batch, pos = [], 0
+        while True:
+            pos = _skip_separators(buffer, pos)
+            if buffer.startswith("]", pos):
+                if batch:
+                    yield batch
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # element incomplete until the next chunk
+            batch.append(item)
+        buffer = buffer[pos:]
+        if batch:
+            yield batch
+
+
+async def _first_success(get: Getter, urls: list[str]) -> Optional[httpx.Response]:
+    """Request all *urls* at once; return the first successful one in order."""
+    for r in await asyncio.gather(*(get(url) for url in urls)):
+        if r is not None:
+            return r
+    return None
+
 
-        # README
-        r = client.get(f"{base}/readme")
-        if r.is_success:
-            ctx["readme"] = _decode_base64_content(r.json().get("content", ""))[
+async def _fetch_ci_files(
+    files: list[str], fetch_file: Callable[[str], Awaitable[Optional[str]]]
+) -> list[dict]:
+    """Fetch the ``_MAX_CI_FILES`` most informative CI files in parallel.
+
+    Files that cannot be fetched are replaced by the next-ranked ones, so
+    the result matches fetching them one by one in rank order.
+    """
+    candidates = _rank_ci_files(files)
+    ci_files: list[dict] = []
+    while candidates and len(ci_files) < _MAX_CI_FILES:
+        wanted = _MAX_CI_FILES - len(ci_files)
+        batch, candidates = candidates[:wanted], candidates[wanted:]
+        contents = await asyncio.gather(*(fetch_file(fp) for fp in batch))
+        ci_files += [
+            {"path": fp, "content": content[:_MAX_CI_FILE_CHARS]}
+            for fp, content in zip(batch, contents)
+            if content is not None
+        ]
+    return ci_files
+
+
+async def _collect_tree(
+    pages: AsyncGenerator[list[str], None],
+) -> tuple[list[str], list[str]]:
+    """Consume file paths page by page into the file list and CI candidates.
+
+    Keeps the ``_MAX_CI_CANDIDATES`` best-ranked relevant paths. Stops
+    reading pages once ``_MAX_FILE_LIST`` files are listed and every
+    candidate is a pipeline definition, which no later path can outrank,
+    so huge trees are rarely listed to the end and never held in memory.
+    """
+    files: list[str] = []
+    ranked: list[tuple[tuple[int, int], int, str]] = []
+    seen = itertools.count()
+    async with contextlib.aclosing(pages):
+        async for page in pages:
+            files += page[: _MAX_FILE_LIST - len(files)]
+            for key, i in _ci_keys(page):
+                bisect.insort(ranked, (key, next(seen), page[i]))
+            del ranked[_MAX_CI_CANDIDATES:]
+            if (
+                len(files) >= _MAX_FILE_LIST
+                and len(ranked) >= _MAX_CI_CANDIDATES
+                and ranked[-1][0][0] == 0
+            ):
+                break
+    return files, [fp for _, _, fp in ranked]
+
+
+# ── GitHub ─────────────────────────────────────────────────────────────────────
+
+
+async def _github_tree_pages(
+    get: _LimitedGetter, base: str, sizes: Optional[dict[str, int]] = None
+) -> AsyncGenerator[list[str], None]:
+    """Yield the blob paths of the recursive GitHub tree as it streams in.
+
+    The tree of a large monorepo is tens of megabytes of JSON; it is parsed
+    incrementally and never held in memory. A tree that is only partly read
+    because the caller stopped early is not cached. *sizes*, if given,
+    receives the sizes of root and CI-relevant files.
+    """
+    async with get.stream(f"{base}/git/trees/HEAD?recursive=1") as body:
+        if body is None:
+            return
+        async with contextlib.aclosing(_stream_json_array(body, "tree")) as batches:
+            async for items in batches:
+                page = [i["path"] for i in items if i.get("type") == "blob"]
+                if sizes is not None:
+                    for i in items:
+                        fp = i["path"]
+                        if "/" not in fp or _is_ci_relevant(fp):
+                            sizes[fp] = i.get("size", 0)
+                yield page
+        # Read the rest of the object so a cache can keep the complete tree
+        async for _ in body:
+            pass
+
+
+async def fetch_github_context_async(
+    owner: str,
+    repo: str,
+    token: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+) -> dict:
+    """Fetch repository context from the GitHub API.
+
+    With a *token*, file contents are fetched through GraphQL (see
+    :func:`fetch_github_graphql_context_async`) unless ``GITHUB_GRAPHQL`` is
+    ``0``; the REST API is used when that fails, and when the cached tree is
+    still current, since cached REST responses then revalidate for free.
+    """
+    if token and os.environ.get("GITHUB_GRAPHQL", "1") != "0":
+        ctx = await fetch_github_graphql_context_async(
+            owner, repo, token, concurrency, cache
+        )
+        if ctx is not None:
+            return ctx
+
+    headers = _auth_headers("github", token)
+    base = _repo_api_base("github", owner, repo)
+    ctx = _empty_context("github", owner, repo)
+
+    async with _async_client(headers) as client:
+        get = _LimitedGetter(client, _fetch_concurrency(concurrency), cache)
+        meta, (ctx["files"], candidates), readme = await asyncio.gather(
+            get(base),
+            _collect_tree(_github_tree_pages(get, base)),
+            get(f"{base}/readme"),
+        )
+        if meta:
+            d = meta.json()
+            ctx["description"] = d.get("description") or ""
+            ctx["language"] = d.get("language") or ""
+        if readme:
+            ctx["readme"] = _decode_base64_content(readme.json().get("content", ""))[
                 :_MAX_README_CHARS
             ]
 
-        # CI/CD-relevant files
-        fetched = 0
-        for fp in ctx["files"]:
-            if _is_ci_relevant(fp) and fetched < _MAX_CI_FILES:
-                r = client.get(f"{base}/contents/{fp}")
-                if r.is_success:
-                    content = _decode_base64_content(r.json().get("content", ""))
-                    ctx["ci_files"].append(
-                        {"path": fp, "content": content[:_MAX_CI_FILE_CHARS]}
-                    )
-                    fetched += 1
+        async def fetch_file(fp: str) -> Optional[str]:
+            r = await get(f"{base}/contents/{fp}")
+            return _decode_base64_content(r.json().get("content", "")) if r else None
+
+        ctx["ci_files"] = await _fetch_ci_files(candidates, fetch_file)
+
+    return ctx
+
+
+def _github_graphql_url() -> str:
+    """GraphQL endpoint next to the REST root (``/api/v3`` on Enterprise)."""
+    api = _api_url("github")
+    if api.endswith("/api/v3"):
+        return api.removesuffix("/v3") + "/graphql"
+    return f"{api}/graphql"
+
+
+def _graphql_chunks(paths: list[str], sizes: dict[str, int]) -> list[list[str]]:
+    """Split *paths* into groups that fit the per-query object and byte budget."""
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    chunk_bytes = 0
+    for fp in paths:
+        size = sizes.get(fp, 0)
+        if chunk and (
+            len(chunk) >= _GRAPHQL_MAX_OBJECTS
+            or chunk_bytes + size > _GRAPHQL_MAX_BYTES
+        ):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+        chunk.append(fp)
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _graphql_query(
+    owner: str, repo: str, paths: list[str], with_meta: bool
+) -> tuple[str, dict]:
+    """Build a query reading the blobs at *paths*, aliased ``f0``, ``f1``, …"""
+    params = ["$owner: String!", "$name: String!"]
+    fields = ["description", "primaryLanguage { name }"] if with_meta else []
+    variables = {"owner": owner, "name": repo}
+    for i, fp in enumerate(paths):
+        params.append(f"$e{i}: String!")
+        fields.append(f"f{i}: object(expression: $e{i}) {{ ... on Blob {{ text }} }}")
+        variables[f"e{i}"] = f"HEAD:{fp}"
+    query = (
+        f"query({', '.join(params)}) "
+        f"{{ repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}"
+    )
+    return query, variables
+
+
+async def fetch_github_graphql_context_async(
+    owner: str,
+    repo: str,
+    token: str,
+    concurrency: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+) -> Optional[dict]:
+    """Fetch repository context with the GitHub GraphQL API.
+
+    GraphQL has no recursive tree listing, so the tree still comes from
+    REST. Metadata, README and the selected CI files then come back from a
+    single query, split into several when the files exceed the per-query
+    budget. GraphQL responses cannot be cached, so None is returned before
+    any query when the tree revalidated from *cache* as unchanged. Also
+    returns None when a query fails.
+    """
+    headers = _auth_headers("github", token)
+    base = _repo_api_base("github", owner, repo)
+    ctx = _empty_context("github", owner, repo)
+    semaphore = asyncio.Semaphore(_fetch_concurrency(concurrency))
+
+    async with _async_client(headers) as client:
+
+        async def query(paths: list[str], with_meta: bool = False) -> Optional[dict]:
+            q, variables = _graphql_query(owner, repo, paths, with_meta)
+            async with semaphore:
+                r = await client.post(
+                    _github_graphql_url(), json={"query": q, "variables": variables}
+                )
+            if not r.is_success:
+                return None
+            return (r.json().get("data") or {}).get("repository")
+
+        async def read_blobs(paths: list[str], with_meta: bool = False) -> bool:
+            """Query *paths* in budget-sized chunks and record their texts."""
+            chunks = _graphql_chunks(paths, sizes) or [[]]
+            answers = await asyncio.gather(
+                *(query(chunk, with_meta and i == 0) for i, chunk in enumerate(chunks))
+            )
+            results = [result for result in answers if result is not None]
+            if len(results) < len(answers):
+                return False
+            if with_meta:
+                ctx["description"] = results[0].get("description") or ""
+                ctx["language"] = (results[0].get("primaryLanguage") or {}).get(
+                    "name"
+                ) or ""
+            for chunk, result in zip(chunks, results):
+                for i, fp in enumerate(chunk):
+                    texts[fp] = (result.get(f"f{i}") or {}).get("text")
+            return True
+
+        # Own stats, so hits of other repositories are not attributed to the tree
+        tree_cache = dataclasses.replace(cache, stats=CacheStats()) if cache else None
+        get = _LimitedGetter(client, _fetch_concurrency(concurrency), tree_cache)
+        sizes: dict[str, int] = {}
+        ctx["files"], candidates = await _collect_tree(
+            _github_tree_pages(get, base, sizes)
+        )
+        if cache is not None and tree_cache is not None:
+            cache.stats.hits += tree_cache.stats.hits
+            cache.stats.misses += tree_cache.stats.misses
+            if tree_cache.stats.hits and not tree_cache.stats.misses:
+                return None
+
+        root = [fp for fp in sizes if "/" not in fp]
+        readme = next((n for n in _README_NAMES if n in sizes), None) or next(
+            (fp for fp in root if fp.lower().startswith("readme")), None
+        )
+        wanted = candidates[:_MAX_CI_FILES]
+        texts: dict[str, Optional[str]] = {}
+        if not await read_blobs(([readme] if readme else []) + wanted, True):
+            return None
+        if readme:
+            ctx["readme"] = (texts[readme] or "")[:_MAX_README_CHARS]
+
+        async def fetch_file(fp: str) -> Optional[str]:
+            # Only files replacing unreadable ones cost an extra query
+            if fp not in texts and not await read_blobs([fp]):
+                return None
+            return texts[fp]
+
+        ctx["ci_files"] = await _fetch_ci_files(candidates, fetch_file)
 
     return ctx
 
@@ -152,58 +633,93 @@ def fetch_github_context(owner: str, repo: str, token: Optional[str] = None) ->
 # ── GitLab ─────────────────────────────────────────────────────────────────────
 
 
-def fetch_gitlab_context(owner: str, repo: str, token: Optional[str] = None) -> dict:
+async def _gitlab_tree_pages(
+    get: Getter, base: str, concurrency: int
+) -> AsyncGenerator[list[str], None]:
+    """Yield the blob paths of a GitLab repository tree, one page at a time.
+
+    The first page reports the page count in ``X-Total-Pages``; the rest are
+    then requested *concurrency* at a time and yielded in order. GitLab
+    omits the count for very large trees, in which case listing continues
+    with keyset pagination after the last entry, following ``Link`` headers
+    one page at a time.
+    """
+    url = f"{base}/repository/tree?recursive=true&per_page=100"
+
+    def blobs(r: httpx.Response) -> list[str]:
+        return [i["path"] for i in r.json() if i.get("type") == "blob"]
+
+    first = await get(url)
+    if first is None:
+        return
+    entries = first.json()
+    yield blobs(first)
+
+    total = first.headers.get("x-total-pages")
+    if total:
+        numbers = iter(range(2, int(total) + 1))
+        pending = collections.deque(
+            asyncio.ensure_future(get(f"{url}&page={n}"))
+            for n in itertools.islice(numbers, concurrency)
+        )
+        try:
+            while pending:
+                r = await pending.popleft()
+                n = next(numbers, None)
+                if n is not None:
+                    pending.append(asyncio.ensure_future(get(f"{url}&page={n}")))
+                if r is not None:
+                    yield blobs(r)
+        finally:
+            for task in pending:
+                task.cancel()
+        return
+
+    if len(entries) < 100:
+        return
+    next_url: Optional[str] = f"{url}&pagination=keyset&page_token={entries[-1]['id']}"
+    while next_url:
+        r = await get(next_url)
+        if r is None:
+            return
+        yield blobs(r)
+        next_url = r.links.get("next", {}).get("url")
+
+
+async def fetch_gitlab_context_async(
+    owner: str,
+    repo: str,
+    token: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+) -> dict:
     """Fetch repository context from the GitLab REST API."""
-    import urllib.parse
-
-    project_id = urllib.parse.quote(f"{owner}/{repo}", safe="")
-    base = f"https://gitlab.com/api/v4/projects/{project_id}"
-    headers: dict = {}
-    if token:
-        headers["PRIVATE-TOKEN"] = token
-    ctx: dict = {
-        "provider": "gitlab",
-        "owner": owner,
-        "repo": repo,
-        "description": "",
-        "language": "",
-        "readme": "",
-        "files": [],
-        "ci_files": [],
-    }
+    headers = _auth_headers("gitlab", token)
+    base = _repo_api_base("gitlab", owner, repo)
+    ctx = _empty_context("gitlab", owner, repo)
 
-    with httpx.Client(headers=headers, timeout=30) as client:
-        r = client.get(base)
-        if r.is_success:
-            d = r.json()
-            ctx["description"] = d.get("description") or ""
+    def raw_url(path: str) -> str:
+        encoded = urllib.parse.quote(path, safe="")
+        return f"{base}/repository/files/{encoded}/raw?ref=HEAD"
 
-        # File tree (GitLab paginates at 100 items)
-        r = client.get(f"{base}/repository/tree?recursive=true&per_page=100")
-        if r.is_success:
-            ctx["files"] = [i["path"] for i in r.json() if i.get("type") == "blob"][
-                :_MAX_FILE_LIST
-            ]
+    async with _async_client(headers) as client:
+        limit = _fetch_concurrency(concurrency)
+        get = _LimitedGetter(client, limit, cache)
+        meta, (ctx["files"], candidates), readme = await asyncio.gather(
+            get(base),
+            _collect_tree(_gitlab_tree_pages(get, base, limit)),
+            _first_success(get, [raw_url(name) for name in _README_NAMES]),
+        )
+        if meta:
+            ctx["description"] = meta.json().get("description") or ""
+        if readme:
+            ctx["readme"] = readme.text[:_MAX_README_CHARS]
 
-        # README
-        for readme_name in ("README.md", "README.rst", "README"):
-            encoded = urllib.parse.quote(readme_name, safe="")
-            r = client.get(f"{base}/repository/files/{encoded}/raw?ref=HEAD")
-            if r.is_success:
-                ctx["readme"] = r.text[:_MAX_README_CHARS]
-                break
+        async def fetch_file(fp: str) -> Optional[str]:
+            r = await get(raw_url(fp))
+            return r.text if r else None
 
-        # CI/CD-relevant files
-        fetched = 0
-        for fp in ctx["files"]:
-            if _is_ci_relevant(fp) and fetched < _MAX_CI_FILES:
-                encoded = urllib.parse.quote(fp, safe="")
-                r = client.get(f"{base}/repository/files/{encoded}/raw?ref=HEAD")
-                if r.is_success:
-                    ctx["ci_files"].append(
-                        {"path": fp, "content": r.text[:_MAX_CI_FILE_CHARS]}
-                    )
-                    fetched += 1
+        ctx["ci_files"] = await _fetch_ci_files(candidates, fetch_file)
 
     return ctx
 
@@ -211,87 +727,343 @@ def fetch_gitlab_context(owner: str, repo: str, token: Optional[str] = None) ->
 # ── Bitbucket ──────────────────────────────────────────────────────────────────
 
 
-def fetch_bitbucket_context(owner: str, repo: str, token: Optional[str] = None) -> dict:
+async def fetch_bitbucket_context_async(
+    owner: str,
+    repo: str,
+    token: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+) -> dict:
     """Fetch repository context from the Bitbucket REST API."""
-    base = f"https://api.bitbucket.org/2.0/repositories/{owner}/{repo}"
-    headers: dict = {}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    ctx: dict = {
-        "provider": "bitbucket",
-        "owner": owner,
-        "repo": repo,
-        "description": "",
-        "language": "",
-        "readme": "",
-        "files": [],
-        "ci_files": [],
-    }
+    headers = _auth_headers("bitbucket", token)
+    base = _repo_api_base("bitbucket", owner, repo)
+    ctx = _empty_context("bitbucket", owner, repo)
 
-    with httpx.Client(headers=headers, timeout=30) as client:
-        r = client.get(base)
-        if r.is_success:
-            d = r.json()
+    async with _async_client(headers) as client:
+        get = _LimitedGetter(client, _fetch_concurrency(concurrency), cache)
+        meta, listing, readme = await asyncio.gather(
+            get(base),
+            # File listing at repository root (shallow; Bitbucket has no recursive tree endpoint)
+            get(f"{base}/src/HEAD/?pagelen=100"),
+            _first_success(
+                get,
+                [f"{base}/src/HEAD/{name}" for name in _README_NAMES],
+            ),
+        )
+        if meta:
+            d = meta.json()
             ctx["description"] = d.get("description") or ""
             ctx["language"] = d.get("language") or ""
-
-        # File listing at repository root (shallow; Bitbucket has no recursive tree endpoint)
-        r = client.get(f"{base}/src/HEAD/?pagelen=100")
-        if r.is_success:
+        if listing:
             ctx["files"] = [
                 v["path"]
-                for v in r.json().get("values", [])
+                for v in listing.json().get("values", [])
                 if v.get("type") == "commit_file"
             ][:_MAX_FILE_LIST]
+        if readme:
+            ctx["readme"] = readme.text[:_MAX_README_CHARS]
 
-        # README
-        for readme_name in ("README.md", "README.rst", "README"):
-            r = client.get(f"{base}/src/HEAD/{readme_name}")
-            if r.is_success:
-                ctx["readme"] = r.text[:_MAX_README_CHARS]
-                break
+        async def fetch_file(fp: str) -> Optional[str]:
+            r = await get(f"{base}/src/HEAD/{fp}")
+            return r.text if r else None
 
-        # CI/CD-relevant files
-        fetched = 0
-        for fp in ctx["files"]:
-            if _is_ci_relevant(fp) and fetched < _MAX_CI_FILES:
-                r = client.get(f"{base}/src/HEAD/{fp}")
-                if r.is_success:
-                    ctx["ci_files"].append(
-                        {"path": fp, "content": r.text[:_MAX_CI_FILE_CHARS]}
-                    )
-                    fetched += 1
+        ctx["ci_files"] = await _fetch_ci_files(ctx["files"], fetch_file)
 
     return ctx
 
 
+# ── Archive snapshots ──────────────────────────────────────────────────────────
+
+
+class ArchiveTooLarge(Exception):
+    """The archive exceeded the download limit; the snapshot is partial."""
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes], max_bytes: int):
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._buffer = b""
+        self._remaining = max_bytes
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._remaining -= len(chunk)
+            if self._remaining < 0:
+                raise ArchiveTooLarge
+            self._buffer = chunk
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+def _archive_max_bytes() -> int:
+    max_mb = float(os.environ.get("REPO_ARCHIVE_MAX_MB", DEFAULT_ARCHIVE_MAX_MB))
+    return int(max_mb * 1024 * 1024)
+
+
+def read_snapshot(chunks: Iterable[bytes], max_bytes: Optional[int] = None) -> dict:
+    """Collect files, README and CI files from a streamed ``.tar(.gz)`` archive.
+
+    The archive is read in a single pass and never written to disk. Only
+    the README and CI-relevant files are read, each up to its size cap; the
+    rest of every member is skipped. Returns a dict with ``files`` (every
+    regular file, sorted), ``readme``, ``ci_files`` and ``truncated``, which
+    is True when reading stopped at *max_bytes* (default:
+    ``REPO_ARCHIVE_MAX_MB`` or 200 MB).
+    """
+    reader = io.BufferedReader(
+        _ChunkReader(chunks, max_bytes or _archive_max_bytes()), 1024 * 1024
+    )
+    files: list[str] = []
+    readmes: dict[str, str] = {}
+    ci_contents: dict[str, str] = {}
+    truncated = False
+    try:
+        with tarfile.open(fileobj=reader, mode="r|*") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                # Archives wrap everything in one "<repo>-<sha>/" directory
+                path = member.name.partition("/")[2]
+                if not path:
+                    continue
+                files.append(path)
+                if path in _README_NAMES:
+                    cap = _MAX_README_BYTES
+                elif _is_ci_relevant(path):
+                    cap = _MAX_CI_FILE_BYTES
+                else:
+                    continue
+                f = archive.extractfile(member)
+                text = f.read(cap).decode("utf-8", errors="replace") if f else ""
+                if path in _README_NAMES:
+                    readmes[path] = text[:_MAX_README_CHARS]
+                else:
+                    ci_contents[path] = text[:_MAX_CI_FILE_CHARS]
+    except ArchiveTooLarge:
+        truncated = True
+
+    files.sort()
+    ci_paths = _rank_ci_files(fp for fp in files if fp in ci_contents)[:_MAX_CI_FILES]
+    return {
+        "files": files,
+        "readme": next((readmes[n] for n in _README_NAMES if n in readmes), ""),
+        "ci_files": [{"path": fp, "content": ci_contents[fp]} for fp in ci_paths],
+        "truncated": truncated,
+    }
+
+
+def _archive_url(provider: str, owner: str, repo: str) -> str:
+    if provider == "github":
+        return f"{_repo_api_base('github', owner, repo)}/tarball"
+    if provider == "gitlab":
+        return f"{_repo_api_base('gitlab', owner, repo)}/repository/archive.tar.gz"
+    web_url = os.environ.get("BITBUCKET_WEB_URL") or "https://bitbucket.org"
+    return f"{web_url.rstrip('/')}/{owner}/{repo}/get/HEAD.tar.gz"
+
+
+def _sync_client(headers: dict) -> httpx.Client:
+    return httpx.Client(headers=headers, timeout=60, follow_redirects=True)
+
+
+def download_snapshot(url: str, headers: dict) -> Optional[dict]:
+    """Stream the archive at *url* through :func:`read_snapshot`.
+
+    Returns None when the archive cannot be downloaded or read.
+    """
+    try:
+        with _sync_client(headers) as client:
+            with client.stream("GET", url) as r:
+                if not r.is_success:
+                    return None
+                return read_snapshot(r.iter_bytes())
+    except (httpx.HTTPError, tarfile.TarError, EOFError, OSError):
+        return None
+
+
+async def fetch_snapshot_context_async(
+    provider: str,
+    owner: str,
+    repo: str,
+    token: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+) -> dict:
+    """Fetch repository context from one archive download plus metadata.
+
+    Gives the complete file tree on every provider (including Bitbucket,
+    whose API only lists the root) in two requests instead of one per file.
+    Falls back to the per-file API fetch when the archive is unavailable or
+    larger than ``REPO_ARCHIVE_MAX_MB``, since a partial snapshot would
+    present part of the tree as the whole repository.
+    """
+    headers = _auth_headers(provider, token)
+    base = _repo_api_base(provider, owner, repo)
+    ctx = _empty_context(provider, owner, repo)
+
+    async with _async_client(headers) as client:
+        get = _LimitedGetter(client, _fetch_concurrency(concurrency), cache)
+        meta, snapshot = await asyncio.gather(
+            get(base),
+            asyncio.to_thread(
+                download_snapshot, _archive_url(provider, owner, repo), headers
+            ),
+        )
+    if snapshot is None or snapshot["truncated"]:
+        return await _FETCHERS[provider](owner, repo, token, concurrency, cache)
+
+    if meta:
+        d = meta.json()
+        ctx["description"] = d.get("description") or ""
+        ctx["language"] = d.get("language") or ""
+    ctx["files"] = snapshot["files"][:_MAX_FILE_LIST]
+    ctx["readme"] = snapshot["readme"]
+    ctx["ci_files"] = snapshot["ci_files"]
+    return ctx
+
+
+# ── Organisation listings ──────────────────────────────────────────────────────
+
+
+def _org_repos_url(provider: str, org: str) -> str:
+    if provider == "github":
+        return f"{_api_url('github')}/orgs/{org}/repos?per_page=100"
+    if provider == "gitlab":
+        group = urllib.parse.quote(org, safe="")
+        return (
+            f"{_api_url('gitlab')}/groups/{group}/projects"
+            "?include_subgroups=true&archived=false&per_page=100"
+        )
+    return f"{_api_url('bitbucket')}/repositories/{org}?pagelen=100"
+
+
+def _org_repo_names(provider: str, page: Any) -> list[tuple[str, str]]:
+    if provider == "github":
+        return [(r["owner"]["login"], r["name"]) for r in page if not r.get("archived")]
+    if provider == "gitlab":
+        return [tuple(r["path_with_namespace"].rsplit("/", 1)) for r in page]
+    return [tuple(r["full_name"].split("/", 1)) for r in page.get("values", [])]
+
+
+async def list_org_repos_async(
+    provider: str, org: str, token: Optional[str] = None
+) -> list[tuple[str, str]]:
+    """Return ``(owner, repo)`` for every repository of an organisation.
+
+    *org* is a GitHub organisation or user, a GitLab group (subgroups
+    included) or a Bitbucket workspace. Archived repositories are left out.
+
+    Raises:
+        httpx.HTTPError: If a page of the listing cannot be read.
+    """
+    if provider not in _FETCHERS:
+        raise ValueError(
+            f"Unsupported provider: {provider!r}. "
+            "Choose from: github, gitlab, bitbucket."
+        )
+    repos: list[tuple[str, str]] = []
+    url: Optional[str] = _org_repos_url(provider, org)
+    async with _async_client(_auth_headers(provider, token)) as client:
+        while url:
+            r = await client.get(url)
+            if r.status_code == 404 and provider == "github" and not repos:
+                # Not an organisation; list the user's repositories instead
+                r = await client.get(
+                    f"{_api_url('github')}/users/{org}/repos?per_page=100"
+                )
+            r.raise_for_status()
+            page = r.json()
+            repos.extend(_org_repo_names(provider, page))
+            if provider == "bitbucket":
+                url = page.get("next")
+            else:
+                url = r.links.get("next", {}).get("url")
+    return repos
+
+
 # ── Public facade ──────────────────────────────────────────────────────────────
 
+_FETCHERS = {
+    "github": fetch_github_context_async,
+    "gitlab": fetch_gitlab_context_async,
+    "bitbucket": fetch_bitbucket_context_async,
+}
+
+
+async def fetch_repo_context_async(
+    provider: str,
+    owner: str,
+    repo: str,
+    token: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+    snapshot: bool = False,
+) -> dict:
+    """Async version of :func:`fetch_repo_context`."""
+    fetcher = _FETCHERS.get(provider)
+    if fetcher is None:
+        raise ValueError(
+            f"Unsupported provider: {provider!r}. "
+            "Choose from: github, gitlab, bitbucket."
+        )
+    if snapshot:
+        return await fetch_snapshot_context_async(
+            provider, owner, repo, token, concurrency, cache
+        )
+    return await fetcher(owner, repo, token, concurrency, cache)
+
+
+def fetch_github_context(owner: str, repo: str, token: Optional[str] = None) -> dict:
+    return asyncio.run(fetch_github_context_async(owner, repo, token))
+
+
+def fetch_gitlab_context(owner: str, repo: str, token: Optional[str] = None) -> dict:
+    return asyncio.run(fetch_gitlab_context_async(owner, repo, token))
+
+
+def fetch_bitbucket_context(owner: str, repo: str, token: Optional[str] = None) -> dict:
+    return asyncio.run(fetch_bitbucket_context_async(owner, repo, token))
+
 
 def fetch_repo_context(
-    provider: str, owner: str, repo: str, token: Optional[str] = None
+    provider: str,
+    owner: str,
+    repo: str,
+    token: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+    snapshot: bool = False,
 ) -> dict:
     """
     Fetch repository context for *provider*.
 
     Args:
-        provider: One of "github", "gitlab", or "bitbucket".
-        owner:    Repository owner / organisation.
-        repo:     Repository name.
-        token:    Optional API token / personal access token.
+        provider:    One of "github", "gitlab", or "bitbucket".
+        owner:       Repository owner / organisation.
+        repo:        Repository name.
+        token:       Optional API token / personal access token.
+        concurrency: Maximum requests in flight (default:
+                     ``REPO_FETCH_CONCURRENCY`` or 8).
+        cache:       Optional :class:`HttpCache`; cached responses are
+                     revalidated with conditional requests.
+        snapshot:    Read files from one archive download instead of
+                     one API request per file.
 
     Returns:
         A dict with keys: provider, owner, repo, description, language,
         readme, files, ci_files.
     """
-    if provider == "github":
-        return fetch_github_context(owner, repo, token)
-    elif provider == "gitlab":
-        return fetch_gitlab_context(owner, repo, token)
-    elif provider == "bitbucket":
-        return fetch_bitbucket_context(owner, repo, token)
-    else:
-        raise ValueError(
-            f"Unsupported provider: {provider!r}. "
-            "Choose from: github, gitlab, bitbucket."
+    return asyncio.run(
+        fetch_repo_context_async(
+            provider, owner, repo, token, concurrency, cache, snapshot
         )
+    )
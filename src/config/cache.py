@@ -0,0 +1,23 @@
+import os
+import sys
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """Return the per-user cache directory of devops-maturity.
+
+    ``DEVOPS_MATURITY_CACHE_DIR`` overrides the platform default
+    (``%LOCALAPPDATA%`` on Windows, ``~/Library/Caches`` on macOS,
+    ``$XDG_CACHE_HOME`` or ``~/.cache`` elsewhere). The directory is not
+    created here.
+    """
+    override = os.environ.get("DEVOPS_MATURITY_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData/Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "devops-maturity"
@@ -1,17 +1,26 @@
-import yaml
+import functools
+import hashlib
+import marshal
 import os
-from typing import List
+import sys
+import yaml
+from typing import List, Optional
+from config.cache import cache_dir
+from core.index import CriteriaIndex
 from core.model import Criteria
 
+# libyaml's loader is several times faster when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-def load_criteria_config() -> tuple[List[str], List[Criteria]]:
-    """Load categories and criteria from YAML config file."""
-    config_path = os.path.join(os.path.dirname(__file__), "criteria.yaml")
+DEFAULT_CRITERIA_PATH = os.path.join(os.path.dirname(__file__), "criteria.yaml")
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+# Bump when the layout of the cached payload changes
+_CACHE_FORMAT = 1
 
-    categories = config["categories"]
+
+def _parse_criteria_yaml(source: bytes) -> tuple[List[str], List[dict]]:
+    config = yaml.load(source, Loader=_YamlLoader)
+    categories = list(config["categories"])
     criteria = [
         Criteria(
             id=item["id"],
@@ -19,8 +28,102 @@ def load_criteria_config() -> tuple[List[str], List[Criteria]]:
             criteria=item["criteria"],
             weight=item["weight"],
             description=item.get("description", ""),
-        )
+        ).model_dump()
         for item in config["criteria"]
     ]
+    return categories, criteria
+
+
+def _cache_path(config_path: str) -> str:
+    key = hashlib.sha256(os.path.abspath(config_path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir(), f"criteria-{key}.marshal")
+
+
+def _read_cache(path: str) -> Optional[dict]:
+    try:
+        with open(path, "rb") as f:
+            payload = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("key") != _cache_key():
+        return None
+    return payload
+
+
+def _write_cache(path: str, payload: dict) -> None:
+    """Write *payload* atomically; a read-only cache dir just disables caching."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            marshal.dump(payload, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
 
+def _cache_key() -> tuple:
+    # marshal's format may change between Python versions
+    return (_CACHE_FORMAT, sys.version_info[:2])
+
+
+def _load_criteria_data(config_path: str) -> tuple[List[str], List[dict]]:
+    """Return validated ``(categories, criteria dicts)`` for *config_path*.
+
+    Results are cached in a marshal file in the user cache dir. The file
+    is reused without reading the YAML while the source's mtime and size
+    are unchanged, and after a touch as long as its sha256 still matches.
+    """
+    stat = os.stat(config_path)
+    cache_path = _cache_path(config_path)
+    cached = _read_cache(cache_path)
+    if (
+        cached is not None
+        and cached["mtime_ns"] == stat.st_mtime_ns
+        and cached["size"] == stat.st_size
+    ):
+        return cached["categories"], cached["criteria"]
+
+    with open(config_path, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source).hexdigest()
+    if cached is not None and cached["sha256"] == digest:
+        categories, criteria = cached["categories"], cached["criteria"]
+    else:
+        categories, criteria = _parse_criteria_yaml(source)
+    _write_cache(
+        cache_path,
+        {
+            "key": _cache_key(),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "categories": categories,
+            "criteria": criteria,
+        },
+    )
     return categories, criteria
+
+
+def load_criteria_config(
+    config_path: Optional[str] = None,
+) -> tuple[List[str], List[Criteria]]:
+    """Load categories and criteria from YAML config file."""
+    categories, criteria = _load_criteria_data(config_path or DEFAULT_CRITERIA_PATH)
+    # Cached entries were validated when the cache was written
+    return list(categories), [Criteria.model_construct(**item) for item in criteria]
+
+
+def load_criteria_index(config_path: Optional[str] = None) -> CriteriaIndex:
+    """Load the criteria config and compile it into a :class:`CriteriaIndex`."""
+    categories, criteria = load_criteria_config(config_path)
+    return CriteriaIndex.compile(categories, criteria)
+
+
+@functools.cache
+def get_criteria_index() -> CriteriaIndex:
+    """Return the :class:`CriteriaIndex` of the bundled criteria, built once per process."""
+    return load_criteria_index()
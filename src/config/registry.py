@@ -0,0 +1,106 @@
+"""Hot-reloadable criteria for long-running processes.
+
+The web app keeps serving while ``criteria.yaml`` is edited: the registry
+notices the change, compiles the new file and swaps it in. Each compiled
+:class:`CriteriaIndex` is immutable, so requests holding the old one keep a
+consistent view. Indexes are kept under their mask-layout version for
+decoding stored assessments; an edit that only changes texts or the
+category list is swapped in too and replaces the index of its version.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import yaml
+from pydantic import ValidationError
+
+from config.loader import DEFAULT_CRITERIA_PATH, load_criteria_index
+from core.index import CriteriaIndex
+
+logger = logging.getLogger(__name__)
+
+
+class CriteriaRegistry:
+    """Current criteria set plus every version compiled by this process.
+
+    *reload_interval* is the minimum number of seconds between two checks
+    of the config file's mtime and size; ``None`` disables reloading.
+    Checks piggyback on :attr:`current`, so no watcher thread is needed.
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        reload_interval: Optional[float] = None,
+    ):
+        self.config_path = config_path or DEFAULT_CRITERIA_PATH
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._stat = self._stat_key()
+        index = load_criteria_index(self.config_path)
+        self._current = index
+        self._versions = {index.version: index}
+        self._next_check = time.monotonic() + (reload_interval or 0)
+
+    def _stat_key(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            # e.g. an editor replacing the file; check again next time
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def current(self) -> CriteriaIndex:
+        """The latest criteria set; take it once per request and reuse it."""
+        if self.reload_interval is not None and time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self._current
+
+    @property
+    def versions(self) -> tuple[str, ...]:
+        return tuple(self._versions)
+
+    def get(self, version: Optional[str]) -> Optional[CriteriaIndex]:
+        """Return the criteria set compiled for *version*, if this process has seen it."""
+        return self._versions.get(version) if version else None
+
+    def reload_if_changed(self) -> bool:
+        """Recompile the config if it changed on disk; return True on a swap.
+
+        Readers never wait: a caller that finds another thread reloading
+        returns at once and keeps using the current version. A file that
+        fails to load is logged and the current version stays in place.
+        """
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = time.monotonic() + (self.reload_interval or 0)
+            stat = self._stat_key()
+            if stat is None or stat == self._stat:
+                return False
+            self._stat = stat
+            try:
+                index = load_criteria_index(self.config_path)
+            except (OSError, KeyError, TypeError, ValidationError, yaml.YAMLError):
+                logger.warning(
+                    "Keeping criteria version %s: failed to load %s",
+                    self._current.version,
+                    self.config_path,
+                    exc_info=True,
+                )
+                return False
+            current = self._current
+            if (index.categories, index.criteria) == (
+                current.categories,
+                current.criteria,
+            ):
+                return False  # touched but unchanged
+            self._versions[index.version] = index
+            self._current = index
+            return True
+        finally:
+            self._lock.release()
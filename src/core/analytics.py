@@ -0,0 +1,92 @@
+"""Portfolio analytics over the normalized ``assessment_responses`` table.
+
+Every helper runs as a single SQL aggregate backed by the composite
+``(criterion_id, answer, assessment_id)`` index, so cost grows with the
+number of matching answers rather than with the size of the JSON column.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer, Select, cast, func, select
+from sqlalchemy.orm import Session
+
+from .model import Assessment, AssessmentResponse
+
+
+@dataclass(frozen=True)
+class CriterionPassRate:
+    criterion_id: str
+    passed: int
+    total: int
+
+    @property
+    def rate(self) -> float:
+        """Share of assessments meeting the criterion, 0–100."""
+        return (self.passed / self.total) * 100 if self.total else 0.0
+
+
+def _in_period(stmt, since: Optional[datetime], until: Optional[datetime]):
+    if since is None and until is None:
+        return stmt
+    stmt = stmt.join(Assessment, Assessment.id == AssessmentResponse.assessment_id)
+    if since is not None:
+        stmt = stmt.where(Assessment.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(Assessment.created_at < until)
+    return stmt
+
+
+def _latest_assessment_ids():
+    """Id of the most recent assessment of every project."""
+    return select(func.max(Assessment.id)).group_by(Assessment.project_name)
+
+
+def criterion_pass_rates(
+    db: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> dict[str, CriterionPassRate]:
+    """Return the pass rate of every criterion answered in the period.
+
+    *since* is inclusive and *until* exclusive; both filter on the
+    assessment's ``created_at``. Criteria an assessment did not answer are
+    not counted for it.
+    """
+    stmt: Select = select(
+        AssessmentResponse.criterion_id,
+        func.sum(cast(AssessmentResponse.answer, Integer)),
+        func.count(),
+    ).group_by(AssessmentResponse.criterion_id)
+    stmt = _in_period(stmt, since, until)
+    return {
+        cid: CriterionPassRate(cid, int(passed or 0), int(total))
+        for cid, passed, total in db.execute(stmt)
+    }
+
+
+def failing_projects(
+    db: Session,
+    criterion_id: str,
+    latest_only: bool = True,
+) -> list[str]:
+    """Return the names of projects that do not meet *criterion_id*.
+
+    With *latest_only* (the default) only each project's most recent
+    assessment is considered, so projects that have since fixed the gap
+    are not reported.
+    """
+    stmt: Select = (
+        select(Assessment.project_name)
+        .join(AssessmentResponse, Assessment.id == AssessmentResponse.assessment_id)
+        .where(
+            AssessmentResponse.criterion_id == criterion_id,
+            AssessmentResponse.answer.is_(False),
+        )
+        .distinct()
+        .order_by(Assessment.project_name)
+    )
+    if latest_only:
+        stmt = stmt.where(Assessment.id.in_(_latest_assessment_ids()))
+    return list(db.scalars(stmt))
@@ -0,0 +1,139 @@
+"""Compact integer encoding of assessment responses.
+
+Bit *j* of a response mask is set when criterion *j* of a criteria set is
+met. Masks are only meaningful together with the criteria version they
+were encoded against, which is why the two are always stored side by side.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .model import Criteria, UserResponse
+
+WeightMasks = tuple[tuple[float, int], ...]
+
+
+def criteria_version(criteria: Sequence[Criteria]) -> str:
+    """Return a short fingerprint of the criteria ids, order, categories and weights."""
+    payload = json.dumps([[c.id, c.category, c.weight] for c in criteria])
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+
+def _weight_masks(criteria: Sequence[Criteria], bits: Iterable[int]) -> WeightMasks:
+    """Group the given bit positions by criterion weight."""
+    masks: dict[float, int] = {}
+    for j in bits:
+        w = criteria[j].weight
+        masks[w] = masks.get(w, 0) | (1 << j)
+    return tuple(masks.items())
+
+
+def _weighted_popcount(mask: int, weight_masks: WeightMasks) -> float:
+    return sum(w * (mask & m).bit_count() for w, m in weight_masks)
+
+
+@dataclass(frozen=True)
+class MaskLayout:
+    """Bit layout of one criteria version plus the masks needed to score it.
+
+    Single masks are scored by popcount; many masks at once are cheaper
+    to unpack with :meth:`to_matrix` for :func:`core.scorer.score_batch`.
+    """
+
+    version: str
+    ids: tuple[str, ...]
+    bits: Mapping[str, int]
+    total_weight: float
+    weight_masks: WeightMasks
+    category_max_weights: Mapping[str, float]
+    category_weight_masks: Mapping[str, WeightMasks]
+
+    @classmethod
+    def compile(cls, criteria: Sequence[Criteria]) -> "MaskLayout":
+        categories = dict.fromkeys(c.category for c in criteria)
+        return cls(
+            version=criteria_version(criteria),
+            ids=tuple(c.id for c in criteria),
+            bits={c.id: j for j, c in enumerate(criteria)},
+            total_weight=sum(c.weight for c in criteria),
+            weight_masks=_weight_masks(criteria, range(len(criteria))),
+            category_max_weights={
+                cat: sum(c.weight for c in criteria if c.category == cat)
+                for cat in categories
+            },
+            category_weight_masks={
+                cat: _weight_masks(
+                    criteria,
+                    (j for j, c in enumerate(criteria) if c.category == cat),
+                )
+                for cat in categories
+            },
+        )
+
+    # ── Conversion ────────────────────────────────────────────────────────────
+
+    def encode(self, responses: Mapping[str, bool]) -> int:
+        """Encode ``{id: answer}``; unknown ids are dropped."""
+        mask = 0
+        for cid, answer in responses.items():
+            j = self.bits.get(cid)
+            if answer and j is not None:
+                mask |= 1 << j
+        return mask
+
+    def encode_exact(self, responses: Mapping[str, bool]) -> Optional[int]:
+        """Encode *responses* if :meth:`decode` gives them back unchanged.
+
+        That takes an answer for every criterion and no other ids;
+        otherwise return None.
+        """
+        if len(responses) != len(self.ids) or not all(
+            cid in self.bits for cid in responses
+        ):
+            return None
+        return self.encode(responses)
+
+    def decode(self, mask: int) -> dict[str, bool]:
+        """Decode *mask* into ``{id: answer}`` for every criterion."""
+        return {cid: bool(mask >> j & 1) for j, cid in enumerate(self.ids)}
+
+    def from_user_responses(self, responses: Iterable[UserResponse]) -> int:
+        return self.encode({r.id: r.answer for r in responses})
+
+    def to_user_responses(self, mask: int) -> list[UserResponse]:
+        return [
+            UserResponse(id=cid, answer=answer)
+            for cid, answer in self.decode(mask).items()
+        ]
+
+    # ── Scoring ───────────────────────────────────────────────────────────────
+
+    def score(self, mask: int) -> float:
+        """Overall score (0–100) computed straight from *mask*."""
+        if not self.total_weight:
+            return 0.0
+        return (_weighted_popcount(mask, self.weight_masks) / self.total_weight) * 100
+
+    def category_scores(self, mask: int) -> dict[str, float]:
+        """Per-category scores (0–100) computed straight from *mask*."""
+        return {
+            cat: (_weighted_popcount(mask, wm) / self.category_max_weights[cat]) * 100
+            if self.category_max_weights[cat]
+            else 0.0
+            for cat, wm in self.category_weight_masks.items()
+        }
+
+    def to_matrix(self, masks: Sequence[int]) -> np.ndarray:
+        """Unpack many masks into an (N, n_criteria) boolean matrix.
+
+        The result can be passed to :func:`core.scorer.score_batch` to score
+        a whole table scan without decoding any JSON. Supports layouts of up
+        to 64 criteria.
+        """
+        packed = np.asarray(masks, dtype=np.uint64).reshape(-1, 1)
+        shifts = np.arange(len(self.ids), dtype=np.uint64)
+        return (packed >> shifts & np.uint64(1)).astype(bool)
@@ -0,0 +1,122 @@
+"""Compiled, immutable view over a criteria set.
+
+Built once from ``load_criteria_config()`` and shared by the CLI and web app
+so per-request code never has to re-derive lookups or weight totals.
+"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Iterable, Iterator, Mapping, Optional, Sequence, Union
+
+from .bitmask import MaskLayout
+from .model import Criteria, UserResponse
+from .scorer import ScoringWeights, compile_weights, responses_to_matrix, score_batch
+
+Responses = Union[Mapping[str, bool], Iterable[UserResponse]]
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    """Everything derived from one set of responses."""
+
+    score: float
+    level: str
+    category_scores: Mapping[str, float]
+    passed: tuple[Criteria, ...]
+    failed: tuple[Criteria, ...]
+    # None when the responses are not exactly one answer per criterion
+    mask: Optional[int]
+    criteria_version: str
+
+
+@dataclass(frozen=True)
+class CriteriaIndex:
+    """Criteria grouped by category with precomputed lookups and weights.
+
+    Criteria are stored grouped by category (declared order first, then any
+    undeclared categories in order of appearance), so each category maps to
+    a contiguous slice of :attr:`criteria`. Categories without criteria get
+    an empty slice and no entry in :attr:`category_max_weights`.
+    """
+
+    categories: tuple[str, ...]
+    criteria: tuple[Criteria, ...]
+    positions: Mapping[str, int]
+    category_slices: Mapping[str, slice]
+    category_max_weights: Mapping[str, float]
+    total_weight: float
+    weights: ScoringWeights = field(repr=False)
+    layout: MaskLayout = field(repr=False)
+
+    @property
+    def version(self) -> str:
+        return self.layout.version
+
+    @classmethod
+    def compile(
+        cls, categories: Sequence[str], criteria: Sequence[Criteria]
+    ) -> "CriteriaIndex":
+        order = dict.fromkeys([*categories, *(c.category for c in criteria)])
+        grouped: list[Criteria] = []
+        slices: dict[str, slice] = {}
+        maxes: dict[str, float] = {}
+        for cat in order:
+            members = [c for c in criteria if c.category == cat]
+            slices[cat] = slice(len(grouped), len(grouped) + len(members))
+            grouped.extend(members)
+            if members:
+                maxes[cat] = sum(c.weight for c in members)
+
+        return cls(
+            categories=tuple(slices),
+            criteria=tuple(grouped),
+            positions=MappingProxyType({c.id: i for i, c in enumerate(grouped)}),
+            category_slices=MappingProxyType(slices),
+            category_max_weights=MappingProxyType(maxes),
+            total_weight=sum(c.weight for c in grouped),
+            weights=compile_weights(grouped),
+            layout=MaskLayout.compile(grouped),
+        )
+
+    def __len__(self) -> int:
+        return len(self.criteria)
+
+    def __iter__(self) -> Iterator[Criteria]:
+        return iter(self.criteria)
+
+    def __contains__(self, criteria_id: object) -> bool:
+        return criteria_id in self.positions
+
+    def get(self, criteria_id: str) -> Optional[Criteria]:
+        pos = self.positions.get(criteria_id)
+        return None if pos is None else self.criteria[pos]
+
+    def category_of(self, criteria_id: str) -> str:
+        c = self.get(criteria_id)
+        return c.category if c else "Unknown"
+
+    def in_category(self, category: str) -> tuple[Criteria, ...]:
+        return self.criteria[self.category_slices.get(category, slice(0, 0))]
+
+    def evaluate(self, responses: Responses) -> Evaluation:
+        """Score *responses* through ``score_batch`` and split passed/failed criteria."""
+        if isinstance(responses, Mapping):
+            response_map = responses
+        else:
+            response_map = {r.id: r.answer for r in responses}
+
+        matrix = responses_to_matrix(self.weights, [response_map])
+        batch = score_batch(self.weights, matrix)
+        answered = matrix[0].tolist()
+        return Evaluation(
+            score=float(batch.scores[0]),
+            level=str(batch.levels[0]),
+            category_scores={
+                cat: float(s)
+                for cat, s in zip(self.weights.categories, batch.category_scores[0])
+            },
+            passed=tuple(c for c, ok in zip(self.criteria, answered) if ok),
+            failed=tuple(c for c, ok in zip(self.criteria, answered) if not ok),
+            mask=self.layout.encode_exact(response_map),
+            criteria_version=self.version,
+        )
@@ -1,13 +1,134 @@
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
 from pydantic import BaseModel
-from sqlalchemy import Column, Integer, String, JSON, create_engine
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    JSON,
+    create_engine,
+    event,
+    inspect,
+    text,
+)
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Mapped, mapped_column, relationship, sessionmaker
+from sqlalchemy.pool import NullPool
 
 Base = declarative_base()
 
-engine = create_engine("sqlite:///./devops_maturity.db")
+# Response masks are stored in a signed 64-bit column
+MAX_MASK_BITS = 63
+
+DEFAULT_DATABASE_URL = "sqlite:///./devops_maturity.db"
+
+# Driver used by the async engine for each backend; the sync engine uses the
+# backend's default driver
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def get_database_url() -> str:
+    """Return the database URL from ``DATABASE_URL`` or the local SQLite default."""
+    return os.environ.get("DATABASE_URL") or DEFAULT_DATABASE_URL
+
+
+def _with_driver(url: str, use_async: bool) -> URL:
+    """Parse *url* and swap in the sync or async driver of its backend.
+
+    ``DATABASE_URL`` can name either flavour (``sqlite://``,
+    ``postgresql+asyncpg://``...), so the CLI and the web app share one
+    setting. Drivers of other backends are left as given.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    async_driver = ASYNC_DRIVERS.get(backend)
+    if async_driver is None:
+        return parsed
+    if use_async:
+        return parsed.set(drivername=f"{backend}+{async_driver}")
+    if parsed.get_driver_name() == async_driver:
+        return parsed.set(drivername=backend)
+    return parsed
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": int(os.environ.get("DATABASE_POOL_SIZE", "5")),
+        "max_overflow": int(os.environ.get("DATABASE_MAX_OVERFLOW", "10")),
+        "pool_recycle": int(os.environ.get("DATABASE_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+    """Tune every new SQLite connection for concurrent web writes.
+
+    WAL lets readers run alongside a writer, the busy timeout makes writers
+    wait for the lock instead of failing with "database is locked", and
+    synchronous=NORMAL is durable under WAL while avoiding an fsync per
+    commit.
+    """
+    busy_timeout_ms = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def create_db_engine(url: Optional[str] = None) -> Engine:
+    """Create the SQLAlchemy engine for *url* (default: :func:`get_database_url`).
+
+    Server databases get an explicitly sized connection pool with
+    pre-ping, configurable through ``DATABASE_POOL_SIZE``,
+    ``DATABASE_MAX_OVERFLOW`` and ``DATABASE_POOL_RECYCLE``. SQLite
+    connections are switched to WAL mode with a busy timeout.
+    """
+    db_url = _with_driver(url or get_database_url(), use_async=False)
+    if db_url.get_backend_name() == "sqlite":
+        sqlite_engine = create_engine(db_url, connect_args={"check_same_thread": False})
+        event.listen(sqlite_engine, "connect", _set_sqlite_pragmas)
+        return sqlite_engine
+
+    return create_engine(db_url, **_pool_options())
+
+
+def create_async_db_engine(url: Optional[str] = None) -> AsyncEngine:
+    """Create the asyncio engine used by the web app.
+
+    The URL is the same as for :func:`create_db_engine`, switched to
+    aiosqlite or asyncpg. SQLite connections are cheap to open and get the
+    same pragmas, but are not pooled: an aiosqlite connection is tied to
+    the event loop that opened it.
+    """
+    db_url = _with_driver(url or get_database_url(), use_async=True)
+    if db_url.get_backend_name() == "sqlite":
+        sqlite_engine = create_async_engine(
+            db_url, connect_args={"check_same_thread": False}, poolclass=NullPool
+        )
+        event.listen(sqlite_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return sqlite_engine
+
+    return create_async_engine(db_url, **_pool_options())
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 
 class Criteria(BaseModel):
     id: str
@@ -27,8 +148,88 @@ class Assessment(Base):  # type: ignore
     id = Column(Integer, primary_key=True, index=True)
     project_name = Column(String, nullable=False)
     project_url = Column(String, nullable=True)
-    user_id = Column(Integer)
-    responses = Column(JSON)
+    user_id = Column(Integer, index=True)
+    created_at = Column(
+        DateTime, index=True, default=lambda: datetime.now(timezone.utc)
+    )
+    # Only kept when responses_mask cannot hold the answers, see set_mask()
+    responses: Mapped[Optional[dict]] = mapped_column(JSON(none_as_null=True))
+    # Denormalized scoring results, written whenever responses change
+    score: Mapped[Optional[float]] = mapped_column(Float, index=True, nullable=True)
+    level: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True)
+    category_scores: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Bit j set when criterion j of ``criteria_version`` is met (core.bitmask)
+    responses_mask: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    criteria_version: Mapped[Optional[str]] = mapped_column(
+        String, index=True, nullable=True
+    )
+
+    # Composite indexes backing keyset pagination of the assessments list
+    __table_args__ = (
+        Index("ix_assessments_project_name_id", "project_name", "id"),
+        Index("ix_assessments_score_id", "score", "id"),
+    )
+
+    # Normalized copy of ``responses``, one row per answered criterion
+    answers = relationship(
+        "AssessmentResponse",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def set_responses(self, responses: dict) -> None:
+        """Store *responses* in the JSON column and the normalized table."""
+        self.responses = dict(responses)
+        self.answers = [
+            AssessmentResponse(criterion_id=cid, answer=bool(answer))
+            for cid, answer in responses.items()
+        ]
+
+    def set_mask(self, mask: Optional[int], criteria_version: str) -> None:
+        """Store the response mask encoded against *criteria_version*.
+
+        A mask holds every answer (see ``MaskLayout.encode_exact``), so the
+        JSON copy written by :meth:`set_responses` is dropped; call this
+        afterwards. Without a mask the JSON column is kept.
+        """
+        if mask is not None and mask.bit_length() > MAX_MASK_BITS:
+            mask = None
+        self.responses_mask = mask
+        self.criteria_version = criteria_version
+        if mask is not None:
+            self.responses = None
+
+    def saved_responses(self) -> dict:
+        """Return the answers from the JSON column or, if dropped, the normalized rows."""
+        if self.responses is not None:
+            return dict(self.responses)
+        return {r.criterion_id: r.answer for r in self.answers}
+
+    def apply_evaluation(self, evaluation) -> None:
+        """Store the score, level, category scores and mask of an ``Evaluation``."""
+        self.score = evaluation.score
+        self.level = evaluation.level
+        self.category_scores = dict(evaluation.category_scores)
+        self.set_mask(evaluation.mask, evaluation.criteria_version)
+
+
+class AssessmentResponse(Base):  # type: ignore
+    __tablename__ = "assessment_responses"
+    assessment_id = Column(
+        Integer, ForeignKey("assessments.id", ondelete="CASCADE"), primary_key=True
+    )
+    criterion_id = Column(String, primary_key=True)
+    answer = Column(Boolean, nullable=False)
+
+    # Per-criterion analytics: pass rates and "who fails Dxxx" lookups
+    __table_args__ = (
+        Index(
+            "ix_assessment_responses_criterion_answer",
+            "criterion_id",
+            "answer",
+            "assessment_id",
+        ),
+    )
 
 
 class User(Base):  # type: ignore
@@ -41,5 +242,31 @@ class User(Base):  # type: ignore
     oauth_id = Column(String, nullable=True)  # provider user id
 
 
+def _add_missing_columns():
+    """Add columns introduced after a table was first created.
+
+    ``create_all`` only creates missing tables, so databases written by an
+    older release are upgraded in place here.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"
+                    )
+                )
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
@@ -1,44 +1,123 @@
-from typing import Dict, List
+import bisect
+import functools
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
 from .model import Criteria, UserResponse
 
+# Maturity levels in ascending order and the score at which each one starts
+LEVELS = ("WIP", "PASSING", "BRONZE", "SILVER", "GOLD")
+LEVEL_THRESHOLDS = (30.0, 50.0, 70.0, 90.0)
 
-def calculate_score(criteria: List[Criteria], responses: List[UserResponse]) -> float:
-    total = 0.0
-    max_score = 0.0
+
+@dataclass(frozen=True)
+class ScoringWeights:
+    """Criteria weights compiled into arrays for vectorized scoring.
+
+    ``weights[j]`` is the weight of ``ids[j]`` and ``category_masks[k, j]``
+    is True when criterion *j* belongs to ``categories[k]``.
+    """
+
+    ids: tuple[str, ...]
+    categories: tuple[str, ...]
+    weights: np.ndarray
+    category_masks: np.ndarray
+
+    @functools.cached_property
+    def category_weights(self) -> np.ndarray:
+        """(n_categories, n_criteria) weight matrix, zero outside each category."""
+        return self.category_masks * self.weights
+
+    @functools.cached_property
+    def category_divisors(self) -> np.ndarray:
+        """Maximum score of each category; inf for weightless ones, so they score 0."""
+        cat_max = self.category_weights.sum(axis=1)
+        return np.where(cat_max > 0, cat_max, np.inf)
+
+
+@dataclass(frozen=True)
+class BatchScores:
+    """Scores for N assessments, one row per assessment."""
+
+    scores: np.ndarray  # shape (N,)
+    category_scores: np.ndarray  # shape (N, n_categories)
+    levels: np.ndarray  # shape (N,), dtype object
+
+
+def compile_weights(criteria: Sequence[Criteria]) -> ScoringWeights:
+    """Turn a criteria list into a weight vector plus per-category masks."""
+    return _compile(tuple((c.id, c.category, c.weight) for c in criteria))
+
+
+@functools.lru_cache(maxsize=32)
+def _compile(spec: tuple[tuple[str, str, float], ...]) -> ScoringWeights:
+    # Cached, so per-assessment callers don't rebuild the arrays on every call
+    ids = tuple(cid for cid, _, _ in spec)
+    categories = tuple(dict.fromkeys(cat for _, cat, _ in spec))
+    weights = np.array([w for _, _, w in spec], dtype=np.float64)
+    category_masks = np.array(
+        [[c == cat for _, c, _ in spec] for cat in categories], dtype=bool
+    ).reshape(len(categories), len(ids))
+    weights.flags.writeable = False
+    category_masks.flags.writeable = False
+    return ScoringWeights(ids, categories, weights, category_masks)
+
+
+def responses_to_matrix(
+    weights: ScoringWeights, responses: Sequence[Mapping[str, bool]]
+) -> np.ndarray:
+    """Build an (N, n_criteria) boolean matrix from ``{id: answer}`` mappings.
+
+    Ids that are not part of *weights* are ignored; missing ids count as "no".
+    """
+    rows = [[bool(r.get(cid)) for cid in weights.ids] for r in responses]
+    return np.array(rows, dtype=bool).reshape(len(responses), len(weights.ids))
+
+
+def levels_for_scores(scores: np.ndarray) -> np.ndarray:
+    """Map an array of scores onto maturity level names."""
+    idx = np.searchsorted(LEVEL_THRESHOLDS, scores, side="right")
+    return np.asarray(LEVELS, dtype=object)[idx]
+
+
+def score_batch(weights: ScoringWeights, matrix: np.ndarray) -> BatchScores:
+    """Score N assessments at once from an (N, n_criteria) boolean matrix."""
+    answered = np.atleast_2d(np.asarray(matrix, dtype=np.float64))
+
+    max_score = weights.weights.sum()
+    totals = answered @ weights.weights
+    scores = totals / max_score * 100 if max_score else np.zeros(len(answered))
+
+    cat_totals = answered @ weights.category_weights.T
+    category_scores = cat_totals / weights.category_divisors * 100
+
+    return BatchScores(scores, category_scores, levels_for_scores(scores))
+
+
+def _score_single(
+    criteria: List[Criteria], responses: List[UserResponse]
+) -> tuple[ScoringWeights, BatchScores]:
+    weights = compile_weights(criteria)
     response_map = {r.id: r.answer for r in responses}
+    return weights, score_batch(weights, responses_to_matrix(weights, [response_map]))
 
-    for c in criteria:
-        max_score += c.weight
-        if response_map.get(c.id):
-            total += c.weight
 
-    return (total / max_score) * 100 if max_score else 0.0
+def calculate_score(criteria: List[Criteria], responses: List[UserResponse]) -> float:
+    _, batch = _score_single(criteria, responses)
+    return float(batch.scores[0])
 
 
 def calculate_category_scores(
     criteria: List[Criteria], responses: List[UserResponse]
 ) -> Dict[str, float]:
     """Return a score (0–100) for each category."""
-    response_map = {r.id: r.answer for r in responses}
-    totals: Dict[str, float] = {}
-    maxes: Dict[str, float] = {}
-
-    for c in criteria:
-        maxes[c.category] = maxes.get(c.category, 0.0) + c.weight
-        if response_map.get(c.id):
-            totals[c.category] = totals.get(c.category, 0.0) + c.weight
-
-    return {cat: (totals.get(cat, 0.0) / maxes[cat]) * 100 for cat in maxes}
+    weights, batch = _score_single(criteria, responses)
+    return {
+        cat: float(s) for cat, s in zip(weights.categories, batch.category_scores[0])
+    }
 
 
 def score_to_level(score: float) -> str:
-    if score < 30:
-        return "WIP"
-    elif score < 50:
-        return "PASSING"
-    elif score < 70:
-        return "BRONZE"
-    elif score < 90:
-        return "SILVER"
-    else:
-        return "GOLD"
+    return LEVELS[bisect.bisect_right(LEVEL_THRESHOLDS, score)]
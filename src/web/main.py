@@ -1,6 +1,14 @@
+import base64
+import json
 import os
+from typing import Optional, Sequence
+from urllib.parse import urlencode
+
+import anyio
+from fastapi import Depends
 from fastapi import FastAPI
 from fastapi import HTTPException
+from fastapi import Query
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
@@ -8,11 +16,11 @@ from fastapi.responses import HTMLResponse
 from fastapi import Request
 from fastapi import Form
 from fastapi.responses import FileResponse, RedirectResponse
-from core.model import UserResponse, Assessment, SessionLocal, init_db, User
-from core.scorer import calculate_score, score_to_level, calculate_category_scores
+from core.model import Assessment, AsyncSessionLocal, init_db, User
 from core.badge import get_badge_url
 from core import __version__
-from config.loader import load_criteria_config
+from core.index import CriteriaIndex
+from config.registry import CriteriaRegistry
 
 # Handle bcrypt version compatibility issue
 try:
@@ -24,7 +32,10 @@ except (ImportError, AttributeError):
     # Force bcrypt to use the correct backend
     bcrypt = passlib.hash.bcrypt.using(rounds=12)
 
+from sqlalchemy import false, select, tuple_
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, selectinload
 from authlib.integrations.starlette_client import OAuth
 from starlette.config import Config
 from dotenv import load_dotenv
@@ -49,50 +60,68 @@ def healthz():
     return {"status": "ok", "version": __version__}
 
 
+async def get_db():
+    """Yield an async database session, closed once the response is sent."""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
 @app.get("/edit-assessment/{assessment_id}", response_class=HTMLResponse)
-def edit_assessment_form(request: Request, assessment_id: int):
-    user = get_current_user(request)
-    db = SessionLocal()
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
-    db.close()
+async def edit_assessment_form(
+    request: Request, assessment_id: int, db: AsyncSession = Depends(get_db)
+):
+    user = await get_current_user(request, db)
+    assessment = await db.scalar(
+        select(Assessment)
+        .options(defer(Assessment.responses))
+        .where(Assessment.id == assessment_id)
+    )
     if not assessment:
         raise HTTPException(status_code=404, detail="Assessment not found")
     if not user or assessment.user_id != user.id:
         raise HTTPException(status_code=403, detail="Not allowed")
+    index = criteria_registry.current
+    responses = await load_stored_responses(db, [assessment])
     return templates.TemplateResponse(
         request,
         "edit_assessment.html",
         {
             "assessment": assessment,
-            "criteria": criteria,
-            "categories": categories,
+            "responses": responses[assessment.id],
+            "criteria": index.criteria,
+            "categories": index.categories,
             "user": user,
         },
     )
 
 
 @app.post("/edit-assessment/{assessment_id}", response_class=HTMLResponse)
-async def edit_assessment_submit(request: Request, assessment_id: int):
-    user = get_current_user(request)
-    db = SessionLocal()
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+async def edit_assessment_submit(
+    request: Request, assessment_id: int, db: AsyncSession = Depends(get_db)
+):
+    user = await get_current_user(request, db)
+    # Answers are replaced below, which needs the old rows loaded
+    assessment = await db.scalar(
+        select(Assessment)
+        .options(selectinload(Assessment.answers))
+        .where(Assessment.id == assessment_id)
+    )
     if not assessment:
-        db.close()
         raise HTTPException(status_code=404, detail="Assessment not found")
     if not user or assessment.user_id != user.id:
-        db.close()
         raise HTTPException(status_code=403, detail="Not allowed")
+    index = criteria_registry.current
     form = await request.form()
     project_name = form.get("project_name")
     if not project_name:
-        db.close()
         return templates.TemplateResponse(
             request,
             "edit_assessment.html",
             {
                 "assessment": assessment,
-                "criteria": criteria,
-                "categories": categories,
+                "responses": stored_responses(assessment),
+                "criteria": index.criteria,
+                "categories": index.categories,
                 "user": user,
                 "error": "Project Name is required.",
             },
@@ -105,9 +134,9 @@ async def edit_assessment_submit(request: Request, assessment_id: int):
         responses_dict[k] = v == "yes"
     assessment.project_name = project_name
     assessment.project_url = project_url
-    assessment.responses = responses_dict
-    db.commit()
-    db.close()
+    assessment.set_responses(responses_dict)
+    assessment.apply_evaluation(index.evaluate(responses_dict))
+    await db.commit()
     return RedirectResponse("/assessments", status_code=302)
 
 
@@ -149,25 +178,57 @@ app.add_middleware(
 templates = Jinja2Templates(directory="src/web/templates")
 app.mount("/static", StaticFiles(directory="src/web/static"), name="static")
 
-# Load criteria and categories from config
-categories, criteria = load_criteria_config()
+# Criteria are recompiled when criteria.yaml changes, without a restart.
+# Handlers take one snapshot per request with ``criteria_registry.current``;
+# a value of 0 or less turns reloading off.
+CRITERIA_RELOAD_INTERVAL = float(os.environ.get("CRITERIA_RELOAD_INTERVAL", "2"))
+criteria_registry = CriteriaRegistry(
+    reload_interval=CRITERIA_RELOAD_INTERVAL if CRITERIA_RELOAD_INTERVAL > 0 else None
+)
 
 init_db()
 
 
-def get_assessment_template_context(request: Request, **extra):
+def stored_responses(assessment: Assessment) -> dict:
+    """Return the saved answers, decoding the bitmask when possible.
+
+    The mask is decoded with the criteria version it was saved against.
+    Unmasked assessments and versions this process has not compiled fall
+    back to :meth:`Assessment.saved_responses`; call it while the
+    assessment's session is open.
+    """
+    index = criteria_registry.get(assessment.criteria_version)
+    if assessment.responses_mask is not None and index is not None:
+        return index.layout.decode(assessment.responses_mask)
+    return assessment.saved_responses()
+
+
+async def load_stored_responses(
+    db: AsyncSession, assessments: Sequence[Assessment]
+) -> dict[int, dict]:
+    """Return :func:`stored_responses` of each assessment, keyed by id.
+
+    Runs in the session's sync context so the deferred JSON column and the
+    normalized rows can still be loaded for assessments without a usable
+    mask.
+    """
+    return await db.run_sync(lambda _: {a.id: stored_responses(a) for a in assessments})
+
+
+def get_assessment_template_context(
+    index: CriteriaIndex, user: Optional[User], **extra
+):
     """Build shared context for the assessment form."""
     category_counts = {
-        category: len([c for c in criteria if c.category == category])
-        for category in categories
+        category: len(index.in_category(category)) for category in index.categories
     }
     context = {
         "__version__": __version__,
-        "criteria": criteria,
-        "criteria_count": len(criteria),
-        "categories": categories,
+        "criteria": index.criteria,
+        "criteria_count": len(index),
+        "categories": index.categories,
         "category_counts": category_counts,
-        "user": get_current_user(request),
+        "user": user,
     }
     context.update(extra)
     return context
@@ -188,19 +249,36 @@ def is_oauth_provider_enabled(provider: str) -> bool:
     return False
 
 
-def get_current_user(request: Request):
+# Password hashing runs in worker threads so a 12-round bcrypt does not stall
+# the event loop; the limiter caps how many hashes run at once
+PASSWORD_HASH_CONCURRENCY = int(
+    os.environ.get("PASSWORD_HASH_CONCURRENCY", str(min(4, os.cpu_count() or 1)))
+)
+_password_hash_limiter = anyio.CapacityLimiter(PASSWORD_HASH_CONCURRENCY)
+
+
+async def hash_password(password: str) -> str:
+    return await anyio.to_thread.run_sync(
+        bcrypt.hash, password, limiter=_password_hash_limiter
+    )
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await anyio.to_thread.run_sync(
+        bcrypt.verify, password, password_hash, limiter=_password_hash_limiter
+    )
+
+
+async def get_current_user(request: Request, db: AsyncSession) -> Optional[User]:
     user_id = request.session.get("user_id")
     if not user_id:
         return None
-    db = SessionLocal()
-    user = db.query(User).filter(User.id == user_id).first()
-    db.close()
-    return user
+    return await db.get(User, user_id)
 
 
 @app.get("/register", response_class=HTMLResponse)
-def register_form(request: Request):
-    user = get_current_user(request)
+async def register_form(request: Request, db: AsyncSession = Depends(get_db)):
+    user = await get_current_user(request, db)
     if user:
         return RedirectResponse("/", status_code=302)
 
@@ -221,20 +299,17 @@ async def register(
     username: str = Form(...),
     email: str = Form(...),
     password: str = Form(...),
+    db: AsyncSession = Depends(get_db),
 ):
-    db = SessionLocal()
-    hashed_password = bcrypt.hash(password)
+    hashed_password = await hash_password(password)
     user = User(username=username, email=email, password_hash=hashed_password)
     db.add(user)
     try:
-        db.commit()
-        db.refresh(user)
+        await db.commit()
         request.session["user_id"] = user.id
-        db.close()
         return RedirectResponse("/", status_code=302)
     except IntegrityError:
-        db.rollback()
-        db.close()
+        await db.rollback()
         # Check which OAuth providers are available for error response
         oauth_providers = {
             "google": is_oauth_provider_enabled("google"),
@@ -251,8 +326,8 @@ async def register(
 
 
 @app.get("/login", response_class=HTMLResponse)
-def login_form(request: Request):
-    user = get_current_user(request)
+async def login_form(request: Request, db: AsyncSession = Depends(get_db)):
+    user = await get_current_user(request, db)
     if user:
         return RedirectResponse("/", status_code=302)
 
@@ -275,18 +350,19 @@ def login_form(request: Request):
 
 
 @app.post("/login", response_class=HTMLResponse)
-async def login(request: Request, username: str = Form(...), password: str = Form(...)):
-    db = SessionLocal()
-    user = (
-        db.query(User)
-        .filter((User.username == username) | (User.email == username))
-        .first()
+async def login(
+    request: Request,
+    username: str = Form(...),
+    password: str = Form(...),
+    db: AsyncSession = Depends(get_db),
+):
+    user = await db.scalar(
+        select(User).where((User.username == username) | (User.email == username))
     )
-    db.close()
     if (
         not user
         or not user.password_hash
-        or not bcrypt.verify(password, user.password_hash)
+        or not await verify_password(password, user.password_hash)
     ):
         oauth_providers = {
             "google": is_oauth_provider_enabled("google"),
@@ -321,7 +397,9 @@ async def oauth_login(request: Request, provider: str):
 
 
 @app.get("/auth/callback/{provider}")
-async def oauth_callback(request: Request, provider: str):
+async def oauth_callback(
+    request: Request, provider: str, db: AsyncSession = Depends(get_db)
+):
     if provider not in ("google", "github"):
         return RedirectResponse("/login")
 
@@ -349,15 +427,14 @@ async def oauth_callback(request: Request, provider: str):
         oauth_id = str(profile.get("id"))
     else:
         return RedirectResponse("/login")
-    db = SessionLocal()
-    user = (
-        db.query(User)
-        .filter((User.oauth_provider == provider) & (User.oauth_id == oauth_id))
-        .first()
+    user = await db.scalar(
+        select(User).where(
+            (User.oauth_provider == provider) & (User.oauth_id == oauth_id)
+        )
     )
     if not user:
         # If user with this email exists, link accounts
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if user:
             user.oauth_provider = provider
             user.oauth_id = oauth_id
@@ -369,61 +446,58 @@ async def oauth_callback(request: Request, provider: str):
                 oauth_id=oauth_id,
             )
             db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
     request.session["user_id"] = user.id
-    db.close()
     return RedirectResponse("/", status_code=302)
 
 
 @app.get("/", response_class=HTMLResponse)
-def read_form(request: Request):
+async def read_form(request: Request, db: AsyncSession = Depends(get_db)):
     return templates.TemplateResponse(
         request,
         "form.html",
-        get_assessment_template_context(request),
+        get_assessment_template_context(
+            criteria_registry.current, await get_current_user(request, db)
+        ),
     )
 
 
 @app.post("/submit")
-async def submit(request: Request):
+async def submit(request: Request, db: AsyncSession = Depends(get_db)):
+    index = criteria_registry.current
+    user = await get_current_user(request, db)
     form = await request.form()
     project_name = form.get("project_name")
     if not project_name:
         return templates.TemplateResponse(
             request,
             "form.html",
-            get_assessment_template_context(request, error="Project Name is required."),
+            get_assessment_template_context(
+                index, user, error="Project Name is required."
+            ),
         )
     project_url = form.get("project_url") or None
-    responses = []
     responses_dict = {}
     for k, v in form.items():
         if k in ("project_name", "project_url"):
             continue
-        answer = v == "yes"
-        responses.append(UserResponse(id=k, answer=answer))
-        responses_dict[k] = answer  # store as dict for database
+        responses_dict[k] = v == "yes"  # store as dict for database
 
-    user = get_current_user(request)
     user_id = user.id if user else None
+    evaluation = index.evaluate(responses_dict)
 
     # Save to database
-    db = SessionLocal()
     assessment = Assessment(
         project_name=project_name,
         project_url=project_url,
         user_id=user_id,
-        responses=responses_dict,
     )
+    assessment.set_responses(responses_dict)
+    assessment.apply_evaluation(evaluation)
     db.add(assessment)
-    db.commit()
-    db.close()
+    await db.commit()
 
-    score = calculate_score(criteria, responses)
-    level = score_to_level(score)
-    badge_url = get_badge_url(level)
-    category_scores = calculate_category_scores(criteria, responses)
+    badge_url = get_badge_url(evaluation.level)
     # Build per-criterion result: include answer and description for recommendations
     criteria_results = [
         {
@@ -433,21 +507,21 @@ async def submit(request: Request):
             "description": c.description,
             "answer": responses_dict.get(c.id, False),
         }
-        for c in criteria
+        for c in index.criteria
     ]
     return templates.TemplateResponse(
         request,
         "result.html",
         {
-            "score": score,
-            "level": level,
+            "score": evaluation.score,
+            "level": evaluation.level,
             "badge_url": badge_url,
             "project_name": project_name,
             "project_url": project_url,
             "user": user,
-            "category_scores": category_scores,
+            "category_scores": evaluation.category_scores,
             "criteria_results": criteria_results,
-            "categories": categories,
+            "categories": index.categories,
         },
     )
 
@@ -457,37 +531,153 @@ def get_badge():
     return FileResponse("src/web/static/badge.svg", media_type="image/svg+xml")
 
 
+# Keyset pagination for /assessments
+ASSESSMENTS_PAGE_SIZE = int(os.environ.get("ASSESSMENTS_PAGE_SIZE", "50"))
+MAX_ASSESSMENTS_PAGE_SIZE = 500
+ASSESSMENT_SORT_COLUMNS = {
+    "id": Assessment.id,
+    "project": Assessment.project_name,
+    "score": Assessment.score,
+}
+
+
+def _encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _response_rows(responses: Optional[dict], index: CriteriaIndex) -> list[dict]:
+    """Pair stored answers with the criteria of *index*, in criteria order.
+
+    Answers for ids that are not in the criteria set are appended at the
+    end without a title.
+    """
+    responses = responses or {}
+    rows = [
+        {"id": c.id, "criteria": c.criteria, "answer": responses[c.id]}
+        for c in index.criteria
+        if c.id in responses
+    ]
+    rows += [
+        {"id": key, "criteria": None, "answer": value}
+        for key, value in responses.items()
+        if key not in index
+    ]
+    return rows
+
+
 @app.get("/assessments", response_class=HTMLResponse)
-def list_assessments(request: Request):
-    user = get_current_user(request)
-    db = SessionLocal()
-    assessments = db.query(Assessment).all()
-    users = {u.id: u for u in db.query(User).all()}
-    db.close()
-    assessment_data = []
-    for a in assessments:
-        responses = [UserResponse(id=k, answer=v) for k, v in a.responses.items()]
-        point = calculate_score(criteria, responses)
-        level = score_to_level(point)
-        badge_url = get_badge_url(level)
-        assessment_data.append(
-            {
-                "id": a.id,
-                "project_name": getattr(a, "project_name", ""),
-                "project_url": getattr(a, "project_url", None),
-                "user": users.get(a.user_id),
-                "responses": a.responses,
-                "point": point,
-                "level": level,
-                "badge_url": badge_url,
-            }
+async def list_assessments(
+    request: Request,
+    level: Optional[str] = None,
+    project: Optional[str] = None,
+    owner: Optional[str] = None,
+    sort: str = "-id",
+    cursor: Optional[str] = None,
+    page_size: int = Query(ASSESSMENTS_PAGE_SIZE, ge=1, le=MAX_ASSESSMENTS_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """List saved assessments one page at a time.
+
+    Sorting (``id``, ``project`` or ``score``; prefix ``-`` for descending),
+    filtering and pagination all run in SQL. Pages are addressed by an
+    opaque keyset *cursor* holding the sort key of the last row shown, so
+    deep pages cost the same as the first one.
+    """
+    descending = sort.startswith("-")
+    sort_column = ASSESSMENT_SORT_COLUMNS.get(sort.lstrip("-"))
+    if sort_column is None:
+        raise HTTPException(status_code=400, detail="Invalid sort")
+    keys = (
+        [sort_column] if sort_column is Assessment.id else [sort_column, Assessment.id]
+    )
+
+    index = criteria_registry.current
+    user = await get_current_user(request, db)
+    # Answers are decoded from the bitmask, so skip loading the JSON column
+    query = select(Assessment).options(defer(Assessment.responses))
+    if level:
+        query = query.where(Assessment.level == level.upper())
+    if project:
+        query = query.where(
+            Assessment.project_name.startswith(project, autoescape=True)
         )
+    if owner:
+        owner_id = await db.scalar(
+            select(User.id).where((User.username == owner) | (User.email == owner))
+        )
+        query = query.where(Assessment.user_id == owner_id if owner_id else false())
+    if sort_column is Assessment.score:
+        # Rows saved before scores were persisted have no sort key yet
+        query = query.where(Assessment.score.isnot(None))
+    if cursor:
+        bound = _decode_cursor(cursor, len(keys))
+        row_key = tuple_(*keys) if len(keys) > 1 else keys[0]
+        value = tuple_(*bound) if len(keys) > 1 else bound[0]
+        query = query.where(row_key < value if descending else row_key > value)
+
+    query = query.order_by(*(k.desc() if descending else k.asc() for k in keys))
+    rows = (await db.scalars(query.limit(page_size + 1))).all()
+    has_more = len(rows) > page_size
+    assessments = rows[:page_size]
+    responses = await load_stored_responses(db, assessments)
+
+    user_ids = {a.user_id for a in assessments if a.user_id is not None}
+    users = (
+        {u.id: u for u in await db.scalars(select(User).where(User.id.in_(user_ids)))}
+        if user_ids
+        else {}
+    )
+
+    filters = {
+        "level": level or "",
+        "project": project or "",
+        "owner": owner or "",
+        "sort": sort,
+        "page_size": page_size,
+    }
+    params = {k: v for k, v in filters.items() if v}
+    next_url = None
+    if has_more:
+        last = assessments[-1]
+        next_cursor = _encode_cursor([getattr(last, k.key) for k in keys])
+        next_url = "/assessments?" + urlencode({**params, "cursor": next_cursor})
+
+    assessment_data = [
+        {
+            "id": a.id,
+            "project_name": getattr(a, "project_name", ""),
+            "project_url": getattr(a, "project_url", None),
+            "user": users.get(a.user_id),
+            "responses": _response_rows(
+                responses[a.id], criteria_registry.get(a.criteria_version) or index
+            ),
+            "point": a.score,
+            "level": a.level,
+            "badge_url": get_badge_url(a.level or "WIP"),
+        }
+        for a in assessments
+    ]
     return templates.TemplateResponse(
         request,
         "assessments.html",
         {
             "assessments": assessment_data,
-            "criteria_list": criteria,
             "user": user,
+            "filters": filters,
+            "is_first_page": not cursor,
+            "first_url": "/assessments?" + urlencode(params),
+            "next_url": next_url,
         },
     )
@@ -0,0 +1,56 @@
+import os
+import time
+
+import pytest
+
+from src.cli.ai_cache import AiResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AiResponseCache(tmp_path / "ai")
+
+
+def test_key_covers_model_temperature_and_prompt():
+    key = AiResponseCache.key("gpt-4o", 0.1, "prompt")
+    assert key == AiResponseCache.key("gpt-4o", 0.1, "prompt")
+    assert key != AiResponseCache.key("gpt-4o-mini", 0.1, "prompt")
+    assert key != AiResponseCache.key("gpt-4o", 0.2, "prompt")
+    assert key != AiResponseCache.key("gpt-4o", 0.1, "prompt ")
+
+
+def test_stored_response_returned(cache):
+    key = AiResponseCache.key("gpt-4o", 0.1, "prompt")
+    assert cache.get(key) is None
+    cache.put(key, '{"D101": true}', "gpt-4o")
+    assert cache.get(key) == '{"D101": true}'
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_expired_response_dropped(cache, monkeypatch):
+    cache.put("k", "old", "gpt-4o")
+    monkeypatch.setattr(time, "time", lambda: 1e12)
+    assert cache.get("k") is None
+    assert not (cache.directory / "k").exists()
+
+
+def test_refresh_skips_lookup_but_stores(cache):
+    cache.put("k", "old", "gpt-4o")
+    cache.refresh = True
+    assert cache.get("k") is None
+    cache.put("k", "new", "gpt-4o")
+    cache.refresh = False
+    assert cache.get("k") == "new"
+
+
+def test_discard_and_size_limit(cache):
+    cache.put("a", "x" * 100, "gpt-4o")
+    # Room for two entries; the header timestamp varies in length
+    cache.max_bytes = int(2.5 * (cache.directory / "a").stat().st_size)
+    os.utime(cache.directory / "a", (1, 1))
+    cache.put("b", "x" * 100, "gpt-4o")
+    os.utime(cache.directory / "b", (2, 2))
+    cache.put("c", "x" * 100, "gpt-4o")
+    assert sorted(p.name for p in cache.directory.iterdir()) == ["b", "c"]
+    cache.discard("b")
+    assert cache.get("b") is None
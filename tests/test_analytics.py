@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.core.analytics import criterion_pass_rates, failing_projects
+from src.core.model import Assessment, AssessmentResponse, Base
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _add(db, project, responses, created_at=None):
+    assessment = Assessment(project_name=project, created_at=created_at)
+    assessment.set_responses(responses)
+    db.add(assessment)
+    db.commit()
+    return assessment
+
+
+def test_set_responses_writes_normalized_rows(db):
+    assessment = _add(db, "alpha", {"D101": True, "D102": False})
+    rows = db.query(AssessmentResponse).order_by(AssessmentResponse.criterion_id)
+    assert [(r.assessment_id, r.criterion_id, r.answer) for r in rows] == [
+        (assessment.id, "D101", True),
+        (assessment.id, "D102", False),
+    ]
+    assert assessment.responses == {"D101": True, "D102": False}
+
+
+def test_set_responses_replaces_previous_answers(db):
+    assessment = _add(db, "alpha", {"D101": True, "D102": False})
+    assessment.set_responses({"D101": False})
+    db.commit()
+    rows = db.query(AssessmentResponse).all()
+    assert [(r.criterion_id, r.answer) for r in rows] == [("D101", False)]
+
+
+def test_set_mask_drops_the_json_copy(db):
+    assessment = _add(db, "alpha", {"D101": True, "D102": False})
+    assessment.set_mask(0b01, "v1")
+    partial = _add(db, "beta", {"D101": True})
+    partial.set_mask(None, "v1")
+    db.commit()
+    db.expire_all()
+
+    rows = db.execute(text("SELECT project_name, responses FROM assessments"))
+    stored = dict(rows.all())
+    assert stored["alpha"] is None
+    assert stored["beta"] is not None
+    assert assessment.saved_responses() == {"D101": True, "D102": False}
+    assert partial.saved_responses() == {"D101": True}
+
+
+def test_criterion_pass_rates(db):
+    _add(db, "alpha", {"D101": True, "D102": False})
+    _add(db, "beta", {"D101": True, "D102": True})
+    _add(db, "gamma", {"D101": False})
+    rates = criterion_pass_rates(db)
+    assert (rates["D101"].passed, rates["D101"].total) == (2, 3)
+    assert rates["D102"].rate == 50.0
+
+
+def test_criterion_pass_rates_by_period(db):
+    now = datetime(2026, 7, 15)
+    _add(db, "old", {"D101": False}, created_at=now - timedelta(days=200))
+    _add(db, "new", {"D101": True}, created_at=now)
+    rates = criterion_pass_rates(db, since=datetime(2026, 7, 1))
+    assert (rates["D101"].passed, rates["D101"].total) == (1, 1)
+    assert criterion_pass_rates(db, until=datetime(2026, 1, 1))["D101"].rate == 0.0
+
+
+def test_failing_projects_uses_latest_assessment(db):
+    _add(db, "alpha", {"D101": False})
+    _add(db, "alpha", {"D101": True})
+    _add(db, "beta", {"D101": False})
+    _add(db, "gamma", {"D101": True})
+    assert failing_projects(db, "D101") == ["beta"]
+    assert failing_projects(db, "D101", latest_only=False) == ["alpha", "beta"]
@@ -6,16 +6,21 @@ These tests cover:
 - CLI: --auto flag validation (mocked network calls)
 """
 
+import asyncio
 import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 from typer.testing import CliRunner
 
+from src.cli.ai_cache import AiResponseCache
 from src.cli.ai_client import (
     DEFAULT_MODELS,
     build_assessment_prompt,
+    build_budgeted_prompt,
     call_ai,
+    call_ai_async,
+    estimate_tokens,
     parse_ai_response,
 )
 from src.cli.repo_fetcher import (
@@ -202,6 +207,64 @@ def test_build_assessment_prompt_empty_context(sample_criteria):
     assert "D101" in prompt
 
 
+def test_estimate_tokens_counts_words_digits_and_punctuation():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hello, world 12345") == 5
+    assert estimate_tokens("jobs:\n  build:") == 5
+
+
+@pytest.fixture()
+def large_repo_context(sample_repo_context):
+    return {
+        **sample_repo_context,
+        "files": [f"services/api/src/module_{i}.py" for i in range(150)],
+        "readme": "Deploy with helm and run the smoke tests. " * 200,
+        "ci_files": [
+            {"path": ".github/workflows/ci.yml", "content": "steps: [lint]\n" * 150},
+            {"path": "Dockerfile", "content": "RUN make test\n" * 150},
+            {"path": "Makefile", "content": "test:\n\tpytest\n"},
+        ],
+    }
+
+
+def test_build_budgeted_prompt_fits_budget_by_priority(
+    sample_criteria, large_repo_context
+):
+    prompt = build_budgeted_prompt(sample_criteria, large_repo_context, 2000)
+    assert prompt.budget == 2000
+    assert prompt.tokens == estimate_tokens(prompt.text)
+    assert 1900 < prompt.tokens <= 2000
+    # The top-ranked CI file is kept whole, the next one cut, the rest dropped
+    assert prompt.text.count("steps: [lint]") == 150
+    assert 0 < prompt.text.count("RUN make test") < 150
+    assert "### Makefile" not in prompt.text
+    assert "File Tree (" in prompt.text and " of 150 files)" in prompt.text
+    sections = prompt.section_tokens
+    assert sections["ci_files"] > sections["files"] > sections["readme"] > 0
+    for c in sample_criteria:
+        assert c.id in prompt.text
+
+
+def test_build_budgeted_prompt_keeps_everything_that_fits(
+    sample_criteria, sample_repo_context, monkeypatch
+):
+    monkeypatch.setenv("AI_PROMPT_TOKENS", "100000")
+    prompt = build_budgeted_prompt(sample_criteria, sample_repo_context)
+    assert prompt.budget == 100000
+    assert "File Tree (4 of 4 files)" in prompt.text
+    assert sample_repo_context["readme"] in prompt.text
+    assert "ubuntu-latest" in prompt.text
+
+
+def test_build_budgeted_prompt_uses_given_tokenizer(
+    sample_criteria, large_repo_context
+):
+    prompt = build_budgeted_prompt(
+        sample_criteria, large_repo_context, 6000, tokenizer=len
+    )
+    assert prompt.tokens == len(prompt.text) <= 6000
+
+
 # ── ai_client: parse_ai_response ──────────────────────────────────────────────
 
 
@@ -280,7 +343,7 @@ def _make_litellm_response(content: str) -> MagicMock:
 def test_call_ai_openai_invokes_litellm(sample_criteria, sample_repo_context):
     content = json.dumps({"D101": True, "D201": False, "D301": True})
     with patch(
-        "src.cli.ai_client.litellm.completion",
+        "src.cli.ai_client.litellm.acompletion",
         return_value=_make_litellm_response(content),
     ) as mock_llm:
         result = call_ai("openai", "gpt-4o", "test prompt", api_key="sk-test")
@@ -301,7 +364,7 @@ def test_call_ai_missing_key_raises():
 def test_call_ai_ollama_no_key_required():
     content = json.dumps({"D101": True})
     with patch(
-        "src.cli.ai_client.litellm.completion",
+        "src.cli.ai_client.litellm.acompletion",
         return_value=_make_litellm_response(content),
     ):
         result = call_ai("ollama", "ollama/llama3", "test prompt")
@@ -311,7 +374,7 @@ def test_call_ai_ollama_no_key_required():
 def test_call_ai_gemini_adds_prefix():
     content = json.dumps({"D101": True})
     with patch(
-        "src.cli.ai_client.litellm.completion",
+        "src.cli.ai_client.litellm.acompletion",
         return_value=_make_litellm_response(content),
     ) as mock_llm:
         call_ai("gemini", "gemini-1.5-flash", "test prompt", api_key="gkey")
@@ -319,13 +382,86 @@ def test_call_ai_gemini_adds_prefix():
     assert called_model == "gemini/gemini-1.5-flash"
 
 
+def test_call_ai_reuses_cached_response(tmp_path):
+    cache = AiResponseCache(tmp_path)
+    content = json.dumps({"D101": True})
+    with patch(
+        "src.cli.ai_client.litellm.acompletion",
+        return_value=_make_litellm_response(content),
+    ) as mock_llm:
+        first = call_ai("gemini", "gemini-1.5-flash", "p", api_key="k", cache=cache)
+        second = call_ai(
+            "gemini", "gemini/gemini-1.5-flash", "p", api_key="k", cache=cache
+        )
+        call_ai("gemini", "gemini-1.5-flash", "other prompt", api_key="k", cache=cache)
+    assert first == second == content
+    assert mock_llm.call_count == 2
+    assert cache.stats.hits == 1
+
+
+def fake_acompletion(delay: float, in_flight: dict):
+    """Stand-in for litellm.acompletion recording the peak requests per model."""
+
+    async def acompletion(model, **kwargs):
+        now = in_flight.setdefault(model, [0, 0])
+        now[0] += 1
+        now[1] = max(now[1], now[0])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            now[0] -= 1
+        return _make_litellm_response(json.dumps({"timeout": kwargs["timeout"]}))
+
+    return acompletion
+
+
+def test_call_ai_async_limits_requests_per_provider(monkeypatch):
+    monkeypatch.setenv("AI_CONCURRENCY", "2")
+    in_flight = {}
+
+    async def main():
+        calls = [call_ai_async("openai", "gpt-4o", f"p{i}", "k") for i in range(6)]
+        calls += [call_ai_async("ollama", "llama3", f"p{i}") for i in range(6)]
+        return await asyncio.gather(*calls)
+
+    with patch(
+        "src.cli.ai_client.litellm.acompletion", new=fake_acompletion(0.02, in_flight)
+    ):
+        results = asyncio.run(main())
+    assert len(results) == 12
+    assert json.loads(results[0]) == {"timeout": 120.0}
+    assert {model: peak for model, (_, peak) in in_flight.items()} == {
+        "gpt-4o": 2,
+        "ollama/llama3": 2,
+    }
+
+
+def test_call_ai_async_timeout_and_cancel_free_the_slot(monkeypatch):
+    monkeypatch.setenv("AI_CONCURRENCY", "1")
+
+    async def main():
+        with pytest.raises(TimeoutError, match="within 0.05 seconds"):
+            await call_ai_async("ollama", "llama3", "slow", timeout=0.05)
+        task = asyncio.ensure_future(call_ai_async("ollama", "llama3", "cancelled"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await asyncio.wait_for(
+            call_ai_async("ollama", "llama3", "next", timeout=5), 1
+        )
+
+    with patch("src.cli.ai_client.litellm.acompletion", new=fake_acompletion(0.5, {})):
+        assert json.loads(asyncio.run(main())) == {"timeout": 5}
+
+
 # ── CLI: --auto validation ─────────────────────────────────────────────────────
 
 
 def test_assess_auto_requires_ai_flag():
     """--auto without --ai should exit with an error."""
     with patch(
-        "src.cli.main.detect_remote_url", return_value="https://github.com/a/b.git"
+        "cli.repo_fetcher.detect_remote_url", return_value="https://github.com/a/b.git"
     ):
         result = runner.invoke(app, ["assess", "--auto"])
     assert result.exit_code != 0
@@ -334,7 +470,7 @@ def test_assess_auto_requires_ai_flag():
 
 def test_assess_auto_invalid_ai_provider():
     with patch(
-        "src.cli.main.detect_remote_url", return_value="https://github.com/a/b.git"
+        "cli.repo_fetcher.detect_remote_url", return_value="https://github.com/a/b.git"
     ):
         result = runner.invoke(
             app,
@@ -346,7 +482,7 @@ def test_assess_auto_invalid_ai_provider():
 
 def test_assess_auto_invalid_repo_provider():
     with patch(
-        "src.cli.main.detect_remote_url", return_value="https://github.com/a/b.git"
+        "cli.repo_fetcher.detect_remote_url", return_value="https://github.com/a/b.git"
     ):
         result = runner.invoke(
             app,
@@ -369,7 +505,7 @@ def test_assess_auto_missing_api_key_no_env(monkeypatch):
     """When no key is passed and no env var is set, should exit with error."""
     monkeypatch.delenv("OPENAI_API_KEY", raising=False)
     with patch(
-        "src.cli.main.detect_remote_url", return_value="https://github.com/a/b.git"
+        "cli.repo_fetcher.detect_remote_url", return_value="https://github.com/a/b.git"
     ):
         result = runner.invoke(app, ["assess", "--auto", "--ai", "openai"])
     assert result.exit_code != 0
@@ -378,7 +514,7 @@ def test_assess_auto_missing_api_key_no_env(monkeypatch):
 
 def test_assess_auto_no_remote_url_no_provider(monkeypatch):
     """If git remote is not detected and --provider is absent, should exit with error."""
-    with patch("src.cli.main.detect_remote_url", return_value=None):
+    with patch("cli.repo_fetcher.detect_remote_url", return_value=None):
         result = runner.invoke(
             app, ["assess", "--auto", "--ai", "ollama", "--provider", ""]
         )
@@ -405,11 +541,11 @@ def test_assess_auto_success_mocked(monkeypatch):
 
     with (
         patch(
-            "src.cli.main.detect_remote_url",
+            "cli.repo_fetcher.detect_remote_url",
             return_value="https://github.com/acme/myapp.git",
         ),
-        patch("src.cli.main.fetch_repo_context", return_value=fake_context),
-        patch("src.cli.main.call_ai", return_value=json.dumps(ai_json)),
+        patch("cli.repo_fetcher.fetch_repo_context", return_value=fake_context),
+        patch("cli.ai_client.call_ai", return_value=json.dumps(ai_json)),
     ):
         result = runner.invoke(
             app,
@@ -426,3 +562,120 @@ def test_assess_auto_success_mocked(monkeypatch):
     assert result.exit_code == 0, result.output
     assert "score" in result.output.lower()
     assert "Keep up the great work!" in result.output
+
+
+def test_assess_auto_cache_flags(tmp_path, monkeypatch):
+    """--no-cache fetches without a cache; --verbose reports cache hit rates;
+    --snapshot is passed through to the fetcher."""
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path))
+    fake_context = {"files": [], "ci_files": []}
+    args = ["assess", "--auto", "--ai", "openai", "--ai-key", "sk-test"]
+
+    with (
+        patch(
+            "cli.repo_fetcher.detect_remote_url",
+            return_value="https://github.com/acme/myapp.git",
+        ),
+        patch(
+            "cli.repo_fetcher.fetch_repo_context", return_value=fake_context
+        ) as mock_fetch,
+        patch("cli.ai_client.call_ai", return_value=json.dumps({})),
+    ):
+        verbose = runner.invoke(app, [*args, "--verbose"])
+        cache = mock_fetch.call_args.kwargs["cache"]
+        no_cache = runner.invoke(app, [*args, "--no-cache", "--snapshot"])
+
+    assert verbose.exit_code == 0, verbose.output
+    assert cache is not None
+    assert "HTTP cache: 0/0" in verbose.output
+    assert no_cache.exit_code == 0, no_cache.output
+    assert mock_fetch.call_args.kwargs["cache"] is None
+    assert mock_fetch.call_args.kwargs["snapshot"] is True
+
+
+def test_assess_auto_ai_cache_flags(tmp_path, monkeypatch):
+    """Unchanged prompts reuse the cached AI response unless told otherwise."""
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path))
+    fake_context = {"files": [], "ci_files": []}
+    args = ["assess", "--auto", "--ai", "openai", "--ai-key", "sk-test"]
+    args += ["--format", "json"]
+    content = json.dumps({"suggestions": ["Add CI"]})
+
+    with (
+        patch(
+            "cli.repo_fetcher.detect_remote_url",
+            return_value="https://github.com/acme/myapp.git",
+        ),
+        patch("cli.repo_fetcher.fetch_repo_context", return_value=fake_context),
+        patch(
+            "cli.ai_client.litellm.acompletion",
+            return_value=_make_litellm_response(content),
+        ) as mock_llm,
+    ):
+        outputs = [
+            runner.invoke(app, [*args, *flags]).output
+            for flags in ([], [], ["--refresh-ai-cache"], ["--no-ai-cache"], [])
+        ]
+
+    assert mock_llm.call_count == 3
+    hits = ['"ai_cache_hit": true' in output for output in outputs]
+    assert hits == [False, True, False, False, True]
+    assert all("Add CI" in output for output in outputs)
+    assert all('"prompt_tokens": ' in output for output in outputs)
+
+
+def test_assess_auto_sends_only_unsettled_criteria(tmp_path, monkeypatch):
+    """Criteria proven by repository evidence are not asked of the model."""
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path))
+    fake_context = {
+        "files": ["poetry.lock"],
+        "ci_files": [{"path": ".github/workflows/ci.yml", "content": "on: [push]"}],
+    }
+    args = ["assess", "--auto", "--ai", "openai", "--ai-key", "sk-test"]
+    args += ["--no-ai-cache", "--format", "json"]
+
+    with (
+        patch(
+            "cli.repo_fetcher.detect_remote_url",
+            return_value="https://github.com/acme/myapp.git",
+        ),
+        patch("cli.repo_fetcher.fetch_repo_context", return_value=fake_context),
+        patch("cli.ai_client.call_ai", return_value=json.dumps({})) as mock_ai,
+    ):
+        result = runner.invoke(app, args)
+        prompt = mock_ai.call_args.kwargs["prompt"]
+        monkeypatch.setenv("AI_PREPASS", "0")
+        disabled = runner.invoke(app, args)
+        full_prompt = mock_ai.call_args.kwargs["prompt"]
+
+    assert result.exit_code == 0, result.output
+    assert '"D101": ".github/workflows/ci.yml runs on pushes' in result.output
+    assert '"D404": "poetry.lock is present"' in result.output
+    for cid in ("D101", "D402", "D404"):
+        assert f"- {cid}" not in prompt
+        assert f"- {cid}" in full_prompt
+    assert "- D201" in prompt
+    assert '"settled_by_evidence": {}' in disabled.output
+
+
+def test_assess_auto_skips_ai_when_everything_is_settled(monkeypatch):
+    from src.config.loader import load_criteria_config
+
+    _, real_criteria = load_criteria_config()
+    settled = {c.id: "evidence" for c in real_criteria}
+    with (
+        patch(
+            "cli.repo_fetcher.detect_remote_url",
+            return_value="https://github.com/acme/myapp.git",
+        ),
+        patch("cli.repo_fetcher.fetch_repo_context", return_value={}),
+        patch("cli.evidence.settle_criteria", return_value=settled),
+        patch("cli.ai_client.call_ai") as mock_ai,
+    ):
+        result = runner.invoke(
+            app, ["assess", "--auto", "--ai", "openai", "--ai-key", "sk-test"]
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "no AI request needed" in result.output
+    mock_ai.assert_not_called()
@@ -0,0 +1,226 @@
+"""Tests for ``dm assess-batch`` and its pipeline."""
+
+import asyncio
+import io
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from src.cli.batch import (
+    BatchTarget,
+    completed_keys,
+    open_results,
+    read_targets,
+    run_batch,
+)
+from src.cli.main import app
+
+runner = CliRunner()
+
+
+def test_read_targets_accepts_urls_and_names():
+    targets = read_targets(
+        [
+            "# platform team",
+            "https://github.com/acme/app.git",
+            "",
+            "git@github.com:acme/app.git",
+            "acme/platform/deploy",
+        ],
+        provider="gitlab",
+    )
+    assert [t.key for t in targets] == [
+        "github:acme/app",
+        "gitlab:acme/platform/deploy",
+    ]
+    assert targets[0].project_url == "https://github.com/acme/app.git"
+    assert targets[1].project_url == "https://gitlab.com/acme/platform/deploy"
+
+
+def test_read_targets_needs_provider_for_names():
+    with pytest.raises(ValueError, match="--provider"):
+        read_targets(["acme/app"])
+
+
+def test_resume_skips_assessed_and_ends_partial_line(tmp_path):
+    path = tmp_path / "results.ndjson"
+    path.write_text(
+        '{"repo": "github:acme/a", "score": 50}\n'
+        '{"repo": "github:acme/b", "error": "timeout"}\n'
+        '{"repo": "github:acme/c", "sco'
+    )
+    assert completed_keys(path) == {"github:acme/a"}
+    with open_results(path) as out:
+        out.write('{"repo": "github:acme/c"}\n')
+    assert completed_keys(path) == {"github:acme/a", "github:acme/c"}
+    assert completed_keys(tmp_path / "missing.ndjson") == set()
+
+
+def test_run_batch_limits_each_stage():
+    peaks = {"fetch": 0, "ai": 0}
+    now = {"fetch": 0, "ai": 0}
+
+    async def stage(name):
+        now[name] += 1
+        peaks[name] = max(peaks[name], now[name])
+        await asyncio.sleep(0.01)
+        now[name] -= 1
+
+    async def fetch(target):
+        await stage("fetch")
+        if target.repo == "broken":
+            raise RuntimeError("not found")
+        return {"repo": target.repo}
+
+    async def assess(target, context, ai_slot):
+        async with ai_slot:
+            await stage("ai")
+        return {"score": 100.0, "context": context["repo"]}
+
+    targets = [BatchTarget("github", "acme", f"r{i}") for i in range(10)]
+    targets.insert(3, BatchTarget("github", "acme", "broken"))
+    out = io.StringIO()
+    summary = asyncio.run(run_batch(targets, fetch, assess, out, 3, 2))
+
+    assert (summary.assessed, summary.failed) == (10, 1)
+    assert peaks == {"fetch": 3, "ai": 2}
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(records) == 11
+    assert {"repo": "github:acme/r0", "score": 100.0, "context": "r0"} in records
+    assert {
+        "repo": "github:acme/broken",
+        "project_url": "https://github.com/acme/broken",
+        "error": "not found",
+    } in records
+
+
+def test_run_batch_saves_after_writing_the_record(tmp_path):
+    out = io.StringIO()
+    written = []
+
+    async def fetch(target):
+        return {}
+
+    async def assess(target, context, ai_slot):
+        return {"score": 100.0}
+
+    async def save(target):
+        written.append(target.key in out.getvalue())
+        if target.repo == "b":
+            raise RuntimeError("database is locked")
+
+    targets = [BatchTarget("github", "acme", "a"), BatchTarget("github", "acme", "b")]
+    summary = asyncio.run(run_batch(targets, fetch, assess, out, 1, 1, save=save))
+
+    assert written == [True, True]
+    assert (summary.assessed, summary.failed) == (1, 1)
+    path = tmp_path / "results.ndjson"
+    path.write_text(out.getvalue())
+    assert json.loads(path.read_text().splitlines()[-1])["error"] == (
+        "database is locked"
+    )
+    # The error record cancels the result written before the failed save
+    assert completed_keys(path) == {"github:acme/a"}
+
+
+def test_assess_batch_resumes_failed_repositories(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path))
+    repos = tmp_path / "repos.txt"
+    repos.write_text("acme/app\nacme/api\n")
+    output = tmp_path / "results.ndjson"
+    args = ["assess-batch", str(repos), "--provider", "github", "-o", str(output)]
+    args += ["--ai", "openai", "--ai-key", "sk-test", "--no-ai-cache"]
+
+    async def fetch(provider, owner, repo, *args, **kwargs):
+        if repo == "api" and fetch.fail:
+            raise RuntimeError("rate limited")
+        return {"owner": owner, "repo": repo, "files": [], "ci_files": []}
+
+    fetch.fail = True
+    with (
+        patch("cli.repo_fetcher.fetch_repo_context_async", side_effect=fetch),
+        patch(
+            "cli.ai_client.call_ai_async", return_value=json.dumps({"D101": True})
+        ) as mock_ai,
+    ):
+        first = runner.invoke(app, args)
+        fetch.fail = False
+        second = runner.invoke(app, args)
+        third = runner.invoke(app, args)
+
+    assert first.exit_code == 1
+    assert "rate limited" in first.output
+    assert second.exit_code == 0, second.output
+    assert "1 already assessed" in second.output
+    assert "2 already assessed" in third.output
+    assert mock_ai.call_count == 2
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    failed, app_record, api_record = sorted(
+        records, key=lambda r: ("score" in r, r["repo"] != "github:acme/app")
+    )
+    assert failed["repo"] == "github:acme/api" and "error" in failed
+    assert app_record["project_name"] == "app"
+    assert app_record["project_url"] == "https://github.com/acme/app"
+    assert api_record["repo"] == "github:acme/api" and records[-1] == api_record
+
+
+def test_assess_batch_lists_organisation(tmp_path):
+    output = tmp_path / "results.ndjson"
+    with (
+        patch(
+            "cli.repo_fetcher.list_org_repos_async",
+            new=AsyncMock(return_value=[("acme", "app")]),
+        ) as mock_list,
+        patch(
+            "cli.repo_fetcher.fetch_repo_context_async",
+            new=AsyncMock(return_value={"files": [], "ci_files": []}),
+        ),
+        patch("cli.ai_client.call_ai_async", return_value="{}"),
+    ):
+        result = runner.invoke(
+            app,
+            ["assess-batch", "--org", "acme", "--provider", "github"]
+            + ["--ai", "ollama", "--no-ai-cache", "-o", str(output)],
+        )
+    assert result.exit_code == 0, result.output
+    assert mock_list.await_args.args[:2] == ("github", "acme")
+    assert json.loads(output.read_text())["repo"] == "github:acme/app"
+
+
+def test_assess_batch_requires_repositories():
+    result = runner.invoke(app, ["assess-batch", "--ai", "ollama"])
+    assert result.exit_code == 1
+    assert "--org" in result.output
+
+
+def test_assess_batch_skips_ai_for_settled_repositories(tmp_path):
+    from src.config.loader import load_criteria_config
+
+    _, criteria = load_criteria_config()
+    repos = tmp_path / "repos.txt"
+    repos.write_text("acme/app\n")
+    output = tmp_path / "results.ndjson"
+    with (
+        patch(
+            "cli.repo_fetcher.fetch_repo_context_async",
+            new=AsyncMock(return_value={"files": [], "ci_files": []}),
+        ),
+        patch(
+            "cli.evidence.settle_criteria",
+            return_value={c.id: "evidence" for c in criteria},
+        ),
+        patch("cli.ai_client.call_ai_async") as mock_ai,
+    ):
+        result = runner.invoke(
+            app,
+            ["assess-batch", str(repos), "--provider", "github"]
+            + ["--ai", "ollama", "--no-ai-cache", "-o", str(output)],
+        )
+    assert result.exit_code == 0, result.output
+    mock_ai.assert_not_called()
+    record = json.loads(output.read_text())
+    assert record["score"] == 100.0
+    assert record["prompt_tokens"] == 0
+    assert len(record["settled_by_evidence"]) == len(criteria)
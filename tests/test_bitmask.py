@@ -0,0 +1,83 @@
+from src.core.bitmask import MaskLayout, criteria_version
+from src.core.index import CriteriaIndex
+from src.core.model import Criteria, UserResponse
+from src.core.scorer import calculate_category_scores, calculate_score, score_batch
+
+
+def _make_criteria():
+    return [
+        Criteria(id="A1", category="Alpha", criteria="A1", weight=1.0),
+        Criteria(id="A2", category="Alpha", criteria="A2", weight=0.5),
+        Criteria(id="B1", category="Beta", criteria="B1", weight=1.0),
+        Criteria(id="B2", category="Beta", criteria="B2", weight=0.5),
+    ]
+
+
+def test_encode_decode_roundtrip():
+    layout = MaskLayout.compile(_make_criteria())
+    mask = layout.encode({"A1": True, "A2": False, "B2": True, "X9": True})
+    assert mask == 0b1001
+    assert layout.decode(mask) == {"A1": True, "A2": False, "B1": False, "B2": True}
+
+
+def test_user_response_conversion():
+    layout = MaskLayout.compile(_make_criteria())
+    responses = [UserResponse(id="A2", answer=True), UserResponse(id="B1", answer=True)]
+    mask = layout.from_user_responses(responses)
+    assert [r.id for r in layout.to_user_responses(mask) if r.answer] == ["A2", "B1"]
+
+
+def test_mask_scoring_matches_scorer():
+    criteria = _make_criteria()
+    layout = MaskLayout.compile(criteria)
+    for mask in range(1 << len(criteria)):
+        responses = layout.to_user_responses(mask)
+        assert layout.score(mask) == calculate_score(criteria, responses)
+        assert layout.category_scores(mask) == calculate_category_scores(
+            criteria, responses
+        )
+
+
+def test_encode_exact_requires_one_answer_per_criterion():
+    layout = MaskLayout.compile(_make_criteria())
+    answers = {"A1": True, "A2": False, "B1": False, "B2": True}
+    assert layout.encode_exact(answers) == 0b1001
+    assert layout.encode_exact({"A1": True, "B2": True}) is None
+    assert layout.encode_exact({**answers, "X9": True}) is None
+
+
+def test_to_matrix_feeds_batch_scorer():
+    criteria = _make_criteria()
+    index = CriteriaIndex.compile(["Alpha", "Beta"], criteria)
+    masks = [0, 0b0101, 0b1111]
+    batch = score_batch(index.weights, index.layout.to_matrix(masks))
+    assert list(batch.scores) == [
+        calculate_score(criteria, index.layout.to_user_responses(m)) for m in masks
+    ]
+    assert batch.category_scores.tolist() == [
+        list(
+            calculate_category_scores(
+                criteria, index.layout.to_user_responses(m)
+            ).values()
+        )
+        for m in masks
+    ]
+
+
+def test_criteria_version_tracks_weights_and_order():
+    criteria = _make_criteria()
+    version = criteria_version(criteria)
+    assert version == criteria_version(list(criteria))
+    assert version != criteria_version(criteria[::-1])
+    changed = [c.model_copy(update={"weight": 2.0}) for c in criteria]
+    assert version != criteria_version(changed)
+
+
+def test_evaluate_returns_mask_and_version():
+    index = CriteriaIndex.compile(["Alpha", "Beta"], _make_criteria())
+    answers = {"A1": True, "A2": False, "B1": True, "B2": False}
+    evaluation = index.evaluate(answers)
+    assert evaluation.mask == index.layout.encode(answers)
+    assert evaluation.criteria_version == index.version
+    # A mask of partial answers would read the missing ones back as "no"
+    assert index.evaluate({"A1": True, "B1": True}).mask is None
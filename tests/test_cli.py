@@ -5,6 +5,7 @@ import yaml
 from typer.testing import CliRunner
 
 from src.cli.main import app
+from src.core.model import Assessment, SessionLocal
 
 runner = CliRunner()
 
@@ -64,3 +65,23 @@ def test_config_no_file_and_no_default(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
     result = runner.invoke(app, ["config"])
     assert result.exit_code == 1
+
+
+def test_backfill_scores_rows_without_stored_scores():
+    db = SessionLocal()
+    assessment = Assessment(project_name="legacy", responses={"D101": True})
+    db.add(assessment)
+    db.commit()
+    assessment_id = assessment.id
+    db.close()
+
+    result = runner.invoke(app, ["backfill"])
+    assert result.exit_code == 0
+    assert "Stored scores and responses" in result.output
+
+    db = SessionLocal()
+    assessment = db.get(Assessment, assessment_id)
+    db.close()
+    assert assessment.score > 0
+    assert assessment.level == "WIP"
+    assert assessment.category_scores["Basics"] > 0
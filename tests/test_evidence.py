@@ -0,0 +1,207 @@
+import pytest
+
+from src.cli.evidence import merge_responses, settle_criteria
+from src.config.loader import load_criteria_config
+from src.core.model import UserResponse
+
+
+@pytest.fixture(scope="module")
+def criteria():
+    _, criteria = load_criteria_config()
+    return criteria
+
+
+def _ci(path, content):
+    return {"files": [], "ci_files": [{"path": path, "content": content}]}
+
+
+@pytest.mark.parametrize(
+    "workflow,expected",
+    [
+        ("on: [push]\n", {"D101"}),
+        ("on:\n  push:\n    branches: ['**']\n", {"D101"}),
+        ("on:\n  push:\n    branches: [main]\n", set()),
+        ("on:\n  push:\n    tags: ['v*']\n", set()),
+        ("on: [push, pull_request]\n", {"D101", "D102"}),
+        ("on:\n  pull_request:\n    branches: [main]\n", {"D102"}),
+        ("on: workflow_dispatch\n", set()),
+    ],
+)
+def test_github_triggers(criteria, workflow, expected):
+    settled = settle_criteria(criteria, _ci(".github/workflows/ci.yml", workflow))
+    assert {"D101", "D102"} & settled.keys() == expected
+
+
+def test_github_runners(criteria):
+    hosted = "on: [push]\njobs:\n  test:\n    runs-on: ubuntu-latest\n"
+    own = "on: [push]\njobs:\n  test:\n    runs-on: [self-hosted, linux]\n"
+    contained = own + "    container: python:3.12\n"
+
+    assert "D103" in settle_criteria(criteria, _ci(".github/workflows/a.yml", hosted))
+    assert "D103" not in settle_criteria(criteria, _ci(".github/workflows/a.yml", own))
+    assert "D103" in settle_criteria(
+        criteria, _ci(".github/workflows/a.yml", contained)
+    )
+
+
+def test_gitlab_and_bitbucket_pipelines(criteria):
+    gitlab = "image: python:3.12\ntest:\n  script:\n    - pytest\n"
+    gated = "test:\n  script: [make]\n  only: [main]\n"
+    bitbucket = "pipelines:\n  default:\n    - step:\n        script: [make]\n"
+    bitbucket += (
+        "  pull-requests:\n    '**':\n      - step:\n          script: [make]\n"
+    )
+
+    assert {"D101", "D103", "D201"} <= settle_criteria(
+        criteria, _ci(".gitlab-ci.yml", gitlab)
+    ).keys()
+    assert (
+        not {"D101", "D103"}
+        & settle_criteria(criteria, _ci(".gitlab-ci.yml", gated)).keys()
+    )
+    assert {"D101", "D102", "D103"} <= settle_criteria(
+        criteria, _ci("bitbucket-pipelines.yml", bitbucket)
+    ).keys()
+
+
+def test_tools_used_in_ci_files(criteria):
+    workflow = (
+        "on: [pull_request]\n"
+        "jobs:\n"
+        "  check:\n"
+        "    runs-on: [self-hosted]\n"
+        "    steps:\n"
+        "      - run: ruff check .  # lint first\n"
+        "      - run: pytest --cov\n"
+        "      - uses: github/codeql-action/analyze@v3\n"
+        "      # - run: trivy fs .\n"
+    )
+    settled = settle_criteria(criteria, _ci(".github/workflows/ci.yml", workflow))
+
+    assert settled.keys() == {"D102", "D201", "D204", "D301", "D402", "D501", "D503"}
+    assert settled["D201"] == ".github/workflows/ci.yml uses pytest"
+    assert settled["D402"] == ".github/workflows/ci.yml is present"
+
+
+@pytest.mark.parametrize(
+    "path,content",
+    [
+        (
+            "SECURITY.md",
+            "We do not run fuzzing on this project and no SBOM is published.\n"
+            "Report via Slack.\n",
+        ),
+        ("Dockerfile", "# SPDX-License-Identifier: MIT\nFROM python:3.12\n"),
+        ("Makefile", "# TODO: add coverage and lint targets\ntest:\n\tpytest\n"),
+        (
+            ".github/workflows/ci.yml",
+            "on: [workflow_dispatch]\n"
+            "jobs:\n"
+            "  bench:\n"
+            "    runs-on: [self-hosted]\n"
+            "    steps:\n"
+            "      - name: Skip benchmark on forks\n"
+            "        run: echo skipped\n",
+        ),
+        (
+            ".github/workflows/ci.yml",
+            "on: [workflow_dispatch]\n"
+            "jobs:\n"
+            "  setup:\n"
+            "    runs-on: [self-hosted]\n"
+            "    steps:\n"
+            "      - run: pip install tox nox pytest ruff bandit\n"
+            "      - run: sudo apt-get install -y shellcheck && npm i -D eslint\n",
+        ),
+        (
+            ".gitlab-ci.yml",
+            "notes:\n"
+            "  script:\n"
+            '    - echo "TODO add integration tests and k6 later"\n'
+            "    - echo skipping coverage report\n"
+            "    - echo 'not yet; pytest --cov'\n"
+            "  only: [main]\n",
+        ),
+    ],
+)
+def test_prose_comments_and_mentions_settle_nothing(criteria, path, content):
+    assert settle_criteria(criteria, _ci(path, content)).keys() <= {"D402"}
+
+
+def test_tools_count_in_command_position(criteria):
+    workflow = (
+        "on: [workflow_dispatch]\n"
+        "jobs:\n"
+        "  check:\n"
+        "    runs-on: [self-hosted]\n"
+        "    steps:\n"
+        "      - run: |\n"
+        "          python -m pip install -U pip\n"
+        "          CI=1 python -m pytest --cov=src\n"
+        "          uv run ruff check . && ./vendor/bin/phpunit\n"
+    )
+    settled = settle_criteria(criteria, _ci(".github/workflows/ci.yml", workflow))
+
+    assert settled.keys() == {"D201", "D204", "D402", "D503"}
+    assert settled["D204"] == ".github/workflows/ci.yml uses pytest --cov"
+
+
+def test_jenkinsfile_shell_steps(criteria):
+    jenkinsfile = (
+        "pipeline {\n"
+        "  // sh 'trivy fs .'\n"
+        "  stages { stage('Fuzz') { steps {\n"
+        "    sh 'pytest --junitxml=report.xml  # TODO: coverage'\n"
+        "    junit 'report.xml'\n"
+        "  } } }\n"
+        "}\n"
+    )
+    settled = settle_criteria(criteria, _ci("Jenkinsfile", jenkinsfile))
+    assert settled.keys() == {"D201", "D402", "D602"}
+
+
+def test_files_and_readme(criteria):
+    context = {
+        "files": ["poetry.lock", ".github/dependabot.yml", "Dockerfile", "README.md"],
+        "ci_files": [],
+        "readme": "# App\n\n## Building from source\n\nRun make.",
+    }
+    settled = settle_criteria(criteria, context)
+
+    # A Dockerfile alone does not prove the builds run in one
+    assert settled.keys() == {"D301", "D401", "D404"}
+    assert settled["D404"] == "poetry.lock is present"
+    assert settled["D401"] == "README section 'building from source'"
+
+
+def test_contributing_guide_alone_is_no_build_documentation(criteria):
+    context = {
+        "files": ["CONTRIBUTING.md"],
+        "ci_files": [],
+        "readme": "## Contributing",
+    }
+    assert settle_criteria(criteria, context) == {}
+
+
+def test_truncated_workflow_is_still_read(criteria):
+    workflow = "on: [push]\njobs:\n  test:\n    runs-on: ubuntu-latest\n    steps: [{"
+    settled = settle_criteria(criteria, _ci(".github/workflows/ci.yml", workflow))
+    assert {"D101", "D103"} <= settled.keys()
+
+
+def test_settles_only_the_given_criteria(criteria):
+    wanted = [c for c in criteria if c.id == "D201"]
+    context = _ci(".github/workflows/ci.yml", "on: [push]\njobs: {t: {run: pytest}}")
+    assert settle_criteria(wanted, context).keys() == {"D201"}
+    assert settle_criteria(criteria, {}) == {}
+
+
+def test_merge_responses(criteria):
+    subset = criteria[:3]
+    ai = [UserResponse(id=subset[1].id, answer=True)]
+    merged = merge_responses(subset, {subset[0].id: "ci.yml is present"}, ai)
+    assert [(r.id, r.answer) for r in merged] == [
+        (subset[0].id, True),
+        (subset[1].id, True),
+        (subset[2].id, False),
+    ]
@@ -0,0 +1,207 @@
+import asyncio
+import base64
+
+import httpx
+import pytest
+
+from src.cli import repo_fetcher
+from src.cli.http_cache import HttpCache
+from src.cli.repo_fetcher import fetch_repo_context
+
+
+def etag_handler(calls, body=b'{"ok": true}', etag='"v1"'):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers={"ETag": etag}, content=body)
+
+    return handler
+
+
+def get(cache, handler, url="https://api.test/repo", headers=None):
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport, headers=headers) as client:
+            return await cache.get(client, url)
+
+    return asyncio.run(run())
+
+
+def stream(cache, handler, url="https://api.test/repo", stop_after=None):
+    """Read the body through ``cache.stream``, optionally stopping early."""
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with cache.stream(client, url) as body:
+                if body is None:
+                    return None
+                chunks = []
+                async for chunk in body:
+                    chunks.append(chunk)
+                    if len(chunks) == stop_after:
+                        await body.aclose()
+                        break
+                return b"".join(chunks)
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(tmp_path / "http")
+
+
+def test_revalidated_response_served_from_cache(cache):
+    calls = []
+    first = get(cache, etag_handler(calls))
+    second = get(cache, etag_handler(calls))
+
+    assert first.json() == second.json() == {"ok": True}
+    assert second.status_code == 200
+    assert "If-None-Match" not in calls[0].headers
+    assert calls[1].headers["If-None-Match"] == '"v1"'
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_changed_response_replaces_cached_copy(cache):
+    calls = []
+    get(cache, etag_handler(calls, body=b"old", etag='"v1"'))
+    response = get(cache, etag_handler(calls, body=b"new", etag='"v2"'))
+    assert response.text == "new"
+    assert get(cache, etag_handler(calls, body=b"new", etag='"v2"')).text == "new"
+    assert cache.stats.hits == 1
+
+
+def test_responses_without_validators_not_stored(cache):
+    get(cache, lambda request: httpx.Response(200, content=b"x"))
+    assert not cache.directory.exists() or not list(cache.directory.iterdir())
+
+
+def test_credentials_do_not_share_entries(cache):
+    calls = []
+    get(cache, etag_handler(calls), headers={"Authorization": "token a"})
+    get(cache, etag_handler(calls), headers={"Authorization": "token b"})
+    assert "If-None-Match" not in calls[1].headers
+
+
+def test_least_recently_used_entries_evicted(cache):
+    calls = []
+
+    def cached_urls():
+        return {
+            name
+            for name in "abcd"
+            if cache._path(f"https://api.test/{name}", httpx.Headers()).exists()
+        }
+
+    def fetch(name):
+        get(cache, etag_handler(calls, body=b"x" * 100), url=f"https://api.test/{name}")
+
+    fetch("a")
+    cache.max_bytes = 3 * next(cache.directory.iterdir()).stat().st_size
+    fetch("b")
+    fetch("c")
+    # Reading "a" makes "b" the least recently used entry
+    fetch("a")
+    fetch("d")
+    assert cached_urls() == {"a", "c", "d"}
+
+
+def test_repo_fetch_revalidates_with_cache(cache, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        headers = {"ETag": '"same"'}
+        if request.headers.get("If-None-Match") == '"same"':
+            return httpx.Response(304, headers=headers)
+        if request.url.path.endswith("/git/trees/HEAD"):
+            tree = [{"path": "Dockerfile", "type": "blob"}]
+            return httpx.Response(200, headers=headers, json={"tree": tree})
+        return httpx.Response(200, headers=headers, json={"description": "d"})
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        repo_fetcher,
+        "_async_client",
+        lambda headers: httpx.AsyncClient(headers=headers, transport=transport),
+    )
+    first = fetch_repo_context("github", "acme", "app", cache=cache)
+    second = fetch_repo_context("github", "acme", "app", cache=cache)
+
+    assert first == second
+    assert cache.stats.hits == cache.stats.misses == 4
+
+
+def test_streamed_body_cached_and_replayed(cache):
+    calls = []
+    body = b"[" + b"1," * 100_000 + b"1]"
+    assert stream(cache, etag_handler(calls, body=body)) == body
+    assert stream(cache, etag_handler(calls, body=body)) == body
+    assert calls[1].headers["If-None-Match"] == '"v1"'
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    # Entries written by stream() are readable by get() and vice versa
+    assert get(cache, etag_handler(calls, body=body)).content == body
+
+
+def test_partly_read_stream_not_cached(cache):
+    async def chunks():
+        for _ in range(8):
+            yield b"x" * 1024
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=chunks())
+
+    assert stream(cache, handler, stop_after=2) == b"x" * 2048
+    assert not list(cache.directory.iterdir())
+
+
+def test_failed_stream_yields_none(cache):
+    assert stream(cache, lambda request: httpx.Response(404)) is None
+
+
+def test_cached_tree_skips_graphql(cache, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        headers = {"ETag": '"same"'}
+        if request.url.path == "/graphql":
+            repository = {"description": "d", "f0": {"text": "FROM x"}}
+            return httpx.Response(200, json={"data": {"repository": repository}})
+        if request.headers.get("If-None-Match") == '"same"':
+            return httpx.Response(304, headers=headers)
+        if request.url.path.endswith("/git/trees/HEAD"):
+            tree = [{"path": "Dockerfile", "type": "blob", "size": 6}]
+            return httpx.Response(200, headers=headers, json={"tree": tree})
+        if request.url.path.endswith("/contents/Dockerfile"):
+            content = base64.b64encode(b"FROM x").decode()
+            return httpx.Response(200, headers=headers, json={"content": content})
+        if request.url.path.endswith("/readme"):
+            return httpx.Response(404)
+        return httpx.Response(200, headers=headers, json={"description": "d"})
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        repo_fetcher,
+        "_async_client",
+        lambda headers: httpx.AsyncClient(headers=headers, transport=transport),
+    )
+
+    def fetch():
+        return fetch_repo_context("github", "acme", "app", "t0k", cache=cache)
+
+    first = fetch()
+    assert ("POST", "/graphql") in calls
+    calls.clear()
+    second = fetch()
+    third = fetch()
+
+    assert first == second == third
+    assert ("POST", "/graphql") not in calls
+    # The tree on the first run; metadata, Dockerfile and the README 404 on
+    # the second, after which only the uncacheable 404 is fetched again
+    assert cache.stats.misses == 1 + 3 + 1
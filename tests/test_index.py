@@ -0,0 +1,80 @@
+import pytest
+
+from src.config.loader import load_criteria_index
+from src.core.index import CriteriaIndex
+from src.core.model import Criteria, UserResponse
+from src.core.scorer import calculate_category_scores, calculate_score
+
+
+def _make_index():
+    criteria = [
+        Criteria(id="B1", category="Beta", criteria="B1", weight=1.0),
+        Criteria(id="A1", category="Alpha", criteria="A1", weight=1.0),
+        Criteria(id="A2", category="Alpha", criteria="A2", weight=1.0),
+        Criteria(id="B2", category="Beta", criteria="B2", weight=0.5),
+    ]
+    return CriteriaIndex.compile(["Alpha", "Beta", "Empty"], criteria), criteria
+
+
+def test_compile_groups_criteria_by_category():
+    index, _ = _make_index()
+    assert [c.id for c in index] == ["A1", "A2", "B1", "B2"]
+    assert [c.id for c in index.in_category("Beta")] == ["B1", "B2"]
+    assert index.in_category("Empty") == ()
+    assert index.positions["B1"] == 2
+
+
+def test_compile_precomputes_weights():
+    index, _ = _make_index()
+    assert index.total_weight == 3.5
+    assert dict(index.category_max_weights) == {"Alpha": 2.0, "Beta": 1.5}
+
+
+def test_index_is_immutable():
+    index, _ = _make_index()
+    with pytest.raises(AttributeError):
+        index.total_weight = 1.0  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        index.positions["X"] = 0  # type: ignore[index]
+
+
+def test_lookup_helpers():
+    index, _ = _make_index()
+    assert "A1" in index
+    assert "X1" not in index
+    assert index.get("B2").weight == 0.5
+    assert index.get("X1") is None
+    assert index.category_of("A2") == "Alpha"
+    assert index.category_of("X1") == "Unknown"
+
+
+def test_evaluate_matches_scorer():
+    index, criteria = _make_index()
+    responses = [
+        UserResponse(id="A1", answer=True),
+        UserResponse(id="B1", answer=True),
+        UserResponse(id="B2", answer=False),
+    ]
+    evaluation = index.evaluate(responses)
+    assert evaluation.score == calculate_score(criteria, responses)
+    assert dict(evaluation.category_scores) == calculate_category_scores(
+        criteria, responses
+    )
+    assert evaluation.level == "BRONZE"
+    assert [c.id for c in evaluation.passed] == ["A1", "B1"]
+    assert [c.id for c in evaluation.failed] == ["A2", "B2"]
+
+
+def test_evaluate_accepts_mapping():
+    index, _ = _make_index()
+    evaluation = index.evaluate({"A1": True, "A2": True, "B1": True, "B2": True})
+    assert evaluation.score == 100.0
+    assert evaluation.level == "GOLD"
+    assert evaluation.failed == ()
+
+
+def test_load_criteria_index():
+    index = load_criteria_index()
+    assert len(index) > 0
+    assert "D101" in index
+    assert index.total_weight == sum(c.weight for c in index)
@@ -1,4 +1,7 @@
-from src.config.loader import load_criteria_config
+import os
+
+from src.config import loader
+from src.config.loader import get_criteria_index, load_criteria_config
 
 
 def test_load_criteria_config_returns_lists():
@@ -36,3 +39,70 @@ def test_load_criteria_config_categories_match_criteria():
         assert c.category in categories, (
             f"Criterion {c.id} has unknown category '{c.category}'"
         )
+
+
+# ── Criteria cache ─────────────────────────────────────────────────────────────
+
+CRITERIA_YAML = """\
+categories: [Basics]
+criteria:
+  - id: D101
+    category: Basics
+    criteria: Branch protection
+    weight: {weight}
+"""
+
+
+def _write_config(path, weight=1.0):
+    path.write_text(CRITERIA_YAML.format(weight=weight))
+    return str(path)
+
+
+def test_criteria_cache_written_and_reused(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path / "cache"))
+    config_path = _write_config(tmp_path / "criteria.yaml")
+    _, criteria = load_criteria_config(config_path)
+    assert list((tmp_path / "cache").glob("criteria-*.marshal"))
+
+    def fail(source):
+        raise AssertionError("YAML parsed despite a valid cache")
+
+    monkeypatch.setattr(loader, "_parse_criteria_yaml", fail)
+    _, cached = load_criteria_config(config_path)
+    assert cached == criteria
+
+
+def test_criteria_cache_survives_touch(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path / "cache"))
+    config_path = _write_config(tmp_path / "criteria.yaml")
+    load_criteria_config(config_path)
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    monkeypatch.setattr(loader, "_parse_criteria_yaml", None)
+    _, criteria = load_criteria_config(config_path)
+    assert criteria[0].id == "D101"
+
+
+def test_criteria_cache_invalidated_on_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path / "cache"))
+    config_path = _write_config(tmp_path / "criteria.yaml", weight=1.0)
+    load_criteria_config(config_path)
+    stat = os.stat(config_path)
+    _write_config(tmp_path / "criteria.yaml", weight=3.0)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    _, criteria = load_criteria_config(config_path)
+    assert criteria[0].weight == 3.0
+
+
+def test_criteria_load_without_writable_cache(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(blocker / "cache"))
+    _, criteria = load_criteria_config(_write_config(tmp_path / "criteria.yaml"))
+    assert criteria[0].weight == 1.0
+
+
+def test_get_criteria_index_is_memoized():
+    assert get_criteria_index() is get_criteria_index()
@@ -0,0 +1,41 @@
+from sqlalchemy import text
+
+from src.core.model import (
+    DEFAULT_DATABASE_URL,
+    create_async_db_engine,
+    create_db_engine,
+    get_database_url,
+)
+
+
+def test_get_database_url_default(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    assert get_database_url() == DEFAULT_DATABASE_URL
+
+
+def test_get_database_url_from_env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///./other.db")
+    assert get_database_url() == "sqlite:///./other.db"
+
+
+def test_sqlite_engine_applies_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "1234")
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        # 1 == NORMAL
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    engine.dispose()
+
+
+def test_async_engine_uses_async_driver():
+    engine = create_async_db_engine("sqlite:///./other.db")
+    assert engine.url.drivername == "sqlite+aiosqlite"
+
+
+def test_sync_engine_accepts_async_url(tmp_path):
+    engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    assert engine.url.drivername == "sqlite"
+    engine.dispose()
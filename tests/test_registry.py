@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from src.config.registry import CriteriaRegistry
+
+CRITERIA_YAML = """\
+categories: [Basics]
+criteria:
+{items}
+"""
+ITEM = """\
+  - id: {id}
+    category: Basics
+    criteria: Criterion {id}
+    weight: 1.0
+"""
+
+
+def write_config(path, ids):
+    path.write_text(CRITERIA_YAML.format(items="".join(ITEM.format(id=i) for i in ids)))
+    # Make sure the change is visible even on filesystems with coarse mtimes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "criteria.yaml"
+    write_config(path, ["D101", "D102"])
+    return path
+
+
+def test_registry_swaps_in_changed_config(config_path):
+    registry = CriteriaRegistry(str(config_path), reload_interval=0)
+    old = registry.current
+    write_config(config_path, ["D102", "D103"])
+
+    new = registry.current
+    assert new is not old
+    assert [c.id for c in new.criteria] == ["D102", "D103"]
+    assert registry.get(old.version) is old
+    assert registry.versions == (old.version, new.version)
+
+
+def test_registry_swaps_in_text_only_change(config_path):
+    registry = CriteriaRegistry(str(config_path), reload_interval=0)
+    old = registry.current
+    config_path.write_text(config_path.read_text().replace("Criterion D101", "Renamed"))
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert registry.reload_if_changed() is True
+    new = registry.current
+    assert new.version == old.version
+    assert new.criteria[0].criteria == "Renamed"
+    # Stored masks of this layout now decode against the new texts
+    assert registry.get(old.version) is new
+    assert registry.versions == (old.version,)
+
+
+def test_registry_ignores_touch_without_change(config_path):
+    registry = CriteriaRegistry(str(config_path), reload_interval=0)
+    old = registry.current
+    write_config(config_path, ["D101", "D102"])
+    assert registry.reload_if_changed() is False
+    assert registry.current is old
+
+
+def test_registry_keeps_current_version_on_bad_config(config_path):
+    registry = CriteriaRegistry(str(config_path), reload_interval=0)
+    old = registry.current
+    config_path.write_text("categories: [Basics]\ncriteria: [{id: D101}]\n")
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.current is old
+
+
+def test_registry_without_reload_interval_never_reloads(config_path):
+    registry = CriteriaRegistry(str(config_path))
+    old = registry.current
+    write_config(config_path, ["D103"])
+    assert registry.current is old
+    assert registry.reload_if_changed() is True
+    assert registry.current is not old
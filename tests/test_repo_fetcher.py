@@ -0,0 +1,579 @@
+import asyncio
+import base64
+import io
+import json
+import re
+import tarfile
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.cli import repo_fetcher
+from src.cli.repo_fetcher import fetch_repo_context
+
+TREE = [
+    "README.md",
+    ".github/workflows/build.yml",
+    ".github/workflows/release.yml",
+    "Dockerfile",
+    "src/app.py",
+]
+
+
+def _b64(text: str) -> dict:
+    return {"content": base64.b64encode(text.encode()).decode()}
+
+
+def github_handler(missing=(), delay=0.0, in_flight=None, tree=TREE):
+    """Mock GitHub API; records the peak number of concurrent requests."""
+    in_flight = in_flight if in_flight is not None else {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["now"] = in_flight.get("now", 0) + 1
+        in_flight["peak"] = max(in_flight.get("peak", 0), in_flight["now"])
+        try:
+            await asyncio.sleep(delay)
+            path = request.url.path.removeprefix("/repos/acme/app")
+            if path == "":
+                return httpx.Response(
+                    200, json={"description": "App", "language": "Go"}
+                )
+            if path == "/git/trees/HEAD":
+                items = [{"path": p, "type": "blob"} for p in tree]
+                return httpx.Response(200, json={"tree": items})
+            if path == "/readme":
+                return httpx.Response(200, json=_b64("# App"))
+            fp = path.removeprefix("/contents/")
+            if fp in tree and fp not in missing:
+                return httpx.Response(200, json=_b64(f"content of {fp}"))
+            return httpx.Response(404)
+        finally:
+            in_flight["now"] -= 1
+
+    return handler
+
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    def install(handler):
+        transport = httpx.MockTransport(handler)
+        monkeypatch.setattr(
+            repo_fetcher,
+            "_async_client",
+            lambda headers: httpx.AsyncClient(headers=headers, transport=transport),
+        )
+
+    return install
+
+
+def test_fetch_github_context(mock_api):
+    mock_api(github_handler())
+    ctx = fetch_repo_context("github", "acme", "app")
+    assert ctx["description"] == "App"
+    assert ctx["language"] == "Go"
+    assert ctx["readme"] == "# App"
+    assert ctx["files"] == TREE
+    assert [f["path"] for f in ctx["ci_files"]] == [
+        ".github/workflows/build.yml",
+        ".github/workflows/release.yml",
+        "Dockerfile",
+    ]
+    assert ctx["ci_files"][2]["content"] == "content of Dockerfile"
+
+
+def test_fetch_skips_files_that_fail(mock_api, monkeypatch):
+    monkeypatch.setattr(repo_fetcher, "_MAX_CI_FILES", 2)
+    mock_api(github_handler(missing={".github/workflows/build.yml"}))
+    ctx = fetch_repo_context("github", "acme", "app")
+    assert [f["path"] for f in ctx["ci_files"]] == [
+        ".github/workflows/release.yml",
+        "Dockerfile",
+    ]
+
+
+def test_fetch_respects_concurrency_cap(mock_api):
+    in_flight = {}
+    mock_api(github_handler(delay=0.01, in_flight=in_flight))
+    fetch_repo_context("github", "acme", "app", concurrency=2)
+    assert in_flight["peak"] == 2
+
+
+def test_fetch_gitlab_context_uses_first_readme_found(mock_api):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.raw_path.decode()
+        if path.endswith("/repository/tree?recursive=true&per_page=100"):
+            return httpx.Response(200, json=[{"path": "Jenkinsfile", "type": "blob"}])
+        if "/repository/files/README.rst/raw" in path:
+            return httpx.Response(200, text="rst readme")
+        if "/repository/files/Jenkinsfile/raw" in path:
+            return httpx.Response(200, text="pipeline {}")
+        if path == "/api/v4/projects/acme%2Fapp":
+            return httpx.Response(200, json={"description": "GitLab app"})
+        return httpx.Response(404)
+
+    mock_api(handler)
+    ctx = fetch_repo_context("gitlab", "acme", "app")
+    assert ctx["description"] == "GitLab app"
+    assert ctx["readme"] == "rst readme"
+    assert ctx["ci_files"] == [{"path": "Jenkinsfile", "content": "pipeline {}"}]
+
+
+def gitlab_tree_handler(paths, requested, total_pages=True):
+    """Mock GitLab API listing *paths* 100 per page, with keyset support."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        if not request.url.path.endswith("/repository/tree"):
+            if "/repository/files/" in request.url.path:
+                return httpx.Response(200, text="ci config")
+            return httpx.Response(404)
+        requested.append(dict(params))
+        if params.get("pagination") == "keyset":
+            start = int(params["page_token"]) + 1
+        else:
+            start = (int(params.get("page", 1)) - 1) * 100
+        page = [
+            {"id": str(i), "path": p, "type": "blob"}
+            for i, p in enumerate(paths[start : start + 100], start)
+        ]
+        headers = {}
+        if total_pages and "pagination" not in params:
+            headers["X-Total-Pages"] = str(-(-len(paths) // 100))
+        elif params.get("pagination") == "keyset" and start + 100 < len(paths):
+            next_url = request.url.copy_set_param("page_token", str(start + 99))
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return httpx.Response(200, json=page, headers=headers)
+
+    return handler
+
+
+def test_list_org_repos_follows_pages(mock_api):
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.path == "/orgs/octo/repos":
+            return httpx.Response(404)
+        if request.url.path == "/users/octo/repos":
+            if request.url.params.get("page") != "2":
+                next_url = request.url.copy_set_param("page", "2")
+                return httpx.Response(
+                    200,
+                    json=[
+                        {"name": "app", "owner": {"login": "octo"}},
+                        {"name": "old", "owner": {"login": "octo"}, "archived": True},
+                    ],
+                    headers={"Link": f'<{next_url}>; rel="next"'},
+                )
+            return httpx.Response(
+                200, json=[{"name": "api", "owner": {"login": "octo"}}]
+            )
+        if request.url.path == "/2.0/repositories/ws":
+            return httpx.Response(200, json={"values": [{"full_name": "ws/site"}]})
+        return httpx.Response(500)
+
+    mock_api(handler)
+    repos = asyncio.run(repo_fetcher.list_org_repos_async("github", "octo"))
+    assert repos == [("octo", "app"), ("octo", "api")]
+    assert requested == ["/orgs/octo/repos", "/users/octo/repos", "/users/octo/repos"]
+    repos = asyncio.run(repo_fetcher.list_org_repos_async("bitbucket", "ws"))
+    assert repos == [("ws", "site")]
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(repo_fetcher.list_org_repos_async("gitlab", "acme"))
+
+
+def test_rank_ci_files_puts_pipelines_first():
+    paths = [
+        "Makefile",
+        "vendor/lib/Dockerfile",
+        "SECURITY.md",
+        "İnfra/Dockerfile",
+        "Dockerfile",
+        ".GitHub/Workflows/ci.yml",
+        "src/app.py",
+        "tox.ini",
+    ]
+    assert repo_fetcher._rank_ci_files(paths) == [
+        ".GitHub/Workflows/ci.yml",
+        "Dockerfile",
+        "İnfra/Dockerfile",
+        "vendor/lib/Dockerfile",
+        "SECURITY.md",
+        "tox.ini",
+        "Makefile",
+    ]
+
+
+def test_trie_regex_prefers_longest_word():
+    pattern = re.compile(repo_fetcher._trie_regex(["ab", "abc", "b.d", "x"]))
+    assert pattern.findall("abcd ab b.d byd x") == ["abc", "ab", "b.d", "x"]
+
+
+def test_fetch_ci_files_spends_budget_on_best_ranked(mock_api, monkeypatch):
+    monkeypatch.setattr(repo_fetcher, "_MAX_CI_FILES", 2)
+    mock_api(github_handler(tree=["Makefile", "tox.ini", *TREE]))
+    ctx = fetch_repo_context("github", "acme", "app")
+    assert [f["path"] for f in ctx["ci_files"]] == [
+        ".github/workflows/build.yml",
+        ".github/workflows/release.yml",
+    ]
+
+
+def test_fetch_gitlab_reads_every_tree_page(mock_api):
+    paths = [f"src/module_{i}.py" for i in range(340)] + ["ci/Jenkinsfile"]
+    requested = []
+    mock_api(gitlab_tree_handler(paths, requested))
+    ctx = fetch_repo_context("gitlab", "acme", "app")
+    assert sorted(r.get("page", "1") for r in requested) == ["1", "2", "3", "4"]
+    assert len(ctx["files"]) == repo_fetcher._MAX_FILE_LIST
+    assert ctx["ci_files"] == [{"path": "ci/Jenkinsfile", "content": "ci config"}]
+
+
+def test_fetch_gitlab_stops_paging_once_budgets_are_met(mock_api):
+    paths = [f".github/workflows/job-{i}.yml" for i in range(200)]
+    paths += ["src/app.py"] * 5000
+    requested = []
+    mock_api(gitlab_tree_handler(paths, requested))
+    ctx = fetch_repo_context("gitlab", "acme", "app", concurrency=2)
+    # Pages 1 and 2 fill both budgets; at most the prefetch window follows
+    assert len(requested) <= 4
+    assert len(ctx["ci_files"]) == repo_fetcher._MAX_CI_FILES
+
+
+def test_fetch_gitlab_uses_keyset_pagination_without_total(mock_api):
+    paths = [f"src/module_{i}.py" for i in range(250)] + ["Dockerfile"]
+    requested = []
+    mock_api(gitlab_tree_handler(paths, requested, total_pages=False))
+    ctx = fetch_repo_context("gitlab", "acme", "app")
+    assert [r.get("page_token") for r in requested] == [None, "99", "199"]
+    assert ctx["ci_files"] == [{"path": "Dockerfile", "content": "ci config"}]
+
+
+def make_tarball(files: dict, prefix: str = "acme-app-1a2b3c/") -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        tar.addfile(tarfile.TarInfo(prefix.rstrip("/")))
+        for path, text in files.items():
+            data = text.encode()
+            info = tarfile.TarInfo(prefix + path)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def chunked(data: bytes, size: int = 7):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.fixture
+def mock_archive(monkeypatch):
+    """Serve *archive* from the sync client used for snapshot downloads."""
+
+    def install(archive, requests):
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if archive is None:
+                return httpx.Response(404)
+            return httpx.Response(200, content=archive)
+
+        transport = httpx.MockTransport(handler)
+        monkeypatch.setattr(
+            repo_fetcher,
+            "_sync_client",
+            lambda headers: httpx.Client(headers=headers, transport=transport),
+        )
+
+    return install
+
+
+def test_read_snapshot_streams_files_and_caps_contents(monkeypatch):
+    monkeypatch.setattr(repo_fetcher, "_MAX_CI_FILE_BYTES", 10)
+    archive = make_tarball(
+        {
+            "src/app.py": "print()",
+            "Dockerfile": "FROM python:3.12-slim",
+            "README.md": "# App",
+            "docs/README.md": "# Docs",
+        }
+    )
+    snapshot = repo_fetcher.read_snapshot(chunked(archive))
+    assert snapshot["files"] == [
+        "Dockerfile",
+        "README.md",
+        "docs/README.md",
+        "src/app.py",
+    ]
+    assert snapshot["readme"] == "# App"
+    assert snapshot["ci_files"] == [{"path": "Dockerfile", "content": "FROM pytho"}]
+    assert snapshot["truncated"] is False
+
+
+def test_read_snapshot_stops_at_size_limit():
+    files = {f"file-{i}.txt": str(i) * 4096 for i in range(50)}
+    archive = make_tarball(files)
+    snapshot = repo_fetcher.read_snapshot([archive[:1000], archive[1000:]], 1000)
+    assert snapshot["truncated"] is True
+    assert len(snapshot["files"]) < len(files)
+
+
+def test_fetch_snapshot_uses_one_archive_request(mock_api, mock_archive):
+    api_requests, archive_requests = [], []
+
+    async def api(request: httpx.Request) -> httpx.Response:
+        api_requests.append(request)
+        return httpx.Response(200, json={"description": "App", "language": None})
+
+    mock_api(api)
+    files = {p: f"content of {p}" for p in TREE}
+    mock_archive(make_tarball(files), archive_requests)
+    ctx = fetch_repo_context("github", "acme", "app", token="t0k", snapshot=True)
+
+    assert [r.url.path for r in api_requests] == ["/repos/acme/app"]
+    assert [r.url.path for r in archive_requests] == ["/repos/acme/app/tarball"]
+    assert archive_requests[0].headers["Authorization"] == "token t0k"
+    assert ctx["description"] == "App"
+    assert ctx["language"] == ""
+    assert ctx["readme"] == "content of README.md"
+    assert ctx["files"] == sorted(TREE)
+    assert [f["path"] for f in ctx["ci_files"]] == [
+        ".github/workflows/build.yml",
+        ".github/workflows/release.yml",
+        "Dockerfile",
+    ]
+
+
+def test_fetch_snapshot_lists_nested_bitbucket_files(mock_api, mock_archive):
+    archive_requests = []
+
+    async def api(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"description": "BB app"})
+
+    mock_api(api)
+    mock_archive(
+        make_tarball({"ci/deploy/Jenkinsfile": "pipeline {}"}), archive_requests
+    )
+    ctx = fetch_repo_context("bitbucket", "acme", "app", snapshot=True)
+
+    assert (
+        str(archive_requests[0].url) == "https://bitbucket.org/acme/app/get/HEAD.tar.gz"
+    )
+    assert ctx["files"] == ["ci/deploy/Jenkinsfile"]
+    assert ctx["ci_files"] == [
+        {"path": "ci/deploy/Jenkinsfile", "content": "pipeline {}"}
+    ]
+
+
+def test_fetch_snapshot_falls_back_to_api(mock_api, mock_archive):
+    mock_api(github_handler())
+    mock_archive(None, [])
+    ctx = fetch_repo_context("github", "acme", "app", snapshot=True)
+    assert ctx["files"] == TREE
+    assert ctx["ci_files"][2]["content"] == "content of Dockerfile"
+
+
+def test_fetch_snapshot_falls_back_when_archive_is_too_large(
+    mock_api, mock_archive, monkeypatch
+):
+    monkeypatch.setenv("REPO_ARCHIVE_MAX_MB", "0.0001")
+    mock_api(github_handler())
+    files = {f"file-{i}.txt": str(i) * 4096 for i in range(50)}
+    mock_archive(make_tarball(files), [])
+    ctx = fetch_repo_context("github", "acme", "app", snapshot=True)
+    assert ctx["files"] == TREE
+
+
+@pytest.fixture
+def github_fixture_server(monkeypatch):
+    """Local server replaying the recorded GitHub responses in fixtures/.
+
+    GraphQL requests are matched on their variables. Returns the list of
+    ``(method, path)`` requests served.
+    """
+    recording = json.loads(
+        (Path(__file__).parent / "fixtures" / "github_graphql.json").read_text()
+    )
+    served = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def replay(self, body=None):
+            served.append((self.command, self.path))
+            for interaction in recording:
+                request = interaction["request"]
+                if (request["method"], request["path"]) != (self.command, self.path):
+                    continue
+                if (
+                    body is not None
+                    and body["variables"] != request["body"]["variables"]
+                ):
+                    continue
+                response = interaction["response"]
+                payload = json.dumps(response["body"]).encode()
+                self.send_response(response["status"])
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            self.send_error(404)
+
+        def do_GET(self):
+            self.replay()
+
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            self.replay(json.loads(self.rfile.read(length)))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("GITHUB_API_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    yield served
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_github_graphql_batches_file_contents(github_fixture_server):
+    ctx = fetch_repo_context("github", "acme", "app", token="t0k")
+
+    # Tree, one query for metadata + README + the 8 best-ranked files, then
+    # one query for the Makefile replacing the binary SBOM
+    assert github_fixture_server == [
+        ("GET", "/repos/acme/app/git/trees/HEAD?recursive=1"),
+        ("POST", "/graphql"),
+        ("POST", "/graphql"),
+    ]
+    assert ctx["description"] == "Example service"
+    assert ctx["language"] == "Python"
+    assert ctx["readme"].startswith("# app")
+    assert "docs/sbom.spdx.gz" in ctx["files"]
+    assert [f["path"] for f in ctx["ci_files"]] == [
+        ".github/workflows/build.yml",
+        ".github/workflows/release.yml",
+        "Dockerfile",
+        "docker-compose.yml",
+        ".github/dependabot.yml",
+        ".pre-commit-config.yaml",
+        "tox.ini",
+        "Makefile",
+    ]
+    assert ctx["ci_files"][2]["content"].startswith("FROM python:3.12-slim")
+
+
+def test_fetch_github_graphql_falls_back_to_rest(mock_api):
+    rest = github_handler()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/graphql":
+            return httpx.Response(401, json={"message": "Bad credentials"})
+        return await rest(request)
+
+    mock_api(handler)
+    ctx = fetch_repo_context("github", "acme", "app", token="t0k")
+    assert ctx["readme"] == "# App"
+    assert ctx["ci_files"][2]["content"] == "content of Dockerfile"
+
+
+def test_graphql_chunks_respect_object_and_byte_budget(monkeypatch):
+    monkeypatch.setattr(repo_fetcher, "_GRAPHQL_MAX_OBJECTS", 3)
+    monkeypatch.setattr(repo_fetcher, "_GRAPHQL_MAX_BYTES", 100)
+    paths = ["a", "b", "c", "d", "big", "e"]
+    sizes = {"big": 500, "d": 60, "e": 60}
+    assert repo_fetcher._graphql_chunks(paths, sizes) == [
+        ["a", "b", "c"],
+        ["d"],
+        ["big"],
+        ["e"],
+    ]
+
+
+def test_github_graphql_url_for_enterprise(monkeypatch):
+    monkeypatch.setenv("GITHUB_API_URL", "https://ghe.example.com/api/v3")
+    assert repo_fetcher._github_graphql_url() == "https://ghe.example.com/api/graphql"
+
+
+def tree_payload(n: int) -> bytes:
+    tree = [
+        {"path": f"src/módulo_{i}/ünïcode_{i}.py", "type": "blob", "size": i}
+        for i in range(n)
+    ]
+    url = "https://api.github.com/repos/acme/app/git/trees/abc"
+    return json.dumps(
+        {"sha": "abc", "url": url, "tree": tree, "truncated": False}
+    ).encode()
+
+
+def parse_tree(payload: bytes, chunk_size: int) -> list:
+    async def chunks():
+        for i in range(0, len(payload), chunk_size):
+            yield payload[i : i + chunk_size]
+
+    async def run():
+        items = []
+        async for batch in repo_fetcher._stream_json_array(chunks(), "tree"):
+            items += batch
+        return items
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_stream_json_array_matches_json_loads(chunk_size):
+    payload = tree_payload(50)
+    assert parse_tree(payload, chunk_size) == json.loads(payload)["tree"]
+
+
+def test_stream_json_array_memory_stays_flat():
+    payload = tree_payload(50_000)
+    tracemalloc.start()
+    try:
+        count = 0
+
+        async def chunks():
+            for i in range(0, len(payload), 64 * 1024):
+                yield payload[i : i + 64 * 1024]
+
+        async def run():
+            nonlocal count
+            async for batch in repo_fetcher._stream_json_array(chunks(), "tree"):
+                count += len(batch)
+
+        asyncio.run(run())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == 50_000
+    assert peak < len(payload) / 4
+
+
+def test_fetch_github_streams_tree_and_stops_early(mock_api):
+    tree = [f".github/workflows/job-{i}.yml" for i in range(100)]
+    tree += [f"src/module_{i}.py" for i in range(100_000)]
+    sent = []
+
+    async def body():
+        items = ",".join(json.dumps({"path": p, "type": "blob"}) for p in tree)
+        payload = ('{"tree": [' + items + "]}").encode()
+        for i in range(0, len(payload), 4096):
+            sent.append(i)
+            yield payload[i : i + 4096]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/git/trees/HEAD"):
+            return httpx.Response(200, content=body())
+        if request.url.path.startswith("/repos/acme/app/contents/"):
+            return httpx.Response(200, json=_b64("on: push"))
+        return httpx.Response(404)
+
+    mock_api(handler)
+    ctx = fetch_repo_context("github", "acme", "app")
+    assert ctx["files"] == tree[: repo_fetcher._MAX_FILE_LIST]
+    assert len(ctx["ci_files"]) == repo_fetcher._MAX_CI_FILES
+    # Only the start of the tree was downloaded
+    assert len(sent) < 10
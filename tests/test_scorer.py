@@ -1,4 +1,14 @@
-from src.core.scorer import calculate_score, calculate_category_scores, score_to_level
+import numpy as np
+
+from src.core.scorer import (
+    calculate_category_scores,
+    calculate_score,
+    compile_weights,
+    levels_for_scores,
+    responses_to_matrix,
+    score_batch,
+    score_to_level,
+)
 from src.core.model import Criteria, UserResponse
 
 
@@ -140,3 +150,75 @@ def test_category_scores_keys_match_categories():
 def test_category_scores_empty():
     scores = calculate_category_scores([], [])
     assert scores == {}
+
+
+# ── batch scoring ──────────────────────────────────────────────────────────────
+
+
+def test_score_batch_matches_single_assessment_functions():
+    criteria = _make_multi_category_criteria()
+    rows = [
+        {"A1": True, "A2": True, "B1": True, "B2": True},
+        {"A1": True, "B2": True},
+        {},
+    ]
+    weights = compile_weights(criteria)
+    batch = score_batch(weights, responses_to_matrix(weights, rows))
+
+    for i, row in enumerate(rows):
+        responses = [UserResponse(id=k, answer=v) for k, v in row.items()]
+        score = calculate_score(criteria, responses)
+        assert batch.scores[i] == score
+        assert batch.levels[i] == score_to_level(score)
+        cat_scores = calculate_category_scores(criteria, responses)
+        assert list(batch.category_scores[i]) == list(cat_scores.values())
+
+
+def test_score_batch_shapes():
+    criteria = _make_multi_category_criteria()
+    weights = compile_weights(criteria)
+    matrix = np.ones((5, len(criteria)), dtype=bool)
+    batch = score_batch(weights, matrix)
+    assert batch.scores.shape == (5,)
+    assert batch.category_scores.shape == (5, 2)
+    assert list(batch.levels) == ["GOLD"] * 5
+
+
+def test_compile_weights_reuses_compiled_arrays():
+    criteria = _make_multi_category_criteria()
+    weights = compile_weights(criteria)
+    assert compile_weights(_make_multi_category_criteria()) is weights
+    assert compile_weights(_make_criteria(2, weight=2.0)) is not compile_weights(
+        _make_criteria(2)
+    )
+    assert not weights.weights.flags.writeable
+
+
+def test_score_batch_weightless_category_scores_zero():
+    criteria = [
+        Criteria(id="A1", category="Alpha", criteria="A1", weight=1.0),
+        Criteria(id="B1", category="Beta", criteria="B1", weight=0.0),
+    ]
+    weights = compile_weights(criteria)
+    batch = score_batch(weights, np.ones((1, 2), dtype=bool))
+    assert batch.category_scores.tolist() == [[100.0, 0.0]]
+
+
+def test_levels_for_scores_boundaries():
+    levels = levels_for_scores(np.array([0, 29.9, 30, 50, 70, 89.9, 90, 100]))
+    assert list(levels) == [
+        "WIP",
+        "WIP",
+        "PASSING",
+        "BRONZE",
+        "SILVER",
+        "SILVER",
+        "GOLD",
+        "GOLD",
+    ]
+
+
+def test_responses_to_matrix_ignores_unknown_ids():
+    weights = compile_weights(_make_criteria(2))
+    matrix = responses_to_matrix(weights, [{"D0": True, "X9": True}])
+    assert matrix.tolist() == [[True, False]]
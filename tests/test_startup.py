@@ -0,0 +1,45 @@
+"""Start-up budget of the CLI, measured with ``python -X importtime``."""
+
+import os
+import subprocess
+import sys
+
+# Generous enough for slow CI runners; loading litellm alone takes seconds
+VERSION_IMPORT_BUDGET_S = float(os.environ.get("DM_VERSION_IMPORT_BUDGET_S", "1.0"))
+HEAVY_MODULES = ("litellm", "httpx", "sqlalchemy", "cli.ai_client", "cli.repo_fetcher")
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """Run *code* with ``-X importtime``; return cumulative µs per top-level import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env={**os.environ, "PYTHONPATH": SRC},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        imports[name.strip()] = imports.get(name.strip(), 0) + int(cumulative)
+    return imports
+
+
+def test_version_does_not_import_heavy_dependencies():
+    imports = _importtime("from cli.main import app; app(['--version'])")
+    assert "cli.main" in imports
+    loaded = [m for m in HEAVY_MODULES if m in imports]
+    assert not loaded, f"'--version' imported {loaded}"
+
+
+def test_version_import_time_within_budget():
+    imports = _importtime("from cli.main import app; app(['--version'])")
+    seconds = imports["cli.main"] / 1e6
+    assert seconds < VERSION_IMPORT_BUDGET_S, (
+        f"importing cli.main took {seconds:.2f}s "
+        f"(budget {VERSION_IMPORT_BUDGET_S:.2f}s)"
+    )
@@ -1,11 +1,17 @@
+import asyncio
+import html
+import re
 import uuid
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
-from src.web.main import app
+from src.web.main import app, criteria_registry, get_db
+from src.config.registry import CriteriaRegistry
+from src.core.model import Assessment, AsyncSessionLocal, SessionLocal
 
 client = TestClient(app, follow_redirects=False)
+criteria = criteria_registry.current.criteria
 
 
 # ── Home page ──────────────────────────────────────────────────────────────────
@@ -109,6 +115,35 @@ def test_login_valid_credentials():
     assert response.status_code in (302, 303, 307)
 
 
+def test_password_check_runs_off_the_event_loop():
+    unique = uuid.uuid4().hex[:8]
+    username = f"thread_{unique}"
+    on_event_loop = []
+
+    def verify(password, password_hash):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        return True
+
+    with patch("src.web.main.bcrypt") as mock_bcrypt:
+        mock_bcrypt.hash.return_value = "hashed_password"
+        mock_bcrypt.verify.side_effect = verify
+        client.post(
+            "/register",
+            data={
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": "pw",
+            },
+        )
+        response = client.post("/login", data={"username": username, "password": "pw"})
+    assert response.status_code in (302, 303, 307)
+    assert on_event_loop == [False]
+
+
 # ── OAuth login ────────────────────────────────────────────────────────────────
 
 
@@ -188,6 +223,114 @@ def test_list_assessments_page():
     assert response.status_code == 200
 
 
+def test_submit_stores_score_columns():
+    project = f"Scored {uuid.uuid4().hex[:8]}"
+    client.post("/submit", data={"project_name": project, "D101": "yes"})
+    db = SessionLocal()
+    assessment = db.query(Assessment).filter(Assessment.project_name == project).one()
+    db.close()
+    assert assessment.score is not None
+    assert assessment.level == "WIP"
+    assert "Basics" in assessment.category_scores
+
+
+def test_list_assessments_filter_by_level():
+    project = f"Gold {uuid.uuid4().hex[:8]}"
+    client.post(
+        "/submit",
+        data={"project_name": project, **{c.id: "yes" for c in criteria}},
+    )
+    response = client.get("/assessments?level=gold")
+    assert response.status_code == 200
+    assert project in response.text
+    response = client.get("/assessments?level=WIP")
+    assert project not in response.text
+
+
+def _submit_projects(prefix, count):
+    for i in range(count):
+        answers = {c.id: "yes" for c in criteria[: i + 1]}
+        client.post("/submit", data={"project_name": f"{prefix}-{i}", **answers})
+
+
+def test_list_assessments_keyset_pagination():
+    prefix = f"page-{uuid.uuid4().hex[:8]}"
+    _submit_projects(prefix, 5)
+    seen = []
+    url = f"/assessments?project={prefix}&sort=project&page_size=2"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        seen += re.findall(rf"{prefix}-\d", response.text)
+        match = re.search(r'href="(/assessments\?[^"]*cursor=[^"]*)"', response.text)
+        url = html.unescape(match.group(1)) if match else None
+    assert list(dict.fromkeys(seen)) == [f"{prefix}-{i}" for i in range(5)]
+
+
+def test_list_assessments_sort_by_score_descending():
+    prefix = f"score-{uuid.uuid4().hex[:8]}"
+    _submit_projects(prefix, 3)
+    response = client.get(f"/assessments?project={prefix}&sort=-score")
+    found = list(dict.fromkeys(re.findall(rf"{prefix}-\d", response.text)))
+    assert found == [f"{prefix}-2", f"{prefix}-1", f"{prefix}-0"]
+
+
+def test_list_assessments_filter_by_unknown_owner():
+    prefix = f"owner-{uuid.uuid4().hex[:8]}"
+    _submit_projects(prefix, 1)
+    response = client.get(f"/assessments?project={prefix}&owner=nobody-{prefix}")
+    assert response.status_code == 200
+    assert f"{prefix}-0" not in response.text
+    assert "No matching assessments" in response.text
+
+
+def test_list_assessments_details_follow_criteria_order():
+    prefix = f"details-{uuid.uuid4().hex[:8]}"
+    first, last = criteria[0], criteria[-1]
+    client.post(
+        "/submit",
+        data={"project_name": prefix, last.id: "yes", first.id: "no", "X999": "yes"},
+    )
+    response = client.get(f"/assessments?project={prefix}")
+    text = response.text
+    assert html.escape(first.criteria) in text
+    assert text.index(f"<strong>{first.id}</strong>") < text.index(
+        f"<strong>{last.id}</strong>"
+    )
+    assert text.index(f"<strong>{last.id}</strong>") < text.index(
+        "<strong>X999</strong>"
+    )
+
+
+def test_list_assessments_rejects_bad_sort_and_cursor():
+    assert client.get("/assessments?sort=bogus").status_code == 400
+    assert client.get("/assessments?cursor=not-a-cursor").status_code == 400
+
+
+def test_list_assessments_decodes_answers_of_older_criteria_versions(
+    tmp_path, monkeypatch
+):
+    from tests.test_registry import write_config
+
+    monkeypatch.setenv("DEVOPS_MATURITY_CACHE_DIR", str(tmp_path / "cache"))
+    config_path = tmp_path / "criteria.yaml"
+    write_config(config_path, ["D901", "D902"])
+    registry = CriteriaRegistry(str(config_path))
+    monkeypatch.setattr("src.web.main.criteria_registry", registry)
+
+    project = f"versioned-{uuid.uuid4().hex[:8]}"
+    client.post("/submit", data={"project_name": project, "D901": "no", "D902": "yes"})
+    # Dropping D901 moves D902 to bit 0 of the new version
+    write_config(config_path, ["D902", "D903"])
+    assert registry.reload_if_changed()
+
+    response = client.get(f"/assessments?project={project}")
+    text = re.sub(r"\s+", " ", response.text)
+    assert "<strong>D901</strong> - Criterion D901: <span" in text
+    assert re.search(r"<strong>D902</strong>[^<]*<span[^>]*>\s*In place", text)
+    assert "D903" not in text
+
+
 # ── Badge ──────────────────────────────────────────────────────────────────────
 
 
@@ -216,6 +359,56 @@ def test_edit_assessment_not_found():
     assert response.status_code == 404
 
 
+def test_edit_assessment_form_prefills_saved_answers():
+    owner = TestClient(app, follow_redirects=False)
+    unique = uuid.uuid4().hex[:8]
+    with patch("src.web.main.bcrypt") as mock_bcrypt:
+        mock_bcrypt.hash.return_value = "hashed_password"
+        owner.post(
+            "/register",
+            data={
+                "username": f"editor_{unique}",
+                "email": f"editor_{unique}@example.com",
+                "password": "pw",
+            },
+        )
+    project = f"edit-{unique}"
+    owner.post("/submit", data={"project_name": project, criteria[1].id: "yes"})
+    db = SessionLocal()
+    assessment_id = (
+        db.query(Assessment.id).filter(Assessment.project_name == project).scalar()
+    )
+    db.close()
+
+    response = owner.get(f"/edit-assessment/{assessment_id}")
+    assert response.status_code == 200
+    checked = re.findall(r'value="yes" id="([^"]+)-yes" checked', response.text)
+    assert checked == [criteria[1].id]
+
+
+# ── Database sessions ─────────────────────────────────────────────────────────
+
+
+def test_sessions_closed_on_early_return_paths():
+    closed = []
+
+    async def tracking_db():
+        async with AsyncSessionLocal() as session:
+            try:
+                yield session
+            finally:
+                closed.append(session)
+
+    app.dependency_overrides[get_db] = tracking_db
+    try:
+        assert client.get("/edit-assessment/999999").status_code == 404
+        assert client.post("/edit-assessment/999999").status_code == 404
+        assert client.post("/submit", data={}).status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_db)
+    assert len(closed) == 3
+
+
 # ── Login page query-string error ─────────────────────────────────────────────
 
 